@@ -0,0 +1,194 @@
+# assets.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+import config
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+
+class AssetRegistry:
+    """Case-insensitive index of the images folder (name without extension -> path).
+
+    The folder is listed once and re-listed only when its mtime changes, so
+    lookups in the render hot path are a dict access instead of os.listdir.
+    """
+
+    def __init__(self, base_dir=IMAGES_DIR):
+        self.base_dir = base_dir
+        self.hits = 0
+        self.misses = 0
+        self._index = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.base_dir).st_mtime_ns
+        except OSError:
+            self._index, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+
+        index = {}
+        # Seřazeno, aby "IP_20.png" vyhrálo nad "IP_20.svg" na každém OS
+        for f in sorted(os.listdir(self.base_dir)):
+            name_part = os.path.splitext(f)[0].lower()
+            index.setdefault(name_part, os.path.join(self.base_dir, f))
+        self._index, self._mtime = index, mtime
+
+    def find(self, base_name):
+        """Return the path for base_name (any extension, any case) or None."""
+        with self._lock:
+            self._refresh()
+            path = self._index.get(base_name.lower())
+            if path:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return path
+
+    def names(self):
+        with self._lock:
+            self._refresh()
+            return dict(self._index)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._index)}
+
+    def fingerprint(self):
+        """Hash of every indexed file's name, size and mtime (changes when any asset is edited)."""
+        digest = hashlib.sha1()
+        for name, path in sorted(self.names().items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{name}\0{os.path.basename(path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+
+registry = AssetRegistry()
+
+
+class IconCache:
+    """LRU of decoded and resized icon tiles keyed by (asset, size, mode).
+
+    Bounded by max_bytes (uncompressed pixel size), so a long batch only pays
+    the PNG decode + LANCZOS resize once per icon and then just pastes.
+    """
+
+    def __init__(self, registry, max_bytes):
+        self.registry = registry
+        self.max_bytes = max_bytes
+        self.cur_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, base_name, size, mode=None):
+        """Return the icon resized to size (w, h), or None when it does not exist.
+
+        mode=None keeps the source mode (RGB icons are pasted without a mask).
+        The returned image is shared - paste from it, never draw on it.
+        """
+        key = (base_name.lower(), tuple(size), mode)
+        return self._get(key, base_name, size, mode)
+
+    def _get(self, key, base_name, *args):
+        with self._lock:
+            img = self._items.get(key)
+            if img is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+
+        path = self.registry.find(base_name)
+        if not path:
+            return None
+        img = self._load(path, *args)
+
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = img
+                self.cur_bytes += _image_bytes(img)
+                self._evict()
+        return img
+
+    def _load(self, path, size, mode):
+        with Image.open(path) as src:
+            if mode and src.mode != mode:
+                src = src.convert(mode)
+            return src.resize(tuple(size), Image.Resampling.LANCZOS)
+
+    def _evict(self):
+        while self.cur_bytes > self.max_bytes and len(self._items) > 1:
+            _, old = self._items.popitem(last=False)
+            self.cur_bytes -= _image_bytes(old)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.cur_bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self._items), "bytes": self.cur_bytes}
+
+
+class FooterCache(IconCache):
+    """Footer JPEGs scaled to the canvas width, keyed by (resolved name, width).
+
+    Sources larger than the target are decoded with JPEG draft mode (DCT
+    scaling by 1/2, 1/4 or 1/8) before the final LANCZOS pass.
+    """
+
+    def get(self, base_name, width):
+        key = (base_name.lower(), width)
+        return self._get(key, base_name, width)
+
+    def _load(self, path, width):
+        with Image.open(path) as src:
+            if src.width != width:
+                new_h = int(src.height * (width / src.width))
+                if src.format == "JPEG" and src.width >= 2 * width:
+                    src.draft("RGB", (width, new_h))
+                return src.resize((width, new_h), Image.Resampling.LANCZOS)
+            return src.copy()
+
+
+def _image_bytes(img):
+    return img.width * img.height * len(img.getbands())
+
+
+icons = IconCache(registry, config.ICON_CACHE_MAX_BYTES)
+footers = FooterCache(registry, config.FOOTER_CACHE_MAX_BYTES)
+
+
+# Ikony, které se objeví skoro na každém obrázku
+COMMON_ICONS = ["IP_20", "IP_54", "IP_67", "IP_68", "CRI_90", "max-single", "max-double",
+                "o", "s", "p", "u", "m", "mr"]
+
+
+def prewarm(icon_size, footer_width=1000, with_footers=False):
+    """Decode and resize the common icons (and optionally all footers) into the caches up front.
+
+    Footers stay lazy by default: there are ~150 of them and a batch uses a few,
+    decoding all of them costs ~1 s and ~180 MB per render process.
+    """
+    for name in COMMON_ICONS:
+        try:
+            icons.get(name, (icon_size, icon_size))
+        except Exception as e:
+            print(f"WARNING: Ikonu '{name}' nelze předem načíst: {e}")
+    if with_footers:
+        for name, path in registry.names().items():
+            if path.lower().endswith((".jpg", ".jpeg")):
+                footers.get(name, footer_width)
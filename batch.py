@@ -0,0 +1,86 @@
+# batch.py
+"""Vstupy a výstupy hromadného zpracování, sdílené GUI a CLI.
+
+Modul nesmí importovat GUI ani selenium - CLI ho používá i bez scrapování.
+"""
+import csv
+import json
+import os
+
+import config
+
+# Pole, podle kterých se pozná řádek se specifikací (ne jen ML kód)
+SPEC_FIELDS = {
+    "color", "kelvin", "chip", "leds", "power", "lumen", "voltage", "ip", "width", "height",
+    "life", "life_l", "life_b", "cut", "led_segment", "max_single", "max_double", "cri",
+    "angle", "model",
+}
+
+
+def read_codes(file_path):
+    """ML kódy z CSV/TXT - první sloupec, oddělovač ';' nebo ','."""
+    codes = []
+    with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line: continue
+            
+            val = line
+            if ';' in line: val = line.split(';')[0].strip()
+            elif ',' in line: val = line.split(',')[0].strip()
+            
+            val = val.replace('"', '').replace("'", "")
+            
+            if val.upper().startswith("ML"):
+                codes.append(val)
+    return codes
+
+
+def read_batch_file(file_path):
+    """Načte dávku jako seznam položek: dict se specifikací, nebo str s ML kódem.
+
+    JSONL: každý řádek je objekt (se specifikací a "ml_code") nebo řetězec s kódem.
+    CSV s hlavičkou obsahující pole specifikace: každý řádek je specifikace.
+    Jinak se bere první sloupec jako ML kód (stejně jako v GUI).
+    """
+    if file_path.lower().endswith((".jsonl", ".ndjson")):
+        items = []
+        with open(file_path, 'r', encoding='utf-8-sig') as f:
+            for line in f:
+                line = line.strip()
+                if not line: continue
+                obj = json.loads(line)
+                if isinstance(obj, dict):
+                    items.append({k: str(v) for k, v in obj.items()})
+                elif str(obj).upper().startswith("ML"):
+                    items.append(str(obj))
+        return items
+
+    with open(file_path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        head = f.readline()
+        delimiter = ';' if head.count(';') > head.count(',') else ','
+        header = [h.strip().lower() for h in next(csv.reader([head], delimiter=delimiter), [])]
+        if SPEC_FIELDS & set(header):
+            # hlavička je už přečtená, reader pokračuje prvním datovým řádkem
+            reader = csv.DictReader(f, fieldnames=header, delimiter=delimiter)
+            return [{k: (v or "").strip() for k, v in row.items() if k} for row in reader]
+
+    return read_codes(file_path)
+
+
+def item_code(item):
+    """ML kód položky (u specifikace z pole ml_code/code)."""
+    if isinstance(item, dict):
+        return str(item.get("ml_code") or item.get("code") or "").strip()
+    return item.strip()
+
+
+def output_filename(code, ext="webp", size=None):
+    """Název výstupu; velikost jiná než config.IMAGE_SIZE dostane příponu _<px>px."""
+    clean_name = code.strip().replace('/', '-').replace('\\', '-')
+    suffix = f"_{size}px" if size and size != config.IMAGE_SIZE else ""
+    return f"{clean_name}_30{suffix}.{ext}"
+
+
+def default_output_dir():
+    return os.path.join(os.path.expanduser("~"), "Downloads", "McLED_LED-pasky")
@@ -0,0 +1,214 @@
+# bench_extract.py
+"""Offline benchmark extrakce parametrů nad uloženými stránkami (bez prohlížeče).
+
+    python bench_extract.py                  # latence, shoda polí, pomalé regexy
+    python bench_extract.py --update         # přegeneruje očekávané výstupy (*.json) původním parserem
+    python bench_extract.py -n 200 --slow-ms 2
+
+Korpus: corpus/<název>.txt je text elementu body (to, co vrací scraper.fetch_page),
+corpus/<název>.json je očekávaný výstup - vygenerovaný původním parserem
+(legacy_extract, kaskáda regexů před extractor.py), ne extraktorem samotným,
+takže shoda polí měří, jestli extraktor dává stejné výsledky jako dřív.
+Stránky "derived-*" vznikly úpravou tabulky parametrů uložené stránky, aby byly
+pokryté další barvy a formáty (hodnota na dalším řádku, tabulátor...).
+
+Kontrola regexů spouští každý předkompilovaný vzor extraktoru zvlášť nad každou
+stránkou a nad nepříznivými vstupy (STRESS_INPUTS), a pro srovnání i původní
+vzory (legacy_extract.PATTERNS, jak je používal re.search). Vzor se označí, když
+na stránce korpusu přesáhne --slow-ms, nebo když jeho čas na SCALE-krát větším
+vstupu roste víc než lineárně (náznak backtrackingu). Návratový kód 1 = neshoda
+nebo podezřelý vzor extraktoru; nálezy u původních vzorů jsou jen pro srovnání.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+import extractor
+import legacy_extract
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+# Vstupy, na kterých se dřív projevoval backtracking (popisek bez hodnoty, dlouhé řady čísel)
+STRESS_INPUTS = {
+    "labels_without_values": "Max. délka pásku při jednostranném napájení [m]: -\n" * 200,
+    "digits_without_unit": ("1234567890 " * 40 + "\n") * 20,
+    "colour_prefix_flood": "Barva světla: " * 500,
+    "long_single_line": "x" * 20000 + " 24V",
+}
+SCALE = 8           # kolikrát se zvětší stránka pro test linearity
+SCALE_TOLERANCE = 3  # povolený násobek nad lineárním růstem
+
+
+def load_corpus(corpus_dir=CORPUS_DIR):
+    """[(název, text, očekávaný dict nebo None)] seřazené podle názvu."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.txt"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        expected = None
+        json_path = os.path.splitext(path)[0] + ".json"
+        if os.path.exists(json_path):
+            with open(json_path, encoding="utf-8") as f:
+                expected = json.load(f)
+        pages.append((name, text, expected))
+    return pages
+
+
+def update_expected(pages, corpus_dir=CORPUS_DIR):
+    """Očekávané výstupy z původního parseru - extraktor se nesmí kontrolovat sám proti sobě."""
+    for name, text, _ in pages:
+        with open(os.path.join(corpus_dir, name + ".json"), "w", encoding="utf-8") as f:
+            json.dump(legacy_extract.parse_page(text), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    print(f"Uloženo {len(pages)} očekávaných výstupů do {corpus_dir}")
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def time_call(func, arg, repeat):
+    """Nejkratší čas jednoho volání v ms (min z repeat běhů tlumí šum)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def bench_pages(pages, repeat):
+    """Latence parse_page (ms, všechny běhy všech stránek) a shoda polí s očekáváním."""
+    latencies = []
+    fields = {}      # pole -> [shod, celkem]
+    mismatches = []
+    for name, text, expected in pages:
+        for _ in range(repeat):
+            t = time.perf_counter()
+            result = extractor.parse_page(text)
+            latencies.append((time.perf_counter() - t) * 1000)
+        if expected is None:
+            continue
+        for key in sorted(set(expected) | set(result)):
+            stat = fields.setdefault(key, [0, 0])
+            stat[1] += 1
+            if expected.get(key) == result.get(key):
+                stat[0] += 1
+            else:
+                mismatches.append((name, key, expected.get(key), result.get(key)))
+    return latencies, fields, mismatches
+
+
+LEGACY = "legacy:"  # předpona vzorů původního parseru v regex_patterns()
+
+
+def _per_line(pattern):
+    """Hodnoty se v extraktoru matchují jen na začátku zbytku jednoho řádku."""
+    return lambda text: [pattern.match(line) for line in text.split("\n")]
+
+
+def _candidates(pattern, prefix):
+    """Všechny shody na výskytech doslovného začátku, jako extractor._candidates."""
+    return lambda text: list(extractor._candidates(pattern, prefix, text))
+
+
+def regex_patterns():
+    """{název: (funkce(text), hledá v lower())} - všechny vzory extraktoru, jak je používá."""
+    patterns = {
+        "color_prefix": (_candidates(extractor._COLOR_PREFIX_RE, extractor._COLOR_PREFIX_LITERAL), True),
+        "color_words": (extractor._COLOR_WORDS.findall, True),
+        "color_keys": (extractor._COLOR_KEY_ANY.findall, False),
+        "model": (extractor._MODEL.findall, False),
+    }
+    # findall projde celý vstup i tam, kde by search skončil u první shody
+    for key, pattern in extractor._TEXT_FIELDS.items():
+        patterns[key] = (pattern.findall, True)
+    for key, (pattern, prefix) in extractor._LABEL_RES.items():
+        patterns["label:" + key] = (_candidates(pattern, prefix), True)
+    for key, pattern in extractor._LABEL_VALUE.items():
+        patterns["value:" + key] = (_per_line(pattern), True)
+    for key, pattern in legacy_extract.PATTERNS.items():
+        patterns[LEGACY + key] = (re.compile(pattern, re.IGNORECASE | re.DOTALL).search, False)
+    return patterns
+
+
+def check_regexes(pages, repeat, slow_ms):
+    """[(vzor, vstup, ms, důvod)] pro pomalé nebo nelineárně rostoucí vzory."""
+    inputs = {name: text for name, text, _ in pages}
+    inputs.update(STRESS_INPUTS)
+    flagged = []
+    for pname, (scan, lower) in regex_patterns().items():
+        for iname, text in inputs.items():
+            text = text.lower() if lower else text
+            ms = time_call(scan, text, repeat)
+            if ms > slow_ms and iname not in STRESS_INPUTS:
+                flagged.append((pname, iname, ms, f"> {slow_ms} ms"))
+            big_ms = time_call(scan, text * SCALE, max(3, repeat // SCALE))
+            if ms > 0.05 and big_ms > ms * SCALE * SCALE_TOLERANCE:
+                flagged.append((pname, iname, big_ms, f"x{SCALE} vstup -> x{big_ms / ms:.0f} čas"))
+    return flagged
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark extrakce parametrů nad korpusem stránek")
+    parser.add_argument("--corpus", default=CORPUS_DIR)
+    parser.add_argument("-n", "--repeat", type=int, default=50, help="běhů na stránku")
+    parser.add_argument("--slow-ms", type=float, default=5.0, help="limit pro jeden vzor na jeden vstup")
+    parser.add_argument("--update", action="store_true",
+                        help="přepsat očekávané výstupy výsledky původního parseru (legacy_extract)")
+    parser.add_argument("--no-regex", action="store_true", help="přeskočit kontrolu jednotlivých regexů")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"Korpus {args.corpus} je prázdný.")
+        return 1
+    if args.update:
+        update_expected(pages, args.corpus)
+        return 0
+
+    latencies, fields, mismatches = bench_pages(pages, args.repeat)
+    print(f"Stránek: {len(pages)}, běhů: {len(latencies)}")
+    print("Latence parse_page [ms]: " + ", ".join(
+        f"p{p} {percentile(latencies, p):.3f}" for p in (50, 90, 99)) + f", max {max(latencies):.3f}")
+
+    if fields:
+        print("Shoda polí:")
+        for key, (ok, total) in sorted(fields.items()):
+            print(f"  {key:12} {ok}/{total}")
+    missing = [name for name, _, expected in pages if expected is None]
+    if missing:
+        print(f"Bez očekávaného výstupu (--update): {', '.join(missing)}")
+    for name, key, want, got in mismatches:
+        print(f"NESHODA {name}: {key} očekáváno {want!r}, vráceno {got!r}")
+
+    flagged = [] if args.no_regex else check_regexes(pages, max(3, args.repeat // 10), args.slow_ms)
+    legacy = [f for f in flagged if f[0].startswith(LEGACY)]
+    flagged = [f for f in flagged if not f[0].startswith(LEGACY)]
+    for pname, iname, ms, reason in flagged:
+        print(f"POMALÝ REGEX {pname} na {iname}: {ms:.2f} ms ({reason})")
+    if not args.no_regex:
+        if not flagged:
+            print("Regexy extraktoru: bez nálezů.")
+        print(f"Původní vzory (legacy_extract, jen pro srovnání) - nálezů: {len(legacy)}")
+        for pname, iname, ms, reason in legacy:
+            print(f"  {pname} na {iname}: {ms:.2f} ms ({reason})")
+    return 1 if mismatches or flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
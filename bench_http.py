@@ -0,0 +1,204 @@
+# bench_http.py
+"""HTTP cesta scraperu proti lokálnímu náhradnímu serveru (bez internetu a prohlížeče).
+
+    python bench_http.py                     # 200 stránek, 50 ms latence serveru
+    python bench_http.py -n 1000 --latency 200 --per-host 8 --interval 0.5
+
+Server vydává stránky z corpus/ jako HTML (tabulka parametrů v <table>, okolo
+skripty a navigace). Cesty /no-table/<název> parametry ve viditelném HTML
+nemají (vykreslí je až skript) - ty musí HTTP cesta odmítnout a nechat na
+prohlížeči. Měří se fáze "http" a "parse" z pipeline.fetch_stages, tedy
+PageFetcher v tempu pacing.HostLimiter jako v dávce (fáze prohlížeče se jen
+počítá), a pro srovnání http_fetch.fetch_texts (AsyncFetcher). Výstup: stránek
+za minutu, shoda s corpus/*.json a nejvyšší pozorovaný souběh na host.
+"""
+import argparse
+import html
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import config
+import extractor
+import http_fetch
+import pipeline
+from bench_extract import load_corpus
+from pacing import HostLimiter
+
+
+def page_html(text, with_table=True):
+    """Text stránky z korpusu -> HTML; souvislé řádky "Popisek: hodnota" jdou do tabulek.
+
+    Bez tabulky je v HTML jen navigace a text stránky ve skriptu, který ho
+    vykreslí až v prohlížeči - platí pro všechny tvary stránek v korpusu
+    (hodnota na dalším řádku, tabulátory...), ne jen "Popisek: hodnota".
+    """
+    if not with_table:
+        params = json.dumps(text, ensure_ascii=False).replace("</", "<\\/")
+        main = f"<div id=\"params\"></div><script>renderParams({params});</script>"
+    else:
+        parts, in_table = [], False
+        for line in text.splitlines():
+            label, sep, value = line.partition(":")
+            is_row = bool(sep and value.strip()) and len(label) < 80
+            if is_row != in_table:
+                parts.append("<table class=\"params\">" if is_row else "</table>")
+                in_table = is_row
+            if is_row:
+                parts.append(f"<tr><th>{html.escape(label)}:</th><td>{html.escape(value.strip())}</td></tr>")
+            else:
+                parts.append(f"<p>{html.escape(line)}</p>")
+        if in_table:
+            parts.append("</table>")
+        main = "".join(parts)
+    return (
+        "<!DOCTYPE html><html><head><title>McLED</title><style>p{margin:0}</style>"
+        "<script>var params = {\"Barva světla\": \"x\"};</script></head><body>"
+        f"<nav><ul><li>Domů</li><li>LED pásky</li></ul></nav><main>{main}</main></body></html>"
+    )
+
+
+class StandInServer:
+    """ThreadingHTTPServer na 127.0.0.1 s volitelnou latencí; měří souběh požadavků."""
+
+    def __init__(self, pages, latency=0.0):
+        self.pages = pages
+        self.latency = latency
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._enter()
+                try:
+                    path = urlsplit(self.path).path.strip("/")
+                    with_table = not path.startswith("no-table/")
+                    name = path.split("/")[-1]
+                    if server.latency:
+                        time.sleep(server.latency)
+                    if name not in server.pages:
+                        self.send_error(404)
+                        return
+                    body = page_html(server.pages[name], with_table).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    server._leave()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def _enter(self):
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def _leave(self):
+        with self._lock:
+            self.active -= 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="HTTP fetch proti lokálnímu náhradnímu serveru")
+    parser.add_argument("-n", "--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=50, help="latence serveru v ms")
+    parser.add_argument("--per-host", type=int, default=config.HTTP_PER_HOST)
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="nejmenší rozestup požadavků v s (dávka: config.RATE_MIN_INTERVAL)")
+    parser.add_argument("--no-table-every", type=int, default=10,
+                        help="každá N-tá stránka bez tabulky (musí jít na prohlížeč)")
+    return parser
+
+
+def run_stages(urls, interval):
+    """{url: data} z fází http + parse; stránka pro prohlížeč má data None."""
+    report = pipeline.BatchReport(len(urls))
+    stages, close = pipeline.fetch_stages(report, None, HostLimiter(interval), http=True)
+    results = {}
+
+    def on_result(job):
+        results[job.url] = None if job.error else job.data
+
+    try:
+        pipeline.Pipeline([stage for stage in stages if stage[0] != "fetch"],
+                          on_result=on_result).run(
+            pipeline.Job(i, [url], url) for i, url in enumerate(urls))
+    finally:
+        close()
+    return results
+
+
+def check(title, results, urls, elapsed, server, args):
+    """Vypíše výsledky jednoho běhu; True, když všechno sedí."""
+    fetched = {url: data for url, data in results.items() if data is not None}
+    agree = sum(1 for url, data in fetched.items() if data == urls[url][1])
+    fallback = len(urls) - len(fetched)
+    should_fallback = sum(1 for url in urls if "/no-table/" in url)
+    print(f"{title}: {len(urls)} stránek za {elapsed:.2f} s = {len(urls) / elapsed * 60:.0f} stránek/min")
+    print(f"  Shoda s corpus/*.json: {agree}/{len(fetched)}")
+    print(f"  Na prohlížeč (chybí pole): {fallback} (očekáváno {should_fallback})")
+    print(f"  Nejvyšší souběh na serveru: {server.max_active} (limit {args.per_host})")
+    return agree == len(fetched) and fallback == should_fallback and server.max_active <= args.per_host
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    corpus = load_corpus()
+    pages = {name: text for name, text, _ in corpus}
+    expected = {name: exp for name, _, exp in corpus}
+    names = sorted(pages)
+    # Stejné nastavení jako dávka, jen s tempem a souběhem z parametrů
+    config.HTTP_PER_HOST = args.per_host
+    config.RATE_MIN_INTERVAL = args.interval
+
+    with StandInServer(pages, args.latency / 1000) as server:
+        urls = {}
+        for i in range(args.pages):
+            name = names[i % len(names)]
+            prefix = "no-table/" if args.no_table_every and i % args.no_table_every == 0 else ""
+            urls[f"{server.base_url}/{prefix}{name}?i={i}"] = (name, expected[name])
+        print(f"Server: latence {args.latency:.0f} ms, per-host {args.per_host}, "
+              f"rozestup {args.interval:.2f} s")
+
+        started = time.perf_counter()
+        results = run_stages(urls, args.interval)
+        ok = check("Dávka (fáze http, PageFetcher)", results, urls,
+                   time.perf_counter() - started, server, args)
+
+        server.max_active = 0
+        started = time.perf_counter()
+        texts = http_fetch.fetch_texts(urls, per_host=args.per_host)
+        results = {url: extractor.parse_page(texts[url]) if url in texts else None for url in urls}
+        ok &= check(f"fetch_texts (AsyncFetcher, {'aiohttp' if http_fetch.aiohttp else 'http.client'})",
+                    results, urls, time.perf_counter() - started, server, args)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
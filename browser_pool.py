@@ -0,0 +1,248 @@
+# browser_pool.py
+"""Pool znovupoužitelných prohlížečů (Selenium) pro dávky i jednotlivé skeny.
+
+    pool = DriverPool(2)
+    with pool.borrow() as driver:
+        text = scraper.fetch_page(url, driver=driver)
+    pool.close()
+
+Prohlížeče vznikají líně (nejvýš size najednou), před půjčením se ověří, že
+odpovídají, a po BROWSER_MAX_PAGES stránkách nebo nad BROWSER_MAX_MEMORY_MB
+(Chrome + chromedriver, jen s psutil) se zavřou a nahradí novými - Chrome
+postupně bobtná. FakeDriver umí totéž rozhraní bez prohlížeče.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created = time.monotonic()
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def memory_mb(driver):
+    """RSS chromedriveru a všech jeho potomků (Chrome) v MB, nebo None bez psutil/PID."""
+    pid = getattr(getattr(getattr(driver, "service", None), "process", None), "pid", None)
+    if psutil is None or pid is None:
+        return None
+    try:
+        proc = psutil.Process(pid)
+        procs = [proc] + proc.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+
+class DriverPool:
+    def __init__(self, size=None, factory=None, max_pages=None, max_memory_mb=None):
+        self.size = size or config.BROWSER_POOL_SIZE
+        self.factory = factory
+        self.max_pages = config.BROWSER_MAX_PAGES if max_pages is None else max_pages
+        self.max_memory_mb = config.BROWSER_MAX_MEMORY_MB if max_memory_mb is None else max_memory_mb
+        self._idle = []
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.created = 0
+        self.recycled = 0
+
+    def _create(self):
+        factory = self.factory
+        if factory is None:
+            import scraper
+            factory = scraper.get_driver
+        session = _Session(factory())
+        with self._cond:
+            self.created += 1
+        return session
+
+    @staticmethod
+    def healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _needs_recycle(self, session):
+        if self.max_pages and session.pages >= self.max_pages:
+            return True
+        if self.max_memory_mb:
+            mb = memory_mb(session.driver)
+            if mb is not None and mb > self.max_memory_mb:
+                return True
+        return False
+
+    def acquire(self):
+        """Vrátí _Session s funkčním prohlížečem; blokuje, když jsou všechny půjčené."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Pool prohlížečů je zavřený")
+                if self._idle:
+                    session = self._idle.pop()
+                    break
+                if self._total < self.size:
+                    self._total += 1
+                    session = None
+                    break
+                self._cond.wait()
+
+        try:
+            if session is not None and not self.healthy(session.driver):
+                print("Prohlížeč neodpovídá, startuji nový.")
+                _quit(session.driver)
+                session = None
+            return session or self._create()
+        except BaseException:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, session, broken=False):
+        session.pages += 1
+        recycle = broken or self._closed or self._needs_recycle(session)
+        if recycle:
+            _quit(session.driver)
+        with self._cond:
+            if recycle:
+                self._total -= 1
+                if not self._closed:
+                    self.recycled += 1
+            else:
+                self._idle.append(session)
+            self._cond.notify()
+
+    @contextmanager
+    def borrow(self):
+        session = self.acquire()
+        broken = False
+        try:
+            yield session.driver
+        except BaseException:
+            broken = not self.healthy(session.driver)
+            raise
+        finally:
+            self.release(session, broken)
+
+    def prewarm(self, count=None):
+        """Nastartuje prohlížeče dopředu (volat z vlákna, start trvá sekundy)."""
+        sessions = []
+        try:
+            for _ in range(min(count or self.size, self.size)):
+                sessions.append(self.acquire())
+        finally:
+            for session in sessions:
+                session.pages -= 1  # zahřátí se nepočítá jako stránka
+                self.release(session)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            _quit(session.driver)
+
+    def stats(self):
+        with self._cond:
+            return {"size": self.size, "open": self._total, "idle": len(self._idle),
+                    "created": self.created, "recycled": self.recycled}
+
+
+_interactive = None
+_interactive_lock = threading.Lock()
+
+
+def interactive():
+    """Sdílený pool s jedním teplým prohlížečem pro jednotlivé skeny z GUI."""
+    global _interactive
+    with _interactive_lock:
+        if _interactive is None or _interactive._closed:
+            _interactive = DriverPool(1)
+        return _interactive
+
+
+# --- Náhrada prohlížeče bez Selenia ---
+
+class _FakeElement:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeDriver:
+    """Prohlížeč bez prohlížeče: pages = {url: text} nebo funkce url -> text.
+
+    Umí to, co používá scraper a pool: get, find_element (body / XPath s textem),
+    execute_script("return 1") a quit. crash() ho "shodí" (health check selže).
+    """
+
+    def __init__(self, pages=None, delay=0.0):
+        self.pages = pages or {}
+        self.delay = delay
+        self.current_url = None
+        self.visited = []
+        self.alive = True
+        self.quit_called = False
+
+    def _text(self):
+        if self.current_url is None:
+            return ""
+        if callable(self.pages):
+            return self.pages(self.current_url) or ""
+        return self.pages.get(self.current_url, "")
+
+    def get(self, url):
+        if not self.alive:
+            raise ConnectionError("FakeDriver neběží")
+        if self.delay:
+            time.sleep(self.delay)
+        self.current_url = url
+        self.visited.append(url)
+
+    def find_element(self, by, value):
+        text = self._text()
+        if by == "xpath":
+            # //body//*[contains(text(), 'marker')] z scraper.wait_until_ready
+            marker = value.split("'")[1] if "'" in value else ""
+            if marker not in text:
+                raise _no_such_element(value)
+        return _FakeElement(text)
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise ConnectionError("FakeDriver neběží")
+        return 1
+
+    def crash(self):
+        self.alive = False
+
+    def quit(self):
+        self.alive = False
+        self.quit_called = True
+
+
+def _no_such_element(msg):
+    try:
+        from selenium.common.exceptions import NoSuchElementException
+    except ImportError:
+        return LookupError(msg)
+    return NoSuchElementException(msg)
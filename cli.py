@@ -0,0 +1,206 @@
+# cli.py
+"""Headless dávkové generování obrázků - bez GUI, bez tkinteru.
+
+    python cli.py specs.jsonl -o out --format webp --preset best --workers 8
+    python cli.py specs.jsonl -f png -p palette  # indexované PNG, nejmenší soubory
+    python cli.py specs.jsonl --sizes 1000,600,300  # tři velikosti, každá kreslená nativně
+    python cli.py kody.csv                       # ML kódy -> stáhne data přes scraper
+
+Pokud vstup obsahuje jen specifikace, importuje se pouze drawer a config;
+scraper (selenium) se načte až ve chvíli, kdy je potřeba stahovat ML kódy.
+"""
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+import batch
+import config
+import encoder
+import render_cache
+import pipeline
+from drawer import LedImageGenerator
+from pipeline import group_by_url
+
+
+def save_image(img, spec, output_dir, fmt, preset, quality):
+    """Uloží obrázek v renderovacím procesu (předává se jako encode do generate_many).
+
+    Vrací statistiku zápisu (encoder.save_with_stats) pro report v hlavním procesu.
+    """
+    filename = batch.output_filename(spec["ml_code"], encoder.extension(fmt), img.width)
+    out_path = os.path.join(output_dir, filename)
+    return encoder.save_with_stats(img, out_path, fmt, preset, quality)
+
+
+def fetch_specs(codes, cache=None, http=True):
+    """Stáhne specifikace pro ML kódy: [(kód, data)], data {} = chyba.
+
+    Stejná cesta jako dávka z GUI (pipeline.fetch_stages): každá stránka jen
+    jednou, nejdřív HTTP, pak jeden prohlížeč v tempu pacing.HostLimiter
+    s opakováním stránek, které nepřišly. Prohlížeč se spustí až pro první
+    stránku, která z HTTP ani z cache nejde; v offline režimu nikdy.
+    """
+    import scraper
+
+    groups = group_by_url(codes, scraper.code_to_url)
+    if len(groups) < len(codes):
+        print(f"Stránek: {len(groups)} pro {len(codes)} kódů (ušetřeno {len(codes) - len(groups)} stažení)")
+    return pipeline.fetch_specs(codes, cache, http=http)
+
+
+def parse_sizes(value):
+    """"1000,600,300" -> (1000, 600, 300) pro --sizes."""
+    try:
+        sizes = tuple(dict.fromkeys(int(v) for v in value.split(",") if v.strip()))
+    except ValueError:
+        sizes = ()
+    if not sizes or min(sizes) < 50:
+        raise argparse.ArgumentTypeError(f"neplatné velikosti '{value}' (např. 1000,600,300)")
+    return sizes
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="McLED - generování obrázků LED pásků bez GUI")
+    parser.add_argument("input", help="CSV/TXT s ML kódy, CSV se specifikacemi nebo JSONL")
+    parser.add_argument("-o", "--output-dir", default=batch.default_output_dir())
+    parser.add_argument("-f", "--format", choices=sorted(encoder.FORMATS), default=config.OUTPUT_FORMAT)
+    parser.add_argument("-p", "--preset", choices=encoder.PRESET_NAMES, default=config.OUTPUT_PRESET,
+                        help="kvalita a úsilí kodéru; palette = 256 barev, bezeztrátově (png/webp)")
+    parser.add_argument("-q", "--quality", type=int, default=None,
+                        help="přebije kvalitu z předvolby (webp/jpeg)")
+    parser.add_argument("-s", "--sizes", type=parse_sizes, default=config.OUTPUT_SIZES,
+                        help=f"strany obrázků v px oddělené čárkou (výchozí {','.join(map(str, config.OUTPUT_SIZES))})")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="počet renderovacích procesů (1 = bez poolu)")
+    parser.add_argument("--no-fetch", action="store_true",
+                        help="nestahovat data pro ML kódy, jen renderovat specifikace")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--offline", action="store_true",
+                       help="stránky jen z cache, prohlížeč se nespustí")
+    cache.add_argument("--refresh", action="store_true",
+                       help="stáhnout všechny stránky znovu a přepsat cache")
+    cache.add_argument("--no-cache", action="store_true", help="necachovat stránky na disk")
+    parser.add_argument("--no-http", action="store_true",
+                        help="stahovat jen prohlížečem (bez rychlé HTTP cesty)")
+    parser.add_argument("--driver-offline", action="store_true",
+                        help="chromedriver jen z cache / config.CHROMEDRIVER_PATH, bez ChromeDriverManager")
+    parser.add_argument("--cache-ttl", type=float, default=None,
+                        help="platnost cache v hodinách (výchozí config.PAGE_CACHE_TTL)")
+    parser.add_argument("--force", action="store_true",
+                        help="vykreslit a přepsat i obrázky, které se od minula nezměnily")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.driver_offline:
+        config.DRIVER_OFFLINE = True
+    started = time.perf_counter()
+
+    items = batch.read_batch_file(args.input)
+    specs = [i for i in items if isinstance(i, dict)]
+    codes = list(dict.fromkeys(i for i in items if isinstance(i, str)))
+    errors = []
+
+    if codes and args.no_fetch:
+        print(f"Přeskočeno {len(codes)} ML kódů (--no-fetch).")
+    elif codes:
+        from page_cache import PageCache
+
+        cache = None
+        if not args.no_cache:
+            mode = "offline" if args.offline else "refresh" if args.refresh else "normal"
+            ttl = args.cache_ttl * 3600 if args.cache_ttl is not None else None
+            cache = PageCache(ttl=ttl, mode=mode)
+        for code, data in fetch_specs(codes, cache, http=config.HTTP_FETCH and not args.no_http):
+            if data:
+                specs.append(data)
+            else:
+                errors.append(code)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for n, spec in enumerate(specs, 1):
+        spec.setdefault("ml_code", batch.item_code(spec) or f"item{n}")
+    # Stejný kód (stejný výstupní soubor) dvakrát ve vstupu - platí první výskyt
+    unique = {}
+    for spec in specs:
+        unique.setdefault(batch.output_filename(spec["ml_code"]), spec)
+    if len(unique) < len(specs):
+        print(f"Vynecháno {len(specs) - len(unique)} opakovaných kódů.")
+        specs = list(unique.values())
+
+    # Přeskočit obrázky, jejichž vstupy (spec, palety, ikony, formát) se od minula nezměnily
+    manifest = render_cache.RenderManifest(args.output_dir)
+    env = render_cache.environment_fingerprint()
+    encoder.check_support(args.format)
+    try:
+        encoder.save_options(args.format, args.preset)
+    except ValueError as e:
+        print(e)
+        return 2
+    output = encoder.output_key(args.format, args.preset, args.quality)
+    # a stejné obrázky (délkové varianty) vykreslit jen jednou, ostatní soubory nalinkovat
+    dedupe = render_cache.Deduper()
+    jobs, links, unchanged = [], {}, 0
+    for spec in specs:
+        current = 0
+        for size in args.sizes:
+            filename = batch.output_filename(spec["ml_code"], encoder.extension(args.format), size)
+            path = os.path.join(args.output_dir, filename)
+            digest = render_cache.render_hash(spec, env, output, size)
+            if not args.force and manifest.is_current(filename, digest):
+                current += 1
+                dedupe.existing(digest, path)
+            elif dedupe.claim(digest, path) is None:
+                jobs.append((spec, size, filename, digest))
+            else:
+                links.setdefault(digest, []).append((spec["ml_code"], filename))
+        if current == len(args.sizes):
+            unchanged += 1  # počítá se po kódech, ne po velikostech
+
+    encode = partial(save_image, output_dir=args.output_dir, fmt=args.format,
+                     preset=args.preset, quality=args.quality)
+    failed = {}  # kód -> None; stačí jedna nepovedená velikost
+    encoded = encoder.EncodeReport()
+    try:
+        for index, stats, error in LedImageGenerator().generate_many(
+                [job[0] for job in jobs], workers=min(args.workers, len(jobs)) or 1, encode=encode,
+                scales=[size / config.IMAGE_SIZE for _, size, _, _ in jobs]):
+            spec, size, filename, digest = jobs[index]
+            if error:
+                print(f"Chyba při kreslení {spec['ml_code']}: {error}")
+                failed[spec["ml_code"]] = None
+            else:
+                manifest.record(filename, digest)
+                dedupe.written(digest)
+                encoded.add(stats)
+                print(f"Uloženo {encoder.describe(stats)}")
+        for digest, group in links.items():
+            for code, filename in group:
+                if dedupe.is_written(digest):
+                    dedupe.materialize(digest, os.path.join(args.output_dir, filename))
+                    manifest.record(filename, digest)
+                else:
+                    failed[code] = None
+    finally:
+        manifest.save()
+    errors.extend(failed)
+    done = len(specs) - len(failed)
+
+    elapsed = time.perf_counter() - started
+    print(f"HOTOVO! Vygenerováno {done} z {done + len(errors)} za {elapsed:.1f} s -> {args.output_dir}")
+    if unchanged:
+        print(f"Beze změny (nepřepsáno, --force pro přegenerování): {unchanged}")
+    if dedupe.summary():
+        print(dedupe.summary())
+    if encoded.summary():
+        print(encoded.summary())
+    if errors:
+        print(f"Chyby ({len(errors)}): {', '.join(errors)}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
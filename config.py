@@ -1,3 +1,5 @@
+import os
+
 # --- НАСТРОЙКИ UI ---
 APPEARANCE_MODE = "Dark"
 COLOR_THEME = "blue"
@@ -47,4 +49,68 @@ SUB_TEXTS = {
 
 # --- ШРИФТЫ ---
 FONT_BOLD = "arialbd.ttf"
-FONT_REGULAR = "arial.ttf"
\ No newline at end of file
+FONT_REGULAR = "arial.ttf"
+
+# Všechny řezy, které drawer používá (pro předehřátí registru fontů)
+FONT_FACES = [
+    (FONT_BOLD, 26), (FONT_BOLD, 35), (FONT_BOLD, 36), (FONT_BOLD, 38), (FONT_BOLD, 48),
+    (FONT_REGULAR, 16), (FONT_REGULAR, 18), (FONT_REGULAR, 26), (FONT_REGULAR, 45),
+]
+
+# --- CACHE ---
+# Strop paměti pro předpočítané ikony (IP, CRI, max-single/double, produktové)
+ICON_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Patičky (~1.2 MB na 1000x400 px), ~150 souborů se vejde celých
+FOOTER_CACHE_MAX_BYTES = 192 * 1024 * 1024
+# Hotové dlaždice mřížky (~57 kB každá)
+TILE_CACHE_MAX_ENTRIES = 1024
+
+# --- CACHE STRÁNEK (scraper) ---
+PAGE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcled", "pages")
+PAGE_CACHE_TTL = 24 * 3600  # sekundy
+
+# --- HTTP STAHOVÁNÍ (bez prohlížeče) ---
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
+HTTP_FETCH = True            # zkusit stránku nejdřív přes HTTP, Selenium jen když chybí pole
+HTTP_PER_HOST = 4            # souběžných požadavků na jeden host
+HTTP_MAX_CONNECTIONS = 16
+HTTP_TIMEOUT = 20            # sekundy
+# Bez těchto polí se HTTP text nepovažuje za úplný a stránka se stáhne prohlížečem
+HTTP_REQUIRED_FIELDS = ("color", "leds", "power")
+
+# --- ČEKÁNÍ NA STRÁNKU (Selenium) ---
+# Stránka je načtená, jakmile je v ní některý z těchto textů (tabulka parametrů)
+PAGE_READY_MARKERS = ("Barva světla", "Parametry")
+PAGE_READY_TIMEOUT = 10      # sekundy, pak se vezme text, který na stránce je
+# Minimální rozestup začátků dvou požadavků na web (ne pauza navíc po stažení)
+POLITENESS_DELAY = 1.5       # sekundy
+
+# --- ADAPTIVNÍ TEMPO DÁVEK (pacing.HostLimiter) ---
+# Začíná se na POLITENESS_DELAY; zdravé odpovědi interval zkracují, chyby a zpomalení prodlužují
+RATE_MIN_INTERVAL = 0.5      # sekundy
+RATE_MAX_INTERVAL = 30.0
+RATE_SPEEDUP = 0.9           # násobek intervalu po zdravé odpovědi
+RATE_BACKOFF = 2.0           # násobek po chybě nebo zpomalení
+RATE_JITTER = 0.25           # +-25 % náhodně k intervalu
+RATE_SLOW_FACTOR = 3.0       # odpověď pomalejší než 3x průměr = web se zpomaluje
+RATE_BREAKER_FAILURES = 5    # chyb po sobě -> pauza (jistič)
+RATE_BREAKER_COOLDOWN = 60.0 # sekundy, při opakovaném vypnutí se zdvojuje
+FETCH_ATTEMPTS = 3           # pokusů na stránku; neúspěšné jdou na konec fronty
+
+# --- POOL PROHLÍŽEČŮ (browser_pool) ---
+BROWSER_POOL_SIZE = 2        # souběžných prohlížečů v dávce
+BROWSER_MAX_PAGES = 200      # po tolika stránkách se prohlížeč restartuje
+BROWSER_MAX_MEMORY_MB = 1500 # nebo když Chrome přeroste tuto paměť (měří se jen s psutil)
+
+# --- CHROMEDRIVER ---
+# Vyřešená cesta a verze se pamatují tady; ChromeDriverManager se volá, jen když se změní verze Chrome
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "mcled", "chromedriver.json")
+DRIVER_OFFLINE = False       # True = nikdy nevolat ChromeDriverManager (počítač bez internetu)
+CHROMEDRIVER_PATH = None     # pevná cesta k chromedriveru (přebije cache i manager)
+
+# --- VÝSTUPNÍ OBRÁZKY (encoder) ---
+OUTPUT_FORMAT = "webp"       # webp / jpeg / png - přípona souboru odpovídá formátu
+OUTPUT_PRESET = "shop"       # fast / shop / best (kvalita a úsilí kodéru, viz encoder.PRESETS)
+ENCODE_WORKERS = 2           # vláken pro kódování (PIL při kódování uvolňuje GIL)
+IMAGE_SIZE = 1000            # strana čtverce v rozvržení drawer (scale 1)
+OUTPUT_SIZES = (1000,)       # strany v px, každá se kreslí nativně; jiné než IMAGE_SIZE mají v názvu _<px>px
@@ -1,55 +1,194 @@
 # drawer.py
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageOps
 import config
+import assets
+import fonts
 import re
 import math
-import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Готовые пиктограммы (RGBA, уже уменьшенные), общие для всех экземпляров
+_SPRITES = {}
+# Готовые плитки сетки (LRU): ключ = (поле, входы, размер),
+# значение = (RGBA плитка, обрезанная по нарисованному, сдвиг по x, y)
+_TILES = OrderedDict()
+_TILES_LOCK = threading.Lock()
+# Сторона итогового квадрата при scale 1; все размеры в коде заданы для неё
+IMAGE_SIZE = config.IMAGE_SIZE
+# Версия отрисовки для render_cache - увеличить при любом изменении вида картинки
+RENDER_VERSION = 1
+
+PROFILE_TYPES = ["ip20", "ip20_cob", "ip54", "ip54_vlhke", "ip67", "ip67_digital", "ip68"]
+
+# Префиксы ML-кодов, для которых нужна картинка 54D24R
+SPECIAL_FOOTER_PREFIXES = [
+    "ML.126.050.90", "ML.126.046.90", "ML.126.047.90",
+    "ML.126.045.90", "ML.126.048.90"
+]
+
+
+def uses_special_footer(ml_code):
+    """Нужен ли ML-коду футер 54D24R (по префиксу)"""
+    current_ml = str(ml_code).upper().replace("-", ".")
+    return any(current_ml.startswith(prefix) for prefix in SPECIAL_FOOTER_PREFIXES)
+
+
+def profile_model(data):
+    """Модель ленты; без поля model ищется "NNB" во всей спецификации, включая ml_code"""
+    model_val = str(data.get("model", "")).upper().strip()
+    if not model_val:
+        m_search = re.search(r'(\d{2}B)', str(data))
+        model_val = m_search.group(1) if m_search else ""
+    return model_val
+
+
+def segment_leds(data):
+    """Число LED на сегмент; если пусто - ищется "N LED" в остальных значениях"""
+    led_val = str(data.get("led_segment", "")).strip()
+    if not led_val or led_val == "0":
+        all_text = " ".join(str(v) for v in data.values())
+        match = re.search(r'(\d+)\s*LED', all_text, re.IGNORECASE)
+        if match:
+            led_val = match.group(1)
+    return "".join(filter(str.isdigit, led_val)) if led_val else "0"
+
+
+def code_inputs(data):
+    """Всё, что картинка берёт из ml_code (см. render_cache.render_hash)"""
+    return {"special_footer": uses_special_footer(data.get("ml_code", "")),
+            "model": profile_model(data), "segment_leds": segment_leds(data)}
+
+
+# Генератор процесса в пуле (см. generate_many)
+_worker_gen = None
+
+
+def _init_render_worker(width, height, scale):
+    global _worker_gen
+    fonts.prewarm()
+    _worker_gen = LedImageGenerator(width, height, scale)
+    _worker_gen.prewarm()
+
+
+def _render_in_worker(index, spec, encode, scale):
+    return _render_item(_worker_gen.at_scale(scale), index, spec, encode)
+
+
+def _render_item(gen, index, spec, encode):
+    try:
+        img = gen.generate(spec)
+        return index, (encode(img, spec) if encode else img), None
+    except Exception as e:
+        return index, None, f"{type(e).__name__}: {e}"
 
 class LedImageGenerator:
-    def __init__(self, width=1000, height=450):
-        self.width = width
-        self.height = height
-        self.size = 124
-        self.gap = 15
+    def __init__(self, width=1000, height=450, scale=1.0):
+        # width/height и все отступы в коде заданы для IMAGE_SIZE;
+        # scale переводит их в пиксели (0.3 -> превью 300 px, 2 -> печать 2000 px)
+        self.base_width = width
+        self.base_height = height
+        self.scale = scale
+        self.width = self._ipx(width)
+        self.height = self._ipx(height)
+        self.size = self._ipx(124)
+        self.gap = self._ipx(15)
         self.radius = 0  # Единый радиус скругления
+        self._scaled = {scale: self}
         self.load_fonts()
 
+    def _px(self, v):
+        """Координата для IMAGE_SIZE -> пиксели этого масштаба (при scale 1 без изменений)"""
+        return v if self.scale == 1 else v * self.scale
+
+    def _ipx(self, v):
+        """Как _px, но целые пиксели (размеры картинок)"""
+        return v if self.scale == 1 else round(v * self.scale)
+
+    def _lw(self, width):
+        """Толщина линии: ненулевая остаётся не меньше 1 px и в превью"""
+        return max(1, self._ipx(width)) if width else 0
+
+    def at_scale(self, scale):
+        """Генератор того же макета в другом масштабе (общий для всех вызовов)"""
+        gen = self._scaled.get(scale)
+        if gen is None:
+            gen = self._scaled[scale] = LedImageGenerator(self.base_width, self.base_height, scale)
+            gen._scaled = self._scaled
+        return gen
+
+    def generate_sizes(self, data, sizes):
+        """Рисует спецификацию сразу в нескольких размерах: {сторона в px: картинка}"""
+        return {size: self.at_scale(size / IMAGE_SIZE).generate(data) for size in sizes}
+
     def load_fonts(self):
-        try:
-            self.f_val = ImageFont.truetype(config.FONT_BOLD, 35)
-            self.f_rgb_small = ImageFont.truetype(config.FONT_BOLD, 36)
-            self.f_rgb_big = ImageFont.truetype(config.FONT_BOLD, 48)
-            self.f_dual_top = ImageFont.truetype(config.FONT_BOLD, 38)
-            self.f_dual_bot = ImageFont.truetype(config.FONT_BOLD, 38)
-            self.f_mid = ImageFont.truetype(config.FONT_REGULAR, 26)
-            self.f_sub = ImageFont.truetype(config.FONT_REGULAR, 16)
-            self.f_cut_num = ImageFont.truetype(config.FONT_BOLD, 26)
-            self.f_cri_angle = ImageFont.truetype(config.FONT_BOLD, 36)
-        except:
-            self.f_val = self.f_mid = self.f_sub = self.f_cut_num = \
-            self.f_rgb_small = self.f_rgb_big = self.f_dual_top = \
-            self.f_dual_bot = self.f_cri_angle = ImageFont.load_default()
-
-    def _find_image_path(self, base_name):
-        """Helper to find image path case-insensitively and with different extensions"""
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        base_dir = os.path.join(script_dir, "images")
-        
-        if not os.path.exists(base_dir):
-            return None
-            
-        target_name = base_name.lower()
-        for f in os.listdir(base_dir):
-            name_part = os.path.splitext(f)[0]
-            if name_part.lower() == target_name:
-                return os.path.join(base_dir, f)
-                
-        print(f"WARNING: Obrázek '{base_name}' nebyl nalezen ve složce images.")
-        return None
+        # Шрифты общие для процесса (fonts.get_font) - каждый грузится один раз
+        font = lambda path, size: fonts.get_font(path, max(1, self._ipx(size)))
+        self.f_val = font(config.FONT_BOLD, 35)
+        self.f_rgb_small = font(config.FONT_BOLD, 36)
+        self.f_rgb_big = font(config.FONT_BOLD, 48)
+        self.f_dual_top = font(config.FONT_BOLD, 38)
+        self.f_dual_bot = font(config.FONT_BOLD, 38)
+        self.f_mid = font(config.FONT_REGULAR, 26)
+        self.f_sub = font(config.FONT_REGULAR, 16)
+        self.f_cut_num = font(config.FONT_BOLD, 26)
+        self.f_cri_angle = font(config.FONT_BOLD, 36)
+        self.f_circ = font(config.FONT_REGULAR, 18)
+        self.f_h = font(config.FONT_REGULAR, 45)
+
+        fonts.prerender_labels(
+            [(self.f_mid, t) for t in config.SUB_TEXTS.values()] +
+            [(self.f_mid, t) for t in ("LED", "mm", " mm", "≤", " m")] +
+            [(self.f_rgb_small, "DC"), (self.f_val, "IP"), (self.f_val, "COB"),
+             (self.f_val, "AL-Profil"), (self.f_h, "h")]
+        )
+
+    def prewarm(self):
+        """Заранее рисует пиктограммы и схемы, грузит иконки (футеры - при первом использовании)"""
+        for kind in ["al_profile", "angle", "life"]:
+            self._sprite(kind)
+        for p_type in PROFILE_TYPES:
+            self._sprite("width_profile", p_type)
+            self._sprite("scheme", p_type)
+        assets.prewarm(self.size)
+
+    def generate_many(self, specs, workers=None, encode=None, scales=None):
+        """Рисует спецификации в пуле процессов; выдаёт (index, result, error) по мере готовности.
+
+        Процессов не больше, чем спецификаций. result - картинка или
+        encode(image, spec), посчитанный в процессе (функция верхнего уровня).
+        Ошибка - строка, пакет не останавливает. scales - масштаб каждой
+        спецификации (по умолчанию масштаб этого генератора).
+        """
+        specs = list(specs)
+        scales = list(scales) if scales is not None else [self.scale] * len(specs)
+        if workers:
+            workers = min(workers, len(specs))
+        if workers == 1 or len(specs) <= 1:
+            for i, spec in enumerate(specs):
+                yield _render_item(self.at_scale(scales[i]), i, spec, encode)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                 initargs=(self.base_width, self.base_height, self.scale)) as pool:
+            futures = [pool.submit(_render_in_worker, i, spec, encode, scales[i])
+                       for i, spec in enumerate(specs)]
+            for fut in as_completed(futures):
+                yield fut.result()
+
+    def _paste_icon(self, canvas, base_name, x, y):
+        """Вставка иконки из кэша (уже нужного размера); False, если файла нет"""
+        icon = assets.icons.get(base_name, (self.size, self.size))
+        if icon is None:
+            print(f"WARNING: Obrázek '{base_name}' nebyl nalezen ve složce images.")
+            return False
+        canvas.paste(icon, (int(x), int(y)), icon if icon.mode == 'RGBA' else None)
+        return True
 
     def generate(self, data):
         has_dynamic = data.get("cri") == "90" or data.get("angle")
-        canvas_height = self.height + 150 if has_dynamic else self.height
+        canvas_height = self.height + self._ipx(150) if has_dynamic else self.height
         canvas = Image.new('RGB', (self.width, canvas_height), 'white')
         draw = ImageDraw.Draw(canvas)
 
@@ -61,7 +200,7 @@ class LedImageGenerator:
         num_cols = 6
         content_width = (num_cols * self.size) + ((num_cols - 1) * self.gap)
         x_start = (self.width - content_width) // 2
-        y_start = 64
+        y_start = self._ipx(64)
 
         volt_val = data.get("voltage", "").strip()
         v_text_circuit = f"{volt_val} V DC"
@@ -72,98 +211,11 @@ class LedImageGenerator:
                 val = data.get(field, "").strip()
                 if not val and "max_" not in field: continue
 
-                val_up = val.upper()
                 curr_x = x_start + c_idx * (self.size + self.gap)
                 curr_y = y_start + r_idx * (self.size + self.gap)
-                
-                bg_color = "#EEEEEE"
-                txt_color = "black"
-
-                if field == "color":
-                    prod_map = {
-                        "OVOCE O": "o", "SÝRY S": "s", "PEČIVO P": "p", "UZENINY U": "u", "MASO M": "m", "MRAŽENÉ MR": "mr"
-                    }
-                    
-                    found_prod_file = None
-                    for key, fname_base in prod_map.items():
-                        if key in val_up:
-                            found_prod_file = fname_base
-                            break
-                    
-                    if found_prod_file:
-                        draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#EEEEEE", outline="#6E6E6E", width=1)
-                        icon_path = self._find_image_path(found_prod_file)
-                        if icon_path:
-                            try:
-                                with Image.open(icon_path) as icon:
-                                    icon = icon.resize((self.size, self.size), Image.Resampling.LANCZOS)
-                                    if icon.mode == 'RGBA':
-                                        draw._image.paste(icon, (int(curr_x), int(curr_y)), icon)
-                                    else:
-                                        draw._image.paste(icon, (int(curr_x), int(curr_y)))
-                            except Exception as e:
-                                print(f"Error loading product icon {found_prod_file}: {e}")
-                        continue
-
-                    # --- ЦВЕТА NW, WW, CW БЕЗ КЕЛЬВИНОВ ---
-                    kelvin = data.get("kelvin", "").strip()
-                    if val_up in ["NW", "WW", "CW"] and not kelvin:
-                        draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#EEEEEE", outline="#6E6E6E", width=1)
-                        self._draw_field_content(draw, field, val, curr_x, curr_y, "black", data, v_text_circuit)
-                        continue
-
-                    if "SPI" in val_up:
-                        draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#EEEEEE", outline="#6E6E6E", width=1)
-                        draw.text((curr_x + 12, curr_y + 15), "D", fill="#E30613", font=self.f_rgb_big)
-                        draw.text((curr_x + 45, curr_y + 15), "I", fill="#D9005B", font=self.f_rgb_big)
-                        draw.text((curr_x + 58, curr_y + 15), "G", fill="#662483", font=self.f_rgb_big)
-                        draw.text((curr_x + 95, curr_y + 15), "I", fill="#009EE3", font=self.f_rgb_big)
-                        s_y = curr_y + 75
-                        draw.rectangle([curr_x + 15, s_y, curr_x + self.size - 15, s_y + 25], outline="black", width=1)
-                        line_yt = curr_y + 82
-                        draw.line([curr_x + 16, line_yt - 2, curr_x + 16, line_yt + 2], fill="black", width=4)
-                        draw.line([curr_x + self.size - 17, line_yt - 2, curr_x + self.size - 17, line_yt + 2], fill="black", width=4)
-                        line_yb = curr_y + 92
-                        draw.line([curr_x + 16, line_yb - 2, curr_x + 16, line_yb + 2], fill="black", width=4)
-                        draw.line([curr_x + self.size - 17, line_yb - 2, curr_x + self.size - 17, line_yb + 2], fill="black", width=4)
-                        colors = ["#D9005B", "#009EE3", "#FFF100"]
-                        for i, c in enumerate(colors):
-                            draw.rectangle([curr_x + 27 + i*28, s_y + 7, curr_x + 37 + i*28, s_y + 17], fill=c, outline="black")
-                        continue
-
-                    if "UVA" in val_up or "UV" in val_up:
-                        draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#531E54")
-                        tw = draw.textbbox((0,0), "UV", font=self.f_rgb_big)[2]
-                        draw.text((curr_x + (self.size-tw)/2, curr_y + 35), "UV", fill="white", font=self.f_rgb_big)
-                        continue
-                    
-                    if "+" in val or "RGB" in val: 
-                        if "RGB" in val and "+" not in val: self._draw_rgb(canvas, draw, curr_x, curr_y)
-                        elif "RGB" in val and "+" in val: self._draw_rgbw(canvas, draw, curr_x, curr_y, val)
-                        else: self._draw_dual_white(canvas, draw, curr_x, curr_y, val)
-                        continue
-
-                if field == "life":
-                    self._draw_life(canvas, draw, curr_x, curr_y, val, bg_color, data)
-                    continue
-
-                if field == "color": 
-                    bg_color = config.COLOR_MAP_LIGHT.get(val.upper(), "#EEEEEE")
-                elif field == "chip":
-                    clean_val = val.upper().replace(" ", "").replace("-", "")
-                    for k, h in config.COLOR_MAP_CHIP.items():
-                        if k.upper() in clean_val: bg_color = h; txt_color = "white"; break
-                elif field == "ip":
-                    txt_color = config.COLOR_MAP_IP.get("IP"+val, config.COLOR_MAP_IP.get(val, "#A68FB8"))
-                elif field == "voltage":
-                    if "24" in val: txt_color = config.COLOR_MAP_VOLTAGE["24"]
-                    elif "12" in val: txt_color = config.COLOR_MAP_VOLTAGE["12"]
-
-                outline_color = "#6E6E6E" if bg_color.upper() == "#EEEEEE" else None
-                outline_width = 1 if outline_color else 0
-                
-                draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill=bg_color, width=outline_width) # outline=outline_color,
-                self._draw_field_content(draw, field, val, curr_x, curr_y, txt_color, data, v_text_circuit)
+                key = self._tile_key(field, val, data, v_text_circuit)
+                self._paste_tile(canvas, key, curr_x, curr_y, lambda c, d, x, y:
+                                 self._draw_grid_tile(c, d, field, val, x, y, data, v_text_circuit))
 
         extra_fields = []
         if data.get("cri") == "90": extra_fields.append("cri")
@@ -177,14 +229,20 @@ class LedImageGenerator:
             curr_x = x_start + idx * (self.size + self.gap)
             curr_y = y_start + 2 * (self.size + self.gap)
             
-            if field == "cri": self._draw_cri(draw, curr_x, curr_y)
-            elif field == "angle": self._draw_angle(draw, curr_x, curr_y, data.get("angle"))
-            elif field == "al_profile": self._draw_al_profile(draw, curr_x, curr_y)
+            if field == "cri":
+                self._paste_tile(canvas, ("cri",), curr_x, curr_y, lambda c, d, x, y: self._draw_cri(d, x, y))
+            elif field == "angle":
+                angle_val = data.get("angle")
+                self._paste_tile(canvas, ("angle", angle_val), curr_x, curr_y,
+                                 lambda c, d, x, y: self._draw_angle(d, x, y, angle_val))
+            elif field == "al_profile":
+                self._paste_tile(canvas, ("al_profile",), curr_x, curr_y, lambda c, d, x, y: self._draw_al_profile(d, x, y))
 
         self._draw_large_scheme(canvas, data)
 
         # --- ЛОГИКА ДОБАВЛЕНИЯ НИЖНЕЙ ЧАСТИ (ФУТЕРА) ---
-        final_canvas = Image.new('RGB', (1000, 1000), 'white')
+        final_size = self._ipx(IMAGE_SIZE)
+        final_canvas = Image.new('RGB', (final_size, final_size), 'white')
         final_canvas.paste(canvas, (0, 0))
 
         model_full = str(data.get("model", "")).upper().strip()
@@ -200,57 +258,19 @@ class LedImageGenerator:
         yellow_keywords = ["Y", "G", "B", "R", "A", "O", "P", "S", "M", "MR", "SPI", "DW", "RGB"]
         
         suffix = ""
-                # --- ИСКЛЮЧЕНИЕ ДЛЯ 54D24R ---
-        # Получаем ML код (должен быть передан в data['ml_code'] из GUI)
-        current_ml = str(data.get("ml_code", "")).upper().replace("-", ".")
-        
-        # Список префиксов ML-кодов, для которых нужна картинка 54D24R
-        special_prefixes = [
-            "ML.126.050.90", "ML.126.046.90", "ML.126.047.90", 
-            "ML.126.045.90", "ML.126.048.90"
-        ]
-        
-        is_special = any(current_ml.startswith(prefix) for prefix in special_prefixes)
-        
-        if is_special:
+        # --- ИСКЛЮЧЕНИЕ ДЛЯ 54D24R ---
+        # ML код (должен быть передан в data['ml_code'] из GUI)
+        if uses_special_footer(data.get("ml_code", "")):
             footer_name_full = "54D24R"
-            footer_path = self._find_image_path(footer_name_full)
-            if footer_path:
-                 try:
-                    with Image.open(footer_path) as footer:
-                        if footer.width != 1000:
-                            ratio = 1000 / footer.width
-                            new_h = int(footer.height * ratio)
-                            footer = footer.resize((1000, new_h), Image.Resampling.LANCZOS)
-                        
-                        final_canvas.paste(footer, (0, 1000 - footer.height))
-                        print(f"SUCCESS: Special footer added: {footer_name_full}")
-                        
-                        # Добавляем текст (LED/Cut) как в стандартном блоке
-                        draw_final = ImageDraw.Draw(final_canvas)
-                        led_seg = str(data.get("led_segment", "")).strip()
-                        if not led_seg or led_seg == "0":
-                             m = re.search(r'(\d+)\s*LED', " ".join(str(v) for v in data.values()), re.IGNORECASE)
-                             led_seg = m.group(1) if m else "0"
-                        cut_val = str(data.get("cut", "")).strip()
-                        font = self.f_val 
-                        footer_y = 1000 - footer.height
-                        
-                        # Позиция текста
-                        x_center = 500
-                        y_base = footer_y + 40 
-                        
-                        t1 = f"{led_seg} LED"
-                        w1 = draw_final.textbbox((0,0), t1, font=font)[2]
-                        draw_final.text((x_center - w1/2, y_base + 47), t1, fill="black", font=font)
-                        
-                        t2 = f"{cut_val} mm"
-                        w2 = draw_final.textbbox((0,0), t2, font=font)[2]
-                        draw_final.text((x_center - w2/2, y_base + 87), t2, fill="black", font=font)
-                        
-                        return final_canvas
-                 except Exception as e:
-                    print(f"Error adding special footer: {e}")
+            try:
+                footer = self._get_footer(footer_name_full)
+                if footer:
+                    # Текст (LED/Cut) как в стандартном блоке, но LED сверху
+                    self._paste_footer(final_canvas, footer, data, cut_first=False)
+                    print(f"SUCCESS: Special footer added: {footer_name_full}")
+                    return final_canvas
+            except Exception as e:
+                print(f"Error adding special footer: {e}")
         # -----------------------------
 
         if any(kw in color_val for kw in yellow_keywords):
@@ -262,98 +282,209 @@ class LedImageGenerator:
 
         if model_code and volt_code:
             # 1. Пробуем найти полное имя: МОДЕЛЬ + ВОЛЬТ + СУФФИКС (напр. 10A24Y)
-            footer_name_full = f"{model_code}{volt_code}{suffix}"
-            footer_path = self._find_image_path(footer_name_full)
-            
-            # 2. Если не нашли, пробуем без суффикса: МОДЕЛЬ + ВОЛЬТ (напр. 37A24)
-            if not footer_path:
-                footer_name_short = f"{model_code}{volt_code}"
-                footer_path = self._find_image_path(footer_name_short)
+            footer_name = f"{model_code}{volt_code}{suffix}"
+            try:
+                footer = self._get_footer(footer_name)
+
+                # 2. Если не нашли, пробуем без суффикса: МОДЕЛЬ + ВОЛЬТ (напр. 37A24)
+                if not footer:
+                    footer_name = f"{model_code}{volt_code}"
+                    footer = self._get_footer(footer_name)
+
+                if footer:
+                    self._paste_footer(final_canvas, footer, data, cut_first=True)
+                    print(f"SUCCESS: Footer added: {footer_name}")
+                else:
+                    print(f"WARNING: No footer found for {model_code} {volt_code}")
+            except Exception as e:
+                print(f"ERROR adding footer: {e}")
+        
+        return final_canvas
 
-            if footer_path:
+    def _draw_grid_tile(self, canvas, draw, field, val, curr_x, curr_y, data, v_text_circuit):
+        val_up = val.upper()
+        bg_color = "#EEEEEE"
+        txt_color = "black"
+
+        if field == "color":
+            prod_map = {
+                "OVOCE O": "o", "SÝRY S": "s", "PEČIVO P": "p", "UZENINY U": "u", "MASO M": "m", "MRAŽENÉ MR": "mr"
+            }
+            
+            found_prod_file = None
+            for key, fname_base in prod_map.items():
+                if key in val_up:
+                    found_prod_file = fname_base
+                    break
+            
+            if found_prod_file:
+                draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#EEEEEE", outline="#6E6E6E", width=self._lw(1))
                 try:
-                    with Image.open(footer_path) as footer:
-                        # Масштабируем по ширине 1000px
-                        ratio = 1000 / footer.width
-                        new_h = int(footer.height * ratio)
-                        footer = footer.resize((1000, new_h), Image.Resampling.LANCZOS)
-                        
-                        final_canvas.paste(footer, (0, 1000 - footer.height))
-                        #--- ВСТАВКА ТЕКСТА НА ФУТЕР ---
-                        draw_final = ImageDraw.Draw(final_canvas)
-                        
-                        # Получаем значения
-                        led_seg = str(data.get("led_segment", "")).strip()
-                        # Если led_segment пустой, пробуем найти в тексте (как в блоке "cut")
-                        if not led_seg or led_seg == "0":
-                            # Простая попытка извлечь число перед LED если оно есть в values
-                            # Или берем из 'cut' если там есть логика (но cut это мм)
-                            # В блоке cut логика такая:
-                            all_vals = " ".join(str(v) for v in data.values())
-                            m = re.search(r'(\d+)\s*LED', all_vals, re.IGNORECASE)
-                            led_seg = m.group(1) if m else "0"
-                        
-                        cut_val = str(data.get("cut", "")).strip()
-
-                        # Текст: "{led_seg} LED"
-                        text_led = f"{led_seg} LED"
-                        # Текст: "{cut_val} mm"
-                        text_cut = f"{cut_val} mm"
-
-                        # Настройки шрифта (используем существующие или по умолчанию)
-                        # Вы можете настроить размер (например 30) и позицию
-                        f_footer = self.f_val # Или загрузить свой: ImageFont.truetype(config.FONT_BOLD, 36)
-                        
-                        # Вычисляем позицию X для центрирования
-                        # Ширина картинки 1000. Центр 500.
-                        # Позиция Y: футер начинается на (1000 - footer.height). 
-                        # Текст хотим "примерно наверху по середине" ФУТЕРА.
-                        # Допустим отступ сверху футера +30px.
-                        
-                        footer_y_start = 1000 - footer.height
-                        text_y_start = footer_y_start + 40 # Настройте отступ сверху здесь
-
-                        # Рисуем Cut
-                        w_cut = draw_final.textbbox((0,0), text_cut, font=f_footer)[2]
-                        draw_final.text((500 - w_cut/2, text_y_start + 47), text_cut, fill="black", font=f_footer)
-
-                        # Рисуем LED (под Cut)
-                        w_led = draw_final.textbbox((0,0), text_led, font=f_footer)[2]
-                        draw_final.text((500 - w_led/2, text_y_start + 87), text_led, fill="black", font=f_footer)
-
-                        # -------------------------------
-                        print(f"SUCCESS: Footer added: {os.path.basename(footer_path)}")
+                    self._paste_icon(canvas, found_prod_file, curr_x, curr_y)
                 except Exception as e:
-                    print(f"ERROR adding footer: {e}")
-            else:
-                print(f"WARNING: No footer found for {model_code} {volt_code}")
+                    print(f"Error loading product icon {found_prod_file}: {e}")
+                return
+
+            # --- ЦВЕТА NW, WW, CW БЕЗ КЕЛЬВИНОВ ---
+            kelvin = data.get("kelvin", "").strip()
+            if val_up in ["NW", "WW", "CW"] and not kelvin:
+                draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#EEEEEE", outline="#6E6E6E", width=self._lw(1))
+                self._draw_field_content(draw, field, val, curr_x, curr_y, "black", data, v_text_circuit)
+                return
+
+            if "SPI" in val_up:
+                px = self._px
+                draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#EEEEEE", outline="#6E6E6E", width=self._lw(1))
+                fonts.draw_label(draw, (curr_x + px(12), curr_y + px(15)), "D", "#E30613", self.f_rgb_big)
+                fonts.draw_label(draw, (curr_x + px(45), curr_y + px(15)), "I", "#D9005B", self.f_rgb_big)
+                fonts.draw_label(draw, (curr_x + px(58), curr_y + px(15)), "G", "#662483", self.f_rgb_big)
+                fonts.draw_label(draw, (curr_x + px(95), curr_y + px(15)), "I", "#009EE3", self.f_rgb_big)
+                s_y = curr_y + px(75)
+                draw.rectangle([curr_x + px(15), s_y, curr_x + self.size - px(15), s_y + px(25)], outline="black", width=self._lw(1))
+                line_yt = curr_y + px(82)
+                draw.line([curr_x + px(16), line_yt - px(2), curr_x + px(16), line_yt + px(2)], fill="black", width=self._lw(4))
+                draw.line([curr_x + self.size - px(17), line_yt - px(2), curr_x + self.size - px(17), line_yt + px(2)], fill="black", width=self._lw(4))
+                line_yb = curr_y + px(92)
+                draw.line([curr_x + px(16), line_yb - px(2), curr_x + px(16), line_yb + px(2)], fill="black", width=self._lw(4))
+                draw.line([curr_x + self.size - px(17), line_yb - px(2), curr_x + self.size - px(17), line_yb + px(2)], fill="black", width=self._lw(4))
+                colors = ["#D9005B", "#009EE3", "#FFF100"]
+                for i, c in enumerate(colors):
+                    draw.rectangle([curr_x + px(27 + i*28), s_y + px(7), curr_x + px(37 + i*28), s_y + px(17)], fill=c, outline="black")
+                return
+
+            if "UVA" in val_up or "UV" in val_up:
+                draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill="#531E54")
+                tw = fonts.text_bbox("UV", self.f_rgb_big)[2]
+                fonts.draw_label(draw, (curr_x + (self.size-tw)/2, curr_y + self._px(35)), "UV", "white", self.f_rgb_big)
+                return
+            
+            if "+" in val or "RGB" in val: 
+                if "RGB" in val and "+" not in val: self._draw_rgb(canvas, draw, curr_x, curr_y)
+                elif "RGB" in val and "+" in val: self._draw_rgbw(canvas, draw, curr_x, curr_y, val)
+                else: self._draw_dual_white(canvas, draw, curr_x, curr_y, val)
+                return
+
+        if field == "life":
+            self._draw_life(canvas, draw, curr_x, curr_y, val, bg_color, data)
+            return
+
+        if field == "color": 
+            bg_color = config.COLOR_MAP_LIGHT.get(val.upper(), "#EEEEEE")
+        elif field == "chip":
+            clean_val = val.upper().replace(" ", "").replace("-", "")
+            for k, h in config.COLOR_MAP_CHIP.items():
+                if k.upper() in clean_val: bg_color = h; txt_color = "white"; break
+        elif field == "ip":
+            txt_color = config.COLOR_MAP_IP.get("IP"+val, config.COLOR_MAP_IP.get(val, "#A68FB8"))
+        elif field == "voltage":
+            if "24" in val: txt_color = config.COLOR_MAP_VOLTAGE["24"]
+            elif "12" in val: txt_color = config.COLOR_MAP_VOLTAGE["12"]
+
+        outline_color = "#6E6E6E" if bg_color.upper() == "#EEEEEE" else None
+        outline_width = self._lw(1) if outline_color else 0
         
-        return final_canvas
+        draw.rounded_rectangle([curr_x, curr_y, curr_x + self.size, curr_y + self.size], radius=self.radius, fill=bg_color, width=outline_width) # outline=outline_color,
+        self._draw_field_content(draw, field, val, curr_x, curr_y, txt_color, data, v_text_circuit)
+
+    def _tile_key(self, field, val, data, v_text):
+        """Нормализованные входы, от которых зависит плитка (остальные поля на неё не влияют)"""
+        if field == "color":
+            return (field, val, data.get("kelvin", "").strip())
+        if field == "width":
+            return (field, val, self._width_profile_type(data))
+        if field == "cut":
+            return (field, val, segment_leds(data))
+        if field in ["max_single", "max_double"]:
+            return (field, val, v_text)
+        if field == "life":
+            return (field, val, data.get("life_l", "70"), data.get("life_b", "50"))
+        return (field, val)
+
+    def _paste_tile(self, canvas, key, x, y, render):
+        """Вставка плитки из кэша; при первом вызове её рисует render(canvas, draw, x, y)
+
+        Рисуется на прозрачном холсте с полем в целую плитку, поэтому длинный
+        текст не обрезается, и вставляется по своей альфе, как при рисовании
+        прямо на холст.
+        """
+        cache_key = key + (self.size, self.scale)
+        with _TILES_LOCK:
+            entry = _TILES.get(cache_key)
+            if entry is not None:
+                _TILES.move_to_end(cache_key)
+        if entry is None:
+            pad = self.size
+            tile = Image.new('RGBA', (self.size + 1 + 2 * pad, self.size + 1 + 2 * pad), (255, 255, 255, 0))
+            render(tile, ImageDraw.Draw(tile), pad, pad)
+            # Сам квадрат плитки непрозрачный (paste иконки с маской смешивает и альфу)
+            alpha = tile.getchannel("A")
+            alpha.paste(255, (pad, pad, pad + self.size + 1, pad + self.size + 1))
+            tile.putalpha(alpha)
+            bbox = alpha.getbbox()
+            entry = (tile.crop(bbox), bbox[0] - pad, bbox[1] - pad)
+            with _TILES_LOCK:
+                _TILES[cache_key] = entry
+                if len(_TILES) > config.TILE_CACHE_MAX_ENTRIES:
+                    _TILES.popitem(last=False)
+        tile, dx, dy = entry
+        canvas.paste(tile, (int(x) + dx, int(y) + dy), tile)
+
+    def _sprite(self, kind, variant=None):
+        """Пиктограмма с суперсэмплингом, рисуется один раз на (kind, variant, size, scale)"""
+        key = (kind, variant, self.size, self.scale)
+        sprite = _SPRITES.get(key)
+        if sprite is None:
+            sprite = getattr(self, f"_render_{kind}")(variant)
+            _SPRITES[key] = sprite
+        return sprite
+
+    def _get_footer(self, footer_name):
+        """Футер по ширине итогового холста, из общего кэша"""
+        footer = assets.footers.get(footer_name, self._ipx(IMAGE_SIZE))
+        if footer is None:
+            print(f"WARNING: Obrázek '{footer_name}' nebyl nalezen ve složce images.")
+        return footer
+
+    def _paste_footer(self, final_canvas, footer, data, cut_first):
+        """Вставка футера и двух строк текста ("{led} LED" и "{cut} mm") по центру"""
+        footer_y_start = final_canvas.height - footer.height
+        final_canvas.paste(footer, (0, footer_y_start))
+        draw_final = ImageDraw.Draw(final_canvas)
+
+        led_seg = str(data.get("led_segment", "")).strip()
+        # Если led_segment пустой, пробуем найти число перед LED в остальных значениях
+        if not led_seg or led_seg == "0":
+            all_vals = " ".join(str(v) for v in data.values())
+            m = re.search(r'(\d+)\s*LED', all_vals, re.IGNORECASE)
+            led_seg = m.group(1) if m else "0"
+        cut_val = str(data.get("cut", "")).strip()
+
+        text_led = f"{led_seg} LED"
+        text_cut = f"{cut_val} mm"
+        lines = [text_cut, text_led] if cut_first else [text_led, text_cut]
+
+        # Текст хотим "примерно наверху по середине" ФУТЕРА, отступ сверху +40px
+        f_footer = self.f_val
+        text_y_start = footer_y_start + self._px(40)
+        for txt, dy in zip(lines, (47, 87)):
+            w = fonts.text_bbox(txt, f_footer)[2]
+            draw_final.text((final_canvas.width // 2 - w/2, text_y_start + self._px(dy)), txt, fill="black", font=f_footer)
 
     def _draw_cri(self, draw, x, y):
         """Отрисовка CRI 90 с использованием иконки"""
         draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, fill="#EEEEEE") #, outline="#6E6E6E", width=1
         
-        icon_loaded = False
         try:
-            icon_path = self._find_image_path("CRI_90")
-            
-            if icon_path:
-                with Image.open(icon_path) as icon:
-                    icon = icon.resize((self.size, self.size), Image.Resampling.LANCZOS)
-                    draw._image.paste(icon, (int(x), int(y)), icon if icon.mode == 'RGBA' else None)
-                    return
+            if self._paste_icon(draw._image, "CRI_90", x, y):
+                return
         except: pass
-        font = self.f_cri_angle
-        draw.text((x + 35, y + 28), "CRI", fill="black", font=font)
-        draw.text((x + 45, y + 68), "90", fill="black", font=font)
 
         # Fallback
-        if not icon_loaded:
-            font = self.f_cri_angle
-            tw_cri = draw.textbbox((0,0), "CRI", font=font)[2]
-            draw.text((x + (self.size - tw_cri) / 2, y + 28), "CRI", fill="black", font=font)
-            draw.text((x + (self.size - tw_90) / 2, y + 68), "90", fill="black", font=font)
+        font = self.f_cri_angle
+        tw_cri = fonts.text_bbox("CRI", font)[2]
+        tw_90 = fonts.text_bbox("90", font)[2]
+        fonts.draw_label(draw, (x + (self.size - tw_cri) / 2, y + self._px(28)), "CRI", "black", font)
+        fonts.draw_label(draw, (x + (self.size - tw_90) / 2, y + self._px(68)), "90", "black", font)
 
     def _draw_angle(self, draw, x, y, angle_val):
         """Отрисовка угла"""
@@ -361,18 +492,23 @@ class LedImageGenerator:
         
         txt = f"{angle_val}°"
         font = self.f_cri_angle
-        tw = draw.textbbox((0,0), txt, font=font)[2]
-        draw.text((x + (self.size-tw)/2, y + 15), txt, fill="black", font=font)
+        tw = fonts.text_bbox(txt, font)[2]
+        draw.text((x + (self.size-tw)/2, y + self._px(15)), txt, fill="black", font=font)
         
+        sprite = self._sprite("angle")
+        draw._image.paste(sprite, (int(x), int(y)), sprite)
+
+    def _render_angle(self, variant):
+        """Лучи угла излучения (от значения угла не зависят)"""
         upscale = 4
         temp_size = self.size * upscale
         temp_img = Image.new('RGBA', (temp_size, temp_size), (0, 0, 0, 0))
         t_draw = ImageDraw.Draw(temp_img)
         
-        cx, cy = temp_size / 2, temp_size - 20 * upscale
-        line_len = 80 * upscale
+        cx, cy = temp_size / 2, temp_size - self._px(20) * upscale
+        line_len = self._px(80) * upscale
         angle_spread_rad = math.radians(40) 
-        line_w = 2 * upscale
+        line_w = self._lw(2) * upscale
         
         lx = cx - line_len * math.sin(angle_spread_rad)
         ly = cy - line_len * math.cos(angle_spread_rad)
@@ -382,12 +518,10 @@ class LedImageGenerator:
         t_draw.line([cx, cy, lx, ly], fill="black", width=line_w)
         t_draw.line([cx, cy, rx, ry], fill="black", width=line_w)
         
-        arc_r = 45 * upscale
+        arc_r = self._px(45) * upscale
         t_draw.arc([cx-arc_r, cy-arc_r, cx+arc_r, cy+arc_r], start=215, end=325, fill="black", width=line_w)
         
-        temp_img = temp_img.resize((self.size, self.size), Image.Resampling.LANCZOS)
-        canvas_ref = draw._image
-        canvas_ref.paste(temp_img, (int(x), int(y)), temp_img)
+        return temp_img.resize((self.size, self.size), Image.Resampling.LANCZOS)
 
     def _apply_rounded_mask(self, canvas, temp_sq, x, y):
         mask = Image.new('L', (self.size, self.size), 0)
@@ -396,44 +530,44 @@ class LedImageGenerator:
         canvas.paste(temp_sq, (int(x), int(y)), mask)
 
     def draw_circuit(self, draw, x, y, size, mode, voltage_text):
-        rect_x1, rect_y1 = x + 19, y + 63
-        rect_x2, rect_y2 = x + size - 19, y + 78
-        draw.rectangle([rect_x1, rect_y1, rect_x2, rect_y2], outline="black", width=2)
+        px, lw = self._px, self._lw
+        rect_x1, rect_y1 = x + px(19), y + px(63)
+        rect_x2, rect_y2 = x + size - px(19), y + px(78)
+        draw.rectangle([rect_x1, rect_y1, rect_x2, rect_y2], outline="black", width=lw(2))
         for i in range(6): 
-            dot_x = rect_x1 + 8 + i * 13
-            draw.rectangle([dot_x, rect_y1 + 5, dot_x + 4, rect_y1 + 10], fill="black")
+            dot_x = rect_x1 + px(8 + i * 13)
+            draw.rectangle([dot_x, rect_y1 + px(5), dot_x + px(4), rect_y1 + px(10)], fill="black")
 
-        try: f_circ = ImageFont.truetype(config.FONT_REGULAR, 18)
-        except: f_circ = ImageFont.load_default()
-            
-        w_v = draw.textbbox((0,0), voltage_text, font=f_circ)[2]
+        f_circ = self.f_circ
+        bbox_v = fonts.text_bbox(voltage_text, f_circ)
+        w_v = bbox_v[2]
         text_x = x + (size - w_v) / 2
-        text_y = y + 90
-        draw.text((text_x, text_y), voltage_text, fill="black", font=f_circ)
+        text_y = y + px(90)
+        fonts.draw_label(draw, (text_x, text_y), voltage_text, "black", f_circ)
 
-        h_v = draw.textbbox((0,0), voltage_text, font=f_circ)[3] - draw.textbbox((0,0), voltage_text, font=f_circ)[1]
-        text_center_y = text_y + 4 + h_v / 2
-        v_gap = 4 
+        h_v = bbox_v[3] - bbox_v[1]
+        text_center_y = text_y + px(4) + h_v / 2
+        v_gap = px(4)
         dot_y_top = text_center_y - v_gap
         dot_y_bot = text_center_y + v_gap
-        dot_x_right = text_x + w_v + 6
-        dot_x_left = text_x - 6
-        dot_r = 2
+        dot_x_right = text_x + w_v + px(6)
+        dot_x_left = text_x - px(6)
+        dot_r = px(2)
 
         def draw_side(side):
             start_x = rect_x1 if side == "left" else rect_x2
             target_dot_x = dot_x_left if side == "left" else dot_x_right
-            if side == "right": elbow_x_outer, elbow_x_inner = start_x + 14, start_x + 8
-            else: elbow_x_outer, elbow_x_inner = start_x - 14, start_x - 8
+            if side == "right": elbow_x_outer, elbow_x_inner = start_x + px(14), start_x + px(8)
+            else: elbow_x_outer, elbow_x_inner = start_x - px(14), start_x - px(8)
 
-            draw.line([start_x, rect_y1 + 4, elbow_x_outer, rect_y1 + 4], fill="black", width=1)
-            draw.line([elbow_x_outer, rect_y1 + 4, elbow_x_outer, dot_y_bot], fill="black", width=1)
-            draw.line([elbow_x_outer, dot_y_bot, target_dot_x, dot_y_bot], fill="black", width=1)
+            draw.line([start_x, rect_y1 + px(4), elbow_x_outer, rect_y1 + px(4)], fill="black", width=lw(1))
+            draw.line([elbow_x_outer, rect_y1 + px(4), elbow_x_outer, dot_y_bot], fill="black", width=lw(1))
+            draw.line([elbow_x_outer, dot_y_bot, target_dot_x, dot_y_bot], fill="black", width=lw(1))
             draw.ellipse([target_dot_x-dot_r, dot_y_bot-dot_r, target_dot_x+dot_r, dot_y_bot+dot_r], fill="black")
 
-            draw.line([start_x, rect_y2 - 4, elbow_x_inner, rect_y2 - 4], fill="black", width=1)
-            draw.line([elbow_x_inner, rect_y2 - 4, elbow_x_inner, dot_y_top], fill="black", width=1)
-            draw.line([elbow_x_inner, dot_y_top, target_dot_x, dot_y_top], fill="black", width=1)
+            draw.line([start_x, rect_y2 - px(4), elbow_x_inner, rect_y2 - px(4)], fill="black", width=lw(1))
+            draw.line([elbow_x_inner, rect_y2 - px(4), elbow_x_inner, dot_y_top], fill="black", width=lw(1))
+            draw.line([elbow_x_inner, dot_y_top, target_dot_x, dot_y_top], fill="black", width=lw(1))
             draw.ellipse([target_dot_x-dot_r, dot_y_top-dot_r, target_dot_x+dot_r, dot_y_top+dot_r], fill="black")
 
         draw_side("right")
@@ -445,27 +579,32 @@ class LedImageGenerator:
         
         txt = "AL-Profil"
         font = self.f_val
-        if draw.textbbox((0,0), txt, font=font)[2] > self.size - 10:
+        if fonts.text_bbox(txt, font)[2] > self.size - self._px(10):
              font = self.f_mid
-        tw = draw.textbbox((0,0), txt, font=font)[2]
-        draw.text((x + (self.size - tw) / 2, y + 10), txt, fill="black", font=font)
+        tw = fonts.text_bbox(txt, font)[2]
+        fonts.draw_label(draw, (x + (self.size - tw) / 2, y + self._px(10)), txt, "black", font)
+
+        sprite = self._sprite("al_profile")
+        draw._image.paste(sprite, (int(x), int(y)), sprite)
 
+    def _render_al_profile(self, variant):
+        """Профиль с рёбрами и волнистые стрелки отвода тепла, 8x суперсэмплинг"""
         upscale = 8
         ts = self.size * upscale
         timg = Image.new('RGBA', (ts, ts), (0, 0, 0, 0))
         td = ImageDraw.Draw(timg)
         
         cx = ts // 2
-        cy = ts // 2 + 6 * upscale
-        w_inner = 70 * upscale
-        h_wall = 31 * upscale
-        base_y = cy + 10 * upscale
+        cy = ts // 2 + self._px(6) * upscale
+        w_inner = self._px(70) * upscale
+        h_wall = self._px(31) * upscale
+        base_y = cy + self._px(10) * upscale
         top_y = base_y - h_wall
-        wall_thick = 4 * upscale
-        fin_len = 8 * upscale
-        fin_h = 4 * upscale
-        rib_step = 9 * upscale
-        line_w = 1 * upscale 
+        wall_thick = self._px(4) * upscale
+        fin_len = self._px(8) * upscale
+        fin_h = self._px(4) * upscale
+        rib_step = self._px(9) * upscale
+        line_w = self._lw(1) * upscale
 
         points = []
         x_wall_left = cx - w_inner // 2 - line_w // 2 - wall_thick
@@ -501,20 +640,20 @@ class LedImageGenerator:
         points.append((x_fin_left, top_y))
 
         td.line(points, fill="black", width=line_w, joint="curve")
-        td.rectangle([cx-32*upscale, base_y-9*upscale, cx+32*upscale, base_y-3*upscale], outline="black", fill="#989898", width=1*upscale)
-        td.rectangle([cx-8*upscale, base_y-18*upscale, cx+8*upscale, base_y-8*upscale], outline="black", width=1*upscale)
+        td.rectangle([cx-self._px(32) * upscale, base_y-self._px(9) * upscale, cx+self._px(32) * upscale, base_y-self._px(3) * upscale], outline="black", fill="#989898", width=self._lw(1) * upscale)
+        td.rectangle([cx-self._px(8) * upscale, base_y-self._px(18) * upscale, cx+self._px(8) * upscale, base_y-self._px(8) * upscale], outline="black", width=self._lw(1) * upscale)
 
-        arrow_y_start = base_y + 8 * upscale
+        arrow_y_start = base_y + self._px(8) * upscale
         def draw_wavy_arrow(ax, ay, angle_deg=0):
             import math
-            arc_size = 10 * upscale
-            line_w = 1 * upscale
-            td.arc([ax, ay - 52, ax + arc_size, ay + 88], 330, 66, fill="black", width=line_w)
-            td.arc([ax + 4, ay + arc_size, ax + 98, ay + 3 * arc_size], 120, -87, fill="black", width=line_w)
-            tip_x = ax - arc_size + 72
-            tip_y = ay + 3 * arc_size - 38
+            arc_size = self._px(10) * upscale
+            line_w = self._lw(1) * upscale
+            td.arc([ax, ay - self._px(52), ax + arc_size, ay + self._px(88)], 330, 66, fill="black", width=line_w)
+            td.arc([ax + self._px(4), ay + arc_size, ax + self._px(98), ay + 3 * arc_size], 120, -87, fill="black", width=line_w)
+            tip_x = ax - arc_size + self._px(72)
+            tip_y = ay + 3 * arc_size - self._px(38)
             angle_rad = math.radians(angle_deg)
-            tsize = 5 * upscale
+            tsize = self._px(5) * upscale
             base_poly = [(0, 0), (-tsize // 1.5, -tsize), (tsize // 1.5, -tsize)]
             rotated_poly = []
             for px, py in base_poly:
@@ -523,65 +662,84 @@ class LedImageGenerator:
                 rotated_poly.append((rx + tip_x, ry + tip_y))
             td.polygon(rotated_poly, fill="black")
 
-        draw_wavy_arrow(cx - 20*upscale, arrow_y_start, angle_deg=100)
-        draw_wavy_arrow(cx - 5*upscale,  arrow_y_start, angle_deg=100)
-        draw_wavy_arrow(cx + 10*upscale, arrow_y_start, angle_deg=100)
+        draw_wavy_arrow(cx - self._px(20) * upscale, arrow_y_start, angle_deg=100)
+        draw_wavy_arrow(cx - self._px(5) * upscale,  arrow_y_start, angle_deg=100)
+        draw_wavy_arrow(cx + self._px(10) * upscale, arrow_y_start, angle_deg=100)
 
-        timg = timg.resize((self.size, self.size), Image.Resampling.LANCZOS)
-        draw._image.paste(timg, (int(x), int(y)), timg)
+        return timg.resize((self.size, self.size), Image.Resampling.LANCZOS)
 
     def _draw_width_profile(self, draw, x, y, p_type):
         """ Рисует технические разрезы оболочек лент """
+        sprite = self._sprite("width_profile", p_type)
+        draw._image.paste(sprite, (int(x), int(y)), sprite)
+
+    def _render_width_profile(self, p_type):
         upscale = 4
+        px = self._px
         tsize = self.size * upscale
         timg = Image.new('RGBA', (tsize, tsize), (0,0,0,0))
         td = ImageDraw.Draw(timg)
         
         cx = tsize // 2
-        base_y = 55 * upscale
-        w = 60 * upscale
+        base_y = px(55) * upscale
+        w = px(60) * upscale
         
         if p_type == "ip20" or p_type == "ip54" or p_type == "ip67_digital":
-            td.rectangle([cx-34*upscale, base_y-2*upscale, cx+34*upscale, base_y+3*upscale], outline="black", fill="#989898", width=2*upscale)
-            td.rectangle([cx-10*upscale, base_y-8*upscale, cx+10*upscale, base_y], outline="black", width=2*upscale)
+            td.rectangle([cx-px(34) * upscale, base_y-px(2) * upscale, cx+px(34) * upscale, base_y+px(3) * upscale], outline="black", fill="#989898", width=self._lw(2) * upscale)
+            td.rectangle([cx-px(10) * upscale, base_y-px(8) * upscale, cx+px(10) * upscale, base_y], outline="black", width=self._lw(2) * upscale)
         elif p_type == "ip20_cob":
-            td.rectangle([cx-34*upscale, base_y-2*upscale, cx+34*upscale, base_y+3*upscale], outline="black", fill="#989898", width=2*upscale)
-            td.chord([cx-13*upscale, base_y-8*upscale, cx+13*upscale, base_y+8*upscale], 180, 360, outline="black", width=2*upscale)
+            td.rectangle([cx-px(34) * upscale, base_y-px(2) * upscale, cx+px(34) * upscale, base_y+px(3) * upscale], outline="black", fill="#989898", width=self._lw(2) * upscale)
+            td.chord([cx-px(13) * upscale, base_y-px(8) * upscale, cx+px(13) * upscale, base_y+px(8) * upscale], 180, 360, outline="black", width=self._lw(2) * upscale)
         elif p_type == "ip67" or p_type == "ip54_vlhke":
-            td.chord([cx-34*upscale, base_y-20*upscale, cx+34*upscale, base_y+28*upscale], 180, 360, outline="black", width=2*upscale)
-            td.chord([cx-30*upscale, base_y-16*upscale, cx+30*upscale, base_y+20*upscale], 180, 360, outline="black", width=2*upscale)
-            td.rectangle([cx-w//2, base_y-2*upscale, cx+w//2, base_y+3*upscale], outline="black", fill="#989898", width=2*upscale)
-            td.rectangle([cx-10*upscale, base_y-10*upscale, cx+10*upscale, base_y], outline="black", width=2*upscale)
+            td.chord([cx-px(34) * upscale, base_y-px(20) * upscale, cx+px(34) * upscale, base_y+px(28) * upscale], 180, 360, outline="black", width=self._lw(2) * upscale)
+            td.chord([cx-px(30) * upscale, base_y-px(16) * upscale, cx+px(30) * upscale, base_y+px(20) * upscale], 180, 360, outline="black", width=self._lw(2) * upscale)
+            td.rectangle([cx-w//2, base_y-px(2) * upscale, cx+w//2, base_y+px(3) * upscale], outline="black", fill="#989898", width=self._lw(2) * upscale)
+            td.rectangle([cx-px(10) * upscale, base_y-px(10) * upscale, cx+px(10) * upscale, base_y], outline="black", width=self._lw(2) * upscale)
         elif p_type == "ip68":
-            td.rectangle([cx-34*upscale, base_y-18*upscale, cx+34*upscale, base_y+6*upscale], outline="black", width=2*upscale)
-            td.rectangle([cx-w//2, base_y-14*upscale, cx+w//2, base_y+3*upscale], outline="black", width=2*upscale)
-            td.rectangle([cx-w//2, base_y-2*upscale, cx+w//2, base_y+3*upscale], outline="black", fill="#989898", width=2*upscale)
-            td.rectangle([cx-10*upscale, base_y-10*upscale, cx+10*upscale, base_y], outline="black", width=2*upscale)
+            td.rectangle([cx-px(34) * upscale, base_y-px(18) * upscale, cx+px(34) * upscale, base_y+px(6) * upscale], outline="black", width=self._lw(2) * upscale)
+            td.rectangle([cx-w//2, base_y-px(14) * upscale, cx+w//2, base_y+px(3) * upscale], outline="black", width=self._lw(2) * upscale)
+            td.rectangle([cx-w//2, base_y-px(2) * upscale, cx+w//2, base_y+px(3) * upscale], outline="black", fill="#989898", width=self._lw(2) * upscale)
+            td.rectangle([cx-px(10) * upscale, base_y-px(10) * upscale, cx+px(10) * upscale, base_y], outline="black", width=self._lw(2) * upscale)
 
-        timg = timg.resize((self.size, self.size), Image.Resampling.LANCZOS)
-        draw._image.paste(timg, (int(x), int(y)), timg)
+        return timg.resize((self.size, self.size), Image.Resampling.LANCZOS)
 
     def _draw_large_scheme(self, canvas, data):
         """Отрисовка схемы ленты"""
-        import re
-        from PIL import Image, ImageDraw
-
+        area_w, area_h = self._ipx(450), self._ipx(300)
+        p_type = self._scheme_profile_type(data)
+        _, _, _, top_y, bottom_y, line_x = self._scheme_geometry(p_type)
+
+        # Геометрия зависит только от p_type - кэшируется, меняются лишь подписи
+        smooth_scheme = self._sprite("scheme", p_type)
+        paste_x = self.width - area_w - self._ipx(10)
+        paste_y = self._ipx(280)
+        canvas.paste(smooth_scheme, (paste_x, paste_y), smooth_scheme)
+        
         s = 4
-        area_w, area_h = 450, 300
-        upscale = 2.8 * s
-        temp_img = Image.new("RGBA", (area_w * s, area_h * s), (255, 255, 255, 0))
-        td = ImageDraw.Draw(temp_img)
+        draw = ImageDraw.Draw(canvas)
+        w_val = data.get("width", "10")
+        h_val = data.get("height_val", data.get("height", "2,1"))
         
-        cx = (area_w * s) // 2 - (20 * s)
-        base_y = (area_h * s) // 2 + (85 * s)
+        w_txt = f"{w_val} mm"
+        w_bbox = fonts.text_bbox(w_txt, self.f_val)
+        w_width = w_bbox[2] - w_bbox[0]
+        draw.text((paste_x + (area_w - self._ipx(40))//2 - w_width//2, paste_y + area_h - self._px(55)), w_txt, fill="black", font=self.f_val)
         
+        h_txt = str(h_val).replace('.', ',')
+        h_bbox = fonts.text_bbox(h_txt, self.f_val)
+        h_height = h_bbox[3] + h_bbox[1]
+        line_top_final = paste_y + (top_y / s)
+        line_bottom_final = paste_y + (bottom_y / s)
+        line_center_y = (line_top_final + line_bottom_final) / 2
+        text_y = line_center_y - h_height / 2
+        text_x = paste_x + (line_x / s) + self._px(10)
+        draw.text((text_x, text_y), h_txt, fill="black", font=self.f_val)
+
+    def _scheme_profile_type(self, data):
         ip_str = str(data.get("ip", "20")).upper()
         chip_type = str(data.get("chip", "")).upper()
         color_type = str(data.get("color", "")).upper()
-        model_val = str(data.get("model", "")).upper().strip()
-        if not model_val:
-            m_search = re.search(r'(\d{2}B)', str(data))
-            model_val = m_search.group(1) if m_search else ""
+        model_val = profile_model(data)
         
         target_models = ["79B", "80B", "81B", "82B", "83B", "84B"]
         p_type = "ip20"
@@ -591,10 +749,36 @@ class LedImageGenerator:
         elif "67" in ip_str: p_type = "ip67"
         elif "68" in ip_str: p_type = "ip68"
         elif "20" in ip_str: p_type = "ip20_cob" if "COB" in chip_type else "ip20"
+        return p_type
 
-        line_w = int(2.5 * s)
+    def _scheme_geometry(self, p_type):
+        """Координаты схемы в 4x буфере: cx, base_y, w_rect, top_y, bottom_y, line_x"""
+        s = 4
+        area_w, area_h = self._ipx(450), self._ipx(300)
+        upscale = self._px(2.8) * s
+        cx = (area_w * s) // 2 - (self._px(20) * s)
+        base_y = (area_h * s) // 2 + (self._px(85) * s)
         w_rect = int(29 * upscale)
+
+        if p_type == "ip68": top_y = base_y - 18 * upscale
+        elif p_type in ["ip67", "ip54_vlhke"]: top_y = base_y - 22 * upscale
+        else: top_y = base_y - 10 * upscale
         
+        bottom_y = base_y + 3 * upscale
+        line_x = cx + w_rect + self._px(25) * s
+        return cx, base_y, w_rect, top_y, bottom_y, line_x
+
+    def _render_scheme(self, p_type):
+        """Разрез ленты с размерными линиями, рисуется в 4x и сглаживается до 450x300"""
+        s = 4
+        px = self._px
+        area_w, area_h = self._ipx(450), self._ipx(300)
+        upscale = px(2.8) * s
+        temp_img = Image.new("RGBA", (area_w * s, area_h * s), (255, 255, 255, 0))
+        td = ImageDraw.Draw(temp_img)
+        cx, base_y, w_rect, top_y, bottom_y, line_x = self._scheme_geometry(p_type)
+
+        line_w = max(1, int(px(2.5) * s))
         if p_type in ["ip20", "ip54", "ip67_digital"]:
             td.rectangle([cx-w_rect, base_y-2*upscale, cx+w_rect, base_y+3*upscale], outline="black", width=line_w)
             td.rectangle([cx-10*upscale, base_y-8*upscale, cx+10*upscale, base_y-1*upscale], outline="black", fill="#FFF9C7", width=line_w)
@@ -607,55 +791,27 @@ class LedImageGenerator:
             td.rectangle([cx-w_rect, base_y-2*upscale, cx+w_rect, base_y+1*upscale], outline="black", width=line_w)
             td.rectangle([cx-10*upscale, base_y-10*upscale, cx+10*upscale, base_y-1*upscale], outline="black", fill="#FFF9C7", width=line_w)
         elif p_type == "ip68":
-            td.rectangle([cx-w_rect-39, base_y-18*upscale, cx+w_rect+39, base_y+3*upscale], outline="black", width=line_w)
+            td.rectangle([cx-w_rect-px(39), base_y-18*upscale, cx+w_rect+px(39), base_y+3*upscale], outline="black", width=line_w)
             td.rectangle([cx-w_rect, base_y-15*upscale, cx+w_rect, base_y], outline="black", width=line_w)
-            td.rectangle([cx-w_rect+14, base_y-3*upscale, cx+w_rect-14, base_y], outline="black", width=line_w)
+            td.rectangle([cx-w_rect+px(14), base_y-3*upscale, cx+w_rect-px(14), base_y], outline="black", width=line_w)
             td.rectangle([cx-10*upscale, base_y-10*upscale, cx+10*upscale, base_y-2*upscale], outline="black", fill="#FFF9C7", width=line_w)
 
-        draw_line_w = max(1, s // 2)
-        width_y = base_y + 45 * s
+        draw_line_w = self._lw(s // 2)
+        width_y = base_y + px(45) * s
         x_left, x_right = cx - w_rect, cx + w_rect
-        td.line([x_left, base_y + 10*s, x_left, width_y + 10*s], fill="black", width=draw_line_w)
-        td.line([x_right, base_y + 10*s, x_right, width_y + 10*s], fill="black", width=draw_line_w)
+        td.line([x_left, base_y + px(10)*s, x_left, width_y + px(10)*s], fill="black", width=draw_line_w)
+        td.line([x_right, base_y + px(10)*s, x_right, width_y + px(10)*s], fill="black", width=draw_line_w)
         td.line([x_left, width_y, x_right, width_y], fill="black", width=draw_line_w)
-        td.polygon([(x_left, width_y), (x_left + 6*s, width_y - 3*s), (x_left + 6*s, width_y + 3*s)], fill="black")
-        td.polygon([(x_right, width_y), (x_right - 6*s, width_y - 3*s), (x_right - 6*s, width_y + 3*s)], fill="black")
+        td.polygon([(x_left, width_y), (x_left + px(6)*s, width_y - px(3)*s), (x_left + px(6)*s, width_y + px(3)*s)], fill="black")
+        td.polygon([(x_right, width_y), (x_right - px(6)*s, width_y - px(3)*s), (x_right - px(6)*s, width_y + px(3)*s)], fill="black")
 
-        if p_type == "ip68": top_y = base_y - 18 * upscale
-        elif p_type in ["ip67", "ip54_vlhke"]: top_y = base_y - 22 * upscale
-        else: top_y = base_y - 10 * upscale
-        
-        bottom_y = base_y + 3 * upscale
-        line_x = cx + w_rect + 25 * s
-        td.line([line_x - 10*s, top_y, line_x + 5*s, top_y], fill="black", width=draw_line_w)
-        td.line([line_x - 10*s, bottom_y, line_x + 5*s, bottom_y], fill="black", width=draw_line_w)
+        td.line([line_x - px(10)*s, top_y, line_x + px(5)*s, top_y], fill="black", width=draw_line_w)
+        td.line([line_x - px(10)*s, bottom_y, line_x + px(5)*s, bottom_y], fill="black", width=draw_line_w)
         td.line([line_x, top_y, line_x, bottom_y], fill="black", width=draw_line_w)
-        td.polygon([(line_x, top_y), (line_x - 3*s, top_y + 6*s), (line_x + 3*s, top_y + 6*s)], fill="black")
-        td.polygon([(line_x, bottom_y), (line_x - 3*s, bottom_y - 6*s), (line_x + 3*s, bottom_y - 6*s)], fill="black")
+        td.polygon([(line_x, top_y), (line_x - px(3)*s, top_y + px(6)*s), (line_x + px(3)*s, top_y + px(6)*s)], fill="black")
+        td.polygon([(line_x, bottom_y), (line_x - px(3)*s, bottom_y - px(6)*s), (line_x + px(3)*s, bottom_y - px(6)*s)], fill="black")
 
-        smooth_scheme = temp_img.resize((area_w, area_h), resample=Image.LANCZOS)
-        paste_x = self.width - area_w - 10
-        paste_y = 280
-        canvas.paste(smooth_scheme, (paste_x, paste_y), smooth_scheme)
-        
-        draw = ImageDraw.Draw(canvas)
-        w_val = data.get("width", "10")
-        h_val = data.get("height_val", data.get("height", "2,1"))
-        
-        w_txt = f"{w_val} mm"
-        w_bbox = draw.textbbox((0, 0), w_txt, font=self.f_val)
-        w_width = w_bbox[2] - w_bbox[0]
-        draw.text((paste_x + (area_w - 40)//2 - w_width//2, paste_y + area_h - 55), w_txt, fill="black", font=self.f_val)
-        
-        h_txt = str(h_val).replace('.', ',')
-        h_bbox = draw.textbbox((0, 0), h_txt, font=self.f_val)
-        h_height = h_bbox[3] + h_bbox[1]
-        line_top_final = paste_y + (top_y / s)
-        line_bottom_final = paste_y + (bottom_y / s)
-        line_center_y = (line_top_final + line_bottom_final) / 2
-        text_y = line_center_y - h_height / 2
-        text_x = paste_x + (line_x / s) + 10 
-        draw.text((text_x, text_y), h_txt, fill="black", font=self.f_val)
+        return temp_img.resize((area_w, area_h), resample=Image.LANCZOS)
 
     def _draw_rgb(self, canvas, main_draw, x, y):
         temp_sq = Image.new('RGBA', (self.size, self.size), (0,0,0,0))
@@ -665,10 +821,11 @@ class LedImageGenerator:
         t_draw.rectangle([w_third, 0, 2*w_third, self.size], fill=config.RGB_COLORS["G"])
         t_draw.rectangle([2*w_third, 0, self.size, self.size], fill=config.RGB_COLORS["B"])
         self._apply_rounded_mask(canvas, temp_sq, x, y)
-        main_draw.text((x + 2, y + 35), "R", fill="white", font=self.f_rgb_big)
-        main_draw.text((x + w_third + 2, y + 35), "G", fill="white", font=self.f_rgb_big)
-        main_draw.text((x + 2*w_third + 2, y + 35), "B", fill="white", font=self.f_rgb_big)
-        main_draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, outline="#CCCCCC", width=1)
+        dx, dy = self._px(2), self._px(35)
+        fonts.draw_label(main_draw, (x + dx, y + dy), "R", "white", self.f_rgb_big)
+        fonts.draw_label(main_draw, (x + w_third + dx, y + dy), "G", "white", self.f_rgb_big)
+        fonts.draw_label(main_draw, (x + 2*w_third + dx, y + dy), "B", "white", self.f_rgb_big)
+        main_draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, outline="#CCCCCC", width=self._lw(1))
 
     def _draw_rgbw(self, canvas, main_draw, x, y, val):
         temp_sq = Image.new('RGBA', (self.size, self.size), (0,0,0,0))
@@ -681,12 +838,13 @@ class LedImageGenerator:
         bottom_bg = config.RAW_COLORS.get(sub_part, "white")
         t_draw.rectangle([0, h_half, self.size, self.size], fill=bottom_bg)
         self._apply_rounded_mask(canvas, temp_sq, x, y)
-        main_draw.text((x + 6, y + 5), "R", fill="white", font=self.f_rgb_small)
-        main_draw.text((x + w_third + 6, y + 5), "G", fill="white", font=self.f_rgb_small)
-        main_draw.text((x + 2*w_third + 6, y + 5), "B", fill="white", font=self.f_rgb_small)
-        tw = main_draw.textbbox((0,0), sub_part, font=self.f_rgb_big)[2]
-        main_draw.text((x + (self.size-tw)/2, y + h_half + 5), sub_part, fill="black", font=self.f_rgb_big)
-        main_draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, outline="#CCCCCC", width=1)
+        dx, dy = self._px(6), self._px(5)
+        fonts.draw_label(main_draw, (x + dx, y + dy), "R", "white", self.f_rgb_small)
+        fonts.draw_label(main_draw, (x + w_third + dx, y + dy), "G", "white", self.f_rgb_small)
+        fonts.draw_label(main_draw, (x + 2*w_third + dx, y + dy), "B", "white", self.f_rgb_small)
+        tw = fonts.text_bbox(sub_part, self.f_rgb_big)[2]
+        main_draw.text((x + (self.size-tw)/2, y + h_half + dy), sub_part, fill="black", font=self.f_rgb_big)
+        main_draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, outline="#CCCCCC", width=self._lw(1))
 
     def _draw_dual_white(self, canvas, main_draw, x, y, val):
         temp_sq = Image.new('RGBA', (self.size, self.size), (0,0,0,0))
@@ -699,57 +857,61 @@ class LedImageGenerator:
         t_draw.rectangle([0, 0, self.size, h_half], fill=bg_top)
         t_draw.rectangle([0, h_half, self.size, self.size], fill=bg_bot)
         self._apply_rounded_mask(canvas, temp_sq, x, y)
-        w1 = main_draw.textbbox((0,0), top_c, font=self.f_dual_top)[2]
-        main_draw.text((x + (self.size-w1)/2, y + 10), top_c, fill="black", font=self.f_dual_top)
-        w2 = main_draw.textbbox((0,0), bot_c, font=self.f_dual_bot)[2]
-        main_draw.text((x + (self.size-w2)/2, y + h_half + 10), bot_c, fill="black", font=self.f_dual_bot)
-        main_draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, outline="#CCCCCC", width=1)
+        w1 = fonts.text_bbox(top_c, self.f_dual_top)[2]
+        main_draw.text((x + (self.size-w1)/2, y + self._px(10)), top_c, fill="black", font=self.f_dual_top)
+        w2 = fonts.text_bbox(bot_c, self.f_dual_bot)[2]
+        main_draw.text((x + (self.size-w2)/2, y + h_half + self._px(10)), bot_c, fill="black", font=self.f_dual_bot)
+        main_draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, outline="#CCCCCC", width=self._lw(1))
 
     def _draw_life(self, canvas, main_draw, x, y, val, bg_color, data):
         draw_outline = "#6E6E6E" if bg_color.upper() != "#EEEEEE" else None
         main_draw.rounded_rectangle([x, y, x + self.size, y + self.size], radius=self.radius, fill=bg_color) #, outline=draw_outline, width=1)
         
-        oversample = 4
-        temp_size = self.size * oversample
-        temp_img = Image.new('RGBA', (temp_size, temp_size), (0, 0, 0, 0))
-        temp_draw = ImageDraw.Draw(temp_img)
-        
-        circle_margin = 5 * oversample
-        temp_draw.ellipse([circle_margin, circle_margin, temp_size - circle_margin, temp_size - circle_margin], 
-                          outline="black", width=2 * oversample)
-        
-        l_x = 65 * oversample
-        l_y_top = 60 * oversample
-        l_y_bot = 105 * oversample
-        temp_draw.line([l_x, l_y_top, l_x + 40 * oversample, l_y_top], fill="black", width=2 * oversample)
-        temp_draw.line([l_x, l_y_top, l_x, l_y_bot], fill="black", width=2 * oversample)
-        
-        temp_img = temp_img.resize((self.size, self.size), Image.Resampling.LANCZOS)
-        canvas.paste(temp_img, (int(x), int(y)), temp_img)
+        sprite = self._sprite("life")
+        canvas.paste(sprite, (int(x), int(y)), sprite)
 
         full_val = val.replace(" ", "")
         main_part = full_val[:-3] if len(full_val) > 3 else full_val
         small_part = full_val[-3:] if len(full_val) > 3 else ""
         
-        w_main = main_draw.textbbox((0, 0), main_part, font=self.f_val)[2]
-        main_draw.text((x + 25, y + 18), main_part, fill="black", font=self.f_val)
+        px = self._px
+        w_main = fonts.text_bbox(main_part, self.f_val)[2]
+        main_draw.text((x + px(25), y + px(18)), main_part, fill="black", font=self.f_val)
         
         if small_part: 
-            main_draw.text((x + 25 + w_main + 2, y + 24), small_part, fill="black", font=self.f_mid)
+            main_draw.text((x + px(25) + w_main + px(2), y + px(24)), small_part, fill="black", font=self.f_mid)
         
-        try: f_h = ImageFont.truetype(config.FONT_REGULAR, 45)
-        except: f_h = ImageFont.load_default()
-        
-        main_draw.text((x + 35, y + 53), "h", fill="black", font=f_h)
+        fonts.draw_label(main_draw, (x + px(35), y + px(53)), "h", "black", self.f_h)
 
         l_num = data.get("life_l", "70")
         b_num = data.get("life_b", "50")
         l_text = f"L{l_num}"
         b_text = f"B{b_num}"
-        main_draw.text((x + 70, y + 63), l_text, fill="black", font=self.f_sub)
-        main_draw.text((x + 70, y + 80), b_text, fill="black", font=self.f_sub)
+        main_draw.text((x + px(70), y + px(63)), l_text, fill="black", font=self.f_sub)
+        main_draw.text((x + px(70), y + px(80)), b_text, fill="black", font=self.f_sub)
+
+    def _render_life(self, variant):
+        """Циферблат часов для плитки срока службы"""
+        oversample = 4
+        px = self._px
+        temp_size = self.size * oversample
+        temp_img = Image.new('RGBA', (temp_size, temp_size), (0, 0, 0, 0))
+        temp_draw = ImageDraw.Draw(temp_img)
+        
+        circle_margin = px(5) * oversample
+        temp_draw.ellipse([circle_margin, circle_margin, temp_size - circle_margin, temp_size - circle_margin], 
+                          outline="black", width=self._lw(2) * oversample)
+        
+        l_x = px(65) * oversample
+        l_y_top = px(60) * oversample
+        l_y_bot = px(105) * oversample
+        temp_draw.line([l_x, l_y_top, l_x + px(40) * oversample, l_y_top], fill="black", width=self._lw(2) * oversample)
+        temp_draw.line([l_x, l_y_top, l_x, l_y_bot], fill="black", width=self._lw(2) * oversample)
+        
+        return temp_img.resize((self.size, self.size), Image.Resampling.LANCZOS)
 
     def _draw_field_content(self, draw, field, val, x, y, txt_color, full_data, v_text):
+        px = self._px
         if field == "color":
             kelvin = full_data.get("kelvin", "").strip()
             special_colors = ["R", "G", "B", "Y", "UV", "UVA", "V", "A"]
@@ -757,180 +919,151 @@ class LedImageGenerator:
             
             if val in special_colors and not kelvin:
                 font = self.f_rgb_big
-                bbox = draw.textbbox((0, 0), val, font=font)
+                bbox = fonts.text_bbox(val, font)
                 w_c = bbox[2] - bbox[0]
                 h_c = bbox[3] - bbox[1]
-                draw.text((x + (self.size - w_c) / 2, y + (self.size - h_c) / 2 - 5), 
+                draw.text((x + (self.size - w_c) / 2, y + (self.size - h_c) / 2 - px(5)), 
                           val, fill="white", font=font)
             elif val in white_variants and not kelvin:
                 font = self.f_rgb_big
-                bbox = draw.textbbox((0, 0), val, font=font)
+                bbox = fonts.text_bbox(val, font)
                 w_c = bbox[2] - bbox[0]
                 h_c = bbox[3] - bbox[1]
-                draw.text((x + (self.size - w_c) / 2, y + (self.size - h_c) / 2 - 5), 
+                draw.text((x + (self.size - w_c) / 2, y + (self.size - h_c) / 2 - px(5)), 
                           val, fill="black", font=font)
             else:
                 font_top = self.f_val
-                bbox_t = draw.textbbox((0, 0), val, font=font_top)
+                bbox_t = fonts.text_bbox(val, font_top)
                 w_t = bbox_t[2] - bbox_t[0]
-                draw.text((x + (self.size - w_t) / 2, y + 15), val, fill="black", font=font_top)
+                draw.text((x + (self.size - w_t) / 2, y + px(15)), val, fill="black", font=font_top)
                 
                 if kelvin and "-" in kelvin:
                     k1, k2 = kelvin.split("-")
                     txt1 = f"{k1} -"
-                    w1 = draw.textbbox((0,0), txt1, font=self.f_mid)[2]
-                    draw.text((x + (self.size - w1) / 2, y + 50), txt1, fill="black", font=self.f_mid)
+                    w1 = fonts.text_bbox(txt1, self.f_mid)[2]
+                    draw.text((x + (self.size - w1) / 2, y + px(50)), txt1, fill="black", font=self.f_mid)
                     txt2 = f"{k2}K"
-                    w2 = draw.textbbox((0,0), txt2, font=self.f_mid)[2]
-                    draw.text((x + (self.size - w2) - 50 / 2, y + 75), txt2, fill="black", font=self.f_mid)
+                    w2 = fonts.text_bbox(txt2, self.f_mid)[2]
+                    draw.text((x + (self.size - w2) - px(50) / 2, y + px(75)), txt2, fill="black", font=self.f_mid)
                 elif kelvin:
-                    w_k = draw.textbbox((0,0), kelvin, font=self.f_mid)[2]
-                    draw.text((x + (self.size - w_k) / 2, y + 60), kelvin, fill="black", font=self.f_mid)
+                    w_k = fonts.text_bbox(kelvin, self.f_mid)[2]
+                    draw.text((x + (self.size - w_k) / 2, y + px(60)), kelvin, fill="black", font=self.f_mid)
         elif field == "chip":
             val_up = val.upper().strip()
             if val_up == "COB":
-                draw.text((x + 27, y + 40), "COB", fill=txt_color, font=self.f_val)
+                fonts.draw_label(draw, (x + px(27), y + px(40)), "COB", txt_color, self.f_val)
             else:
                 s_part = "SMD" if "SMD" in val_up else val_up
                 n_part = val.upper().replace("SMD", "").strip()
-                draw.text((x + 27, y + 20), s_part, fill=txt_color, font=self.f_val)
+                draw.text((x + px(27), y + px(20)), s_part, fill=txt_color, font=self.f_val)
                 if n_part:
-                    draw.text((x + 27, y + 60), n_part, fill=txt_color, font=self.f_val)
+                    draw.text((x + px(27), y + px(60)), n_part, fill=txt_color, font=self.f_val)
         elif field == "voltage":
             num_v = re.sub(r'\D', '', val) 
-            draw.text((x + 33, y + 20), f"{num_v}V", fill=txt_color, font=self.f_rgb_small)
-            draw.text((x + 38, y + 65), "DC", fill=txt_color, font=self.f_rgb_small)
+            draw.text((x + px(33), y + px(20)), f"{num_v}V", fill=txt_color, font=self.f_rgb_small)
+            fonts.draw_label(draw, (x + px(38), y + px(65)), "DC", txt_color, self.f_rgb_small)
         elif field == "ip":
             icon_loaded = False
             try:
-                icon_path = self._find_image_path(f"IP_{val}")
-                
-                if icon_path:
-                    with Image.open(icon_path) as icon:
-                        target_size = (self.size, self.size)
-                        icon = icon.resize(target_size, Image.Resampling.LANCZOS)
-                        paste_x = int(x)
-                        paste_y = int(y)
-                        if icon.mode == 'RGBA':
-                            draw._image.paste(icon, (paste_x, paste_y), icon)
-                        else:
-                            draw._image.paste(icon, (paste_x, paste_y))
-                        icon_loaded = True
+                icon_loaded = self._paste_icon(draw._image, f"IP_{val}", x, y)
             except Exception as e:
                 print(f"Error loading IP icon: {e}")
 
             if not icon_loaded:
-                draw.text((x + 45, y + 20), "IP", fill=txt_color, font=self.f_val)
-                draw.text((x + 40, y + 65), val, fill=txt_color, font=self.f_val)
+                fonts.draw_label(draw, (x + px(45), y + px(20)), "IP", txt_color, self.f_val)
+                draw.text((x + px(40), y + px(65)), val, fill=txt_color, font=self.f_val)
 
         elif field in ["max_single", "max_double"]:
             # 1. Загрузка иконки (max-single.png или max-double.png)
             icon_name = field.replace("_", "-") 
-            icon_path = self._find_image_path(icon_name)
-            
-            if icon_path:
-                try:
-                    with Image.open(icon_path) as icon:
-                        # Растягиваем на весь квадрат (124x124)
-                        icon = icon.resize((self.size, self.size), Image.Resampling.LANCZOS)
-                        
-                        # Вставляем на координаты x, y
-                        if icon.mode == 'RGBA':
-                            draw._image.paste(icon, (int(x), int(y)), icon)
-                        else:
-                            draw._image.paste(icon, (int(x), int(y)))
-                except Exception as e:
-                    print(f"Error loading {icon_name}: {e}")
+            try:
+                # Растягиваем на весь квадрат (124x124), ресайз берётся из кэша
+                self._paste_icon(draw._image, icon_name, x, y)
+            except Exception as e:
+                print(f"Error loading {icon_name}: {e}")
 
             # 2. Отрисовка текста "≤ {val} m" поверх иконки
             # Вычисляем ширину всех частей текста для центрирования
-            w_le = draw.textbbox((0,0), "≤", font=self.f_mid)[2]
-            w_val = draw.textbbox((0,0), val, font=self.f_val)[2]
-            w_m = draw.textbbox((0,0), " m", font=self.f_mid)[2]
+            w_le = fonts.text_bbox("≤", self.f_mid)[2]
+            w_val = fonts.text_bbox(val, self.f_val)[2]
+            w_m = fonts.text_bbox(" m", self.f_mid)[2]
             
             total_w = w_le + w_val + w_m
             
             # Координаты начала текста (по центру горизонтали)
             start_text_x = x + (self.size - total_w) / 2
-            text_y = y + 15 # Отступ сверху
+            text_y = y + px(15) # Отступ сверху
             
             # Рисуем части текста
             # Символ "≤"
-            draw.text((start_text_x, text_y + 4), "≤", fill="black", font=self.f_mid)
+            fonts.draw_label(draw, (start_text_x, text_y + px(4)), "≤", "black", self.f_mid)
             # Значение
-            draw.text((start_text_x + w_le + 3, text_y), val, fill="black", font=self.f_val)
+            draw.text((start_text_x + w_le + px(3), text_y), val, fill="black", font=self.f_val)
             # Символ "m"
-            draw.text((start_text_x + w_le + w_val, text_y + 4), " m", fill="black", font=self.f_mid)
+            fonts.draw_label(draw, (start_text_x + w_le + w_val, text_y + px(4)), " m", "black", self.f_mid)
 
             # 3. Отрисовка текста напряжения (V DC) внизу
             # v_text obsahuje строку, např. "24 V DC"
-            w_volt = draw.textbbox((0,0), v_text, font=self.f_sub)[2]
+            w_volt = fonts.text_bbox(v_text, self.f_sub)[2]
             start_volt_x = x + (self.size - w_volt) / 2
-            volt_y = y + 88 # Отступ для нижней части
+            volt_y = y + px(88) # Отступ для нижней части
             
-            draw.text((start_volt_x, volt_y), v_text, fill="black", font=self.f_sub)
+            fonts.draw_label(draw, (start_volt_x, volt_y), v_text, "black", self.f_sub)
 
         elif field == "cut":
-            led_val = str(full_data.get("led_segment", "")).strip()
-            if not led_val or led_val == "0":
-                all_text = " ".join(str(v) for v in full_data.values())
-                match = re.search(r'(\d+)\s*LED', all_text, re.IGNORECASE)
-                if match:
-                    led_val = match.group(1)
-            led_val = "".join(filter(str.isdigit, led_val)) if led_val else "0"
-            w_l = draw.textbbox((0,0), led_val, font=self.f_cut_num)[2]
-            draw.text((x + 35 - w_l/2, y + 15), led_val, fill="black", font=self.f_cut_num)
-            draw.text((x + 40 + w_l/2, y + 15), "LED", fill="black", font=self.f_mid)
-            line_y = y + 55
-            draw.line([x + 15, line_y, x + self.size - 15, line_y], fill="black", width=2)
-            draw.line([x + 15, line_y - 5, x + 15, line_y + 5], fill="black", width=2)
-            draw.line([x + self.size - 15, line_y - 5, x + self.size - 15, line_y + 5], fill="black", width=2)
-            w_m = draw.textbbox((0,0), val, font=self.f_cut_num)[2]
-            draw.text((x + (self.size - w_m)/2, y + 65), val, fill="black", font=self.f_cut_num)
-            w_mm = draw.textbbox((0,0), "mm", font=self.f_mid)[2]
-            draw.text((x + (self.size - w_mm)/2, y + 90), "mm", fill="black", font=self.f_mid)
+            led_val = segment_leds(full_data)
+            w_l = fonts.text_bbox(led_val, self.f_cut_num)[2]
+            draw.text((x + px(35) - w_l/2, y + px(15)), led_val, fill="black", font=self.f_cut_num)
+            fonts.draw_label(draw, (x + px(40) + w_l/2, y + px(15)), "LED", "black", self.f_mid)
+            line_y = y + px(55)
+            draw.line([x + px(15), line_y, x + self.size - px(15), line_y], fill="black", width=self._lw(2))
+            draw.line([x + px(15), line_y - px(5), x + px(15), line_y + px(5)], fill="black", width=self._lw(2))
+            draw.line([x + self.size - px(15), line_y - px(5), x + self.size - px(15), line_y + px(5)], fill="black", width=self._lw(2))
+            w_m = fonts.text_bbox(val, self.f_cut_num)[2]
+            draw.text((x + (self.size - w_m)/2, y + px(65)), val, fill="black", font=self.f_cut_num)
+            w_mm = fonts.text_bbox("mm", self.f_mid)[2]
+            fonts.draw_label(draw, (x + (self.size - w_mm)/2, y + px(90)), "mm", "black", self.f_mid)
         elif field == "width":
-            ip_val = str(full_data.get("ip", "")).strip()
-            chip_val = str(full_data.get("chip", "")).upper()
-            color_val = str(full_data.get("color", "")).upper()
-            model_val = str(full_data.get("model", "")).upper().strip()
-            if not model_val:
-                all_data_str = str(full_data)
-                m_search = re.search(r'(\d{2}B)', all_data_str)
-                if m_search:
-                    model_val = m_search.group(1)
-            target_models = ["79B", "80B", "81B", "82B", "83B", "84B"]
-            icon_to_draw = "ip20"
-            if "DIGITAL SPI" in color_val:
-                icon_to_draw = "ip67_digital"
-            elif ip_val == "54" and model_val in target_models:
-                icon_to_draw = "ip54_vlhke"
-            elif ip_val == "54":
-                icon_to_draw = "ip54"
-            elif ip_val == "67":
-                icon_to_draw = "ip67"
-            elif ip_val == "68":
-                icon_to_draw = "ip68"
-            elif ip_val == "20":
-                icon_to_draw = "ip20_cob" if "COB" in chip_val else "ip20"
-            self._draw_width_profile(draw, x, y, icon_to_draw)
-            line_y = y + 20
-            draw.line([x + 26, line_y - 7, x + 26, line_y + 7], fill="black", width=1)
-            draw.line([x + self.size - 26, line_y - 7, x + self.size - 26, line_y + 7], fill="black", width=1)
-            arrow_y = 20
-            draw.line([x + 26, y + arrow_y, x + self.size - 26, y + arrow_y], fill="black", width=1)
-            draw.line([x + 26, y + arrow_y, x + 32, y + arrow_y - 3], fill="black", width=1)
-            draw.line([x + 26, y + arrow_y, x + 32, y + arrow_y + 3], fill="black", width=1)
-            draw.line([x + self.size - 26, y + arrow_y, x + self.size - 32, y + arrow_y - 3], fill="black", width=1)
-            draw.line([x + self.size - 26, y + arrow_y, x + self.size - 32, y + arrow_y + 3], fill="black", width=1)
-            w_v = draw.textbbox((0,0), val, font=self.f_val)[2]
-            draw.text((x + (self.size - w_v) / 2, y + 58), val, fill="black", font=self.f_val)
-            w_m = draw.textbbox((0,0), " mm", font=self.f_mid)[2]
-            draw.text((x + (self.size - w_m) / 2, y + 86), " mm", fill="black", font=self.f_mid)
+            self._draw_width_profile(draw, x, y, self._width_profile_type(full_data))
+            lw = self._lw(1)
+            line_y = y + px(20)
+            draw.line([x + px(26), line_y - px(7), x + px(26), line_y + px(7)], fill="black", width=lw)
+            draw.line([x + self.size - px(26), line_y - px(7), x + self.size - px(26), line_y + px(7)], fill="black", width=lw)
+            arrow_y = px(20)
+            draw.line([x + px(26), y + arrow_y, x + self.size - px(26), y + arrow_y], fill="black", width=lw)
+            draw.line([x + px(26), y + arrow_y, x + px(32), y + arrow_y - px(3)], fill="black", width=lw)
+            draw.line([x + px(26), y + arrow_y, x + px(32), y + arrow_y + px(3)], fill="black", width=lw)
+            draw.line([x + self.size - px(26), y + arrow_y, x + self.size - px(32), y + arrow_y - px(3)], fill="black", width=lw)
+            draw.line([x + self.size - px(26), y + arrow_y, x + self.size - px(32), y + arrow_y + px(3)], fill="black", width=lw)
+            w_v = fonts.text_bbox(val, self.f_val)[2]
+            draw.text((x + (self.size - w_v) / 2, y + px(58)), val, fill="black", font=self.f_val)
+            w_m = fonts.text_bbox(" mm", self.f_mid)[2]
+            fonts.draw_label(draw, (x + (self.size - w_m) / 2, y + px(86)), " mm", "black", self.f_mid)
         else:
             sub = config.SUB_TEXTS.get(field, "")
-            w_v = draw.textbbox((0,0), val, font=self.f_val)[2]
-            draw.text((x + (self.size-w_v)/2, y + 20), val, fill=txt_color, font=self.f_val)
+            w_v = fonts.text_bbox(val, self.f_val)[2]
+            draw.text((x + (self.size-w_v)/2, y + px(20)), val, fill=txt_color, font=self.f_val)
             if sub:
-                w_s = draw.textbbox((0,0), sub, font=self.f_mid)[2]
-                draw.text((x + (self.size-w_s)/2, y + 65), sub, fill=txt_color, font=self.f_mid)
+                w_s = fonts.text_bbox(sub, self.f_mid)[2]
+                fonts.draw_label(draw, (x + (self.size-w_s)/2, y + px(65)), sub, txt_color, self.f_mid)
+
+    def _width_profile_type(self, full_data):
+        ip_val = str(full_data.get("ip", "")).strip()
+        chip_val = str(full_data.get("chip", "")).upper()
+        color_val = str(full_data.get("color", "")).upper()
+        model_val = profile_model(full_data)
+        target_models = ["79B", "80B", "81B", "82B", "83B", "84B"]
+        icon_to_draw = "ip20"
+        if "DIGITAL SPI" in color_val:
+            icon_to_draw = "ip67_digital"
+        elif ip_val == "54" and model_val in target_models:
+            icon_to_draw = "ip54_vlhke"
+        elif ip_val == "54":
+            icon_to_draw = "ip54"
+        elif ip_val == "67":
+            icon_to_draw = "ip67"
+        elif ip_val == "68":
+            icon_to_draw = "ip68"
+        elif ip_val == "20":
+            icon_to_draw = "ip20_cob" if "COB" in chip_val else "ip20"
+        return icon_to_draw
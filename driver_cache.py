@@ -0,0 +1,133 @@
+# driver_cache.py
+"""Cesta k chromedriveru vyřešená jednou a uložená na disk.
+
+ChromeDriverManager().install() při každém startu prohlížeče zjišťuje verze
+(a může sahat na síť). Tady se výsledek uloží do config.DRIVER_CACHE_FILE
+spolu s verzí Chrome a použije se znovu, dokud se hlavní verze Chrome
+nezmění. V offline režimu (config.DRIVER_OFFLINE) se manager nevolá nikdy.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+import config
+
+_VERSION = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+_resolved = None
+_lock = threading.Lock()
+
+# Kde hledat Chrome na Linuxu/macOS (Windows: registry)
+CHROME_COMMANDS = [
+    ["google-chrome", "--version"],
+    ["google-chrome-stable", "--version"],
+    ["chromium", "--version"],
+    ["chromium-browser", "--version"],
+    ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"],
+]
+
+
+def _run_version(cmd):
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION.search(out)
+    return match.group(0) if match else None
+
+
+def chrome_version():
+    """Verze nainstalovaného Chrome ("120.0.6099.109"), nebo None, když nejde zjistit."""
+    if sys.platform == "win32":
+        try:
+            import winreg
+            for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                        return winreg.QueryValueEx(key, "version")[0]
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+        return None
+    for cmd in CHROME_COMMANDS:
+        version = _run_version(cmd)
+        if version:
+            return version
+    return None
+
+
+def major(version):
+    return version.split(".")[0] if version else None
+
+
+def load(cache_file=None):
+    try:
+        with open(cache_file or config.DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and entry.get("path") else None
+
+
+def store(path, browser_version, cache_file=None):
+    cache_file = cache_file or config.DRIVER_CACHE_FILE
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    entry = {
+        "path": path,
+        "browser_version": browser_version,
+        "driver_version": _run_version([path, "--version"]),
+        "resolved_at": time.time(),
+    }
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f, indent=2)
+    os.replace(tmp, cache_file)
+    return entry
+
+
+def resolve(offline=None, cache_file=None):
+    """Cesta k chromedriveru: config.CHROMEDRIVER_PATH, platná cache, nebo ChromeDriverManager.
+
+    V jednom procesu se výsledek pamatuje, další prohlížeče už nic neověřují.
+    """
+    global _resolved
+    offline = config.DRIVER_OFFLINE if offline is None else offline
+    if config.CHROMEDRIVER_PATH:
+        return config.CHROMEDRIVER_PATH
+
+    with _lock:
+        if _resolved and os.path.exists(_resolved):
+            return _resolved
+
+        cached = load(cache_file)
+        cached_ok = cached is not None and os.path.exists(cached["path"])
+        browser = chrome_version()
+        if cached_ok and (browser is None or major(browser) == major(cached.get("browser_version"))):
+            _resolved = cached["path"]
+            return _resolved
+
+        if offline:
+            if cached_ok:
+                print(f"WARNING: Offline - chromedriver {cached.get('driver_version')} z cache, "
+                      f"Chrome je {browser}")
+                _resolved = cached["path"]
+                return _resolved
+            raise RuntimeError("Offline režim: chromedriver není v cache "
+                               f"({cache_file or config.DRIVER_CACHE_FILE}), nastavte config.CHROMEDRIVER_PATH")
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        store(path, browser, cache_file)
+        _resolved = path
+        return path
+
+
+def forget():
+    """Zapomene cestu vyřešenou v tomto procesu (další resolve znovu čte cache)."""
+    global _resolved
+    with _lock:
+        _resolved = None
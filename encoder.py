@@ -0,0 +1,235 @@
+# encoder.py
+"""Ukládání vykreslených obrázků ve skutečném formátu podle přípony.
+
+    enc = Encoder("webp", "shop")
+    future = enc.submit(img, path)     # kóduje se ve vlákně, PIL při tom uvolňuje GIL
+    future.result()
+    enc.close()
+
+Předvolby (PRESETS) volí kvalitu a úsilí kodéru: "fast" pro náhledy, "shop"
+pro e-shop (výchozí, config.OUTPUT_PRESET), "best" pro archiv. "palette"
+(png / webp) obrázek nejdřív kvantizuje na 256 barev - paleta obsahuje přesně
+barvy z config (plochy dlaždic zůstanou čisté), zbytek místa dostanou barvy
+vyhlazeného textu a fotek patiček - a zapíše indexované PNG nebo bezeztrátový
+WebP. Infografika z plochých barev je tak menší než z JPEG i ztrátového WebP.
+
+Zápis jde přes dočasný soubor ve stejné složce a os.replace - čtenář nikdy
+neuvidí napůl zapsaný obrázek a hard link na soubor (render_cache) se
+nepřepíše na místě.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from PIL import Image, ImageColor, features
+
+import config
+
+# formát -> (PIL formát, přípona souboru)
+FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+    "png": ("PNG", "png"),
+}
+
+# formát -> předvolba -> parametry Image.save ("palette" = počet barev po kvantizaci, Image.save ho nedostane)
+PRESETS = {
+    "webp": {
+        "fast": {"quality": 80, "method": 2},
+        "shop": {"quality": 85, "method": 5},
+        "best": {"quality": 92, "method": 6},
+        # u lossless je quality úsilí kodéru; method 6 je ~50x pomalejší a o pár % menší
+        "palette": {"lossless": True, "quality": 60, "method": 4, "palette": 256},
+    },
+    "jpeg": {
+        "fast": {"quality": 85},
+        "shop": {"quality": 88, "optimize": True, "progressive": True},
+        # 4:4:4 - barevný text v dlaždicích bez rozmazaných okrajů
+        "best": {"quality": 95, "optimize": True, "progressive": True, "subsampling": 0},
+    },
+    "png": {
+        "fast": {"compress_level": 1},
+        "shop": {"compress_level": 6},
+        "best": {"optimize": True},
+        "palette": {"optimize": True, "palette": 256},
+    },
+}
+PRESET_NAMES = sorted({name for presets in PRESETS.values() for name in presets})
+
+# Palety z config, jejichž barvy jsou v kvantizované paletě vždy přesně
+PALETTE_SOURCES = ["COLOR_MAP_LIGHT", "RAW_COLORS", "COLOR_MAP_CHIP", "COLOR_MAP_IP",
+                   "COLOR_MAP_VOLTAGE", "RGB_COLORS"]
+SEED_MARGIN = 8  # adaptivní barva bližší než tohle (na kanál) k barvě z config se nepoužije
+
+
+def save_options(fmt=None, preset=None, quality=None):
+    """(PIL formát, kwargs pro Image.save); quality přebije hodnotu z předvolby."""
+    fmt = fmt or config.OUTPUT_FORMAT
+    preset = preset or config.OUTPUT_PRESET
+    if fmt not in FORMATS:
+        raise ValueError(f"Neznámý formát '{fmt}' (povolené: {', '.join(FORMATS)})")
+    if preset not in PRESETS[fmt]:
+        raise ValueError(f"Neznámá předvolba '{preset}' (povolené: {', '.join(PRESETS[fmt])})")
+    options = dict(PRESETS[fmt][preset])
+    if quality is not None and fmt != "png":
+        options["quality"] = quality
+    return FORMATS[fmt][0], options
+
+
+def extension(fmt=None):
+    return FORMATS[fmt or config.OUTPUT_FORMAT][1]
+
+
+def output_key(fmt=None, preset=None, quality=None):
+    """Parametry kódování pro render_cache.render_hash (změna = nový soubor)."""
+    pil_format, options = save_options(fmt, preset, quality)
+    return (pil_format,) + tuple(sorted(options.items()))
+
+
+def check_support(fmt=None):
+    """Vyhodí RuntimeError, když Pillow neumí formát zapsat (WebP bez libwebp)."""
+    if (fmt or config.OUTPUT_FORMAT) == "webp" and not features.check("webp"):
+        raise RuntimeError("Pillow je sestavený bez podpory WebP - použijte jpeg nebo png")
+
+
+@lru_cache(maxsize=1)
+def seed_colors():
+    """Bílá, černá a všechny barvy z PALETTE_SOURCES jako (r, g, b)."""
+    colors = {(255, 255, 255), (0, 0, 0)}
+    for name in PALETTE_SOURCES:
+        for value in getattr(config, name, {}).values():
+            colors.add(ImageColor.getrgb(value)[:3])
+    return sorted(colors)
+
+
+def quantize(img, colors=256):
+    """Obrázek v režimu P: paleta = seed_colors() + adaptivní barvy z obrázku.
+
+    Bez ditheringu - rozptýlený šum by v plochách a kolem textu zhoršil
+    kompresi víc, než by pomohl oku.
+    """
+    rgb = img.convert("RGB")
+    seeds = seed_colors()
+    flat = [c for color in seeds for c in color]
+    free = colors - len(seeds)
+    if free > 0:
+        adaptive = rgb.quantize(free, method=Image.Quantize.FASTOCTREE).getpalette()[:free * 3]
+        for i in range(0, len(adaptive), 3):
+            color = adaptive[i:i + 3]
+            # Vyhledávání v paletě (PIL) je přibližné - odstín těsně vedle barvy
+            # z config by jí "kradl" pixely (bílá 255 -> 254), takový se vynechá
+            if all(max(abs(a - b) for a, b in zip(color, seed)) > SEED_MARGIN for seed in seeds):
+                flat += color
+    palette = Image.new("P", (1, 1))
+    # Paleta musí mít 256 položek; zbytek vyplní opakovaná první barva (duplicita nic nemění)
+    palette.putpalette(flat + flat[:3] * (256 - len(flat) // 3))
+    return rgb.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+def save_with_stats(img, path, fmt=None, preset=None, quality=None):
+    """Jako save, ale vrací {"path", "bytes", "colors", "quantize_ms", "encode_ms"}."""
+    pil_format, options = save_options(fmt, preset, quality)
+    colors = options.pop("palette", None)
+    started = time.perf_counter()
+    if colors:
+        img = quantize(img, colors)
+        if pil_format == "WEBP":
+            img = img.convert("RGB")  # libwebp si paletu pro lossless sestaví sám
+    elif pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    quantized = time.perf_counter()
+
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        img.save(tmp, pil_format, **options)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return {
+        "path": path,
+        "bytes": os.path.getsize(path),
+        "colors": colors,
+        "quantize_ms": (quantized - started) * 1000,
+        "encode_ms": (time.perf_counter() - quantized) * 1000,
+    }
+
+
+def save(img, path, fmt=None, preset=None, quality=None):
+    """Zakóduje img do path přes dočasný soubor a atomické přejmenování; vrací path."""
+    return save_with_stats(img, path, fmt, preset, quality)["path"]
+
+
+def describe(stats):
+    """Řádek reportu pro jeden obrázek."""
+    msg = f"{os.path.basename(stats['path'])}: {stats['bytes'] / 1024:.1f} kB, {stats['encode_ms']:.0f} ms"
+    if stats["colors"]:
+        msg += f" (+ kvantizace na {stats['colors']} barev {stats['quantize_ms']:.0f} ms)"
+    return msg
+
+
+class EncodeReport:
+    """Souhrn velikostí a časů kódování za dávku (vláknově bezpečný)."""
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.ms = 0.0
+        self.largest = None
+        self._lock = threading.Lock()
+
+    def add(self, stats):
+        with self._lock:
+            self.count += 1
+            self.bytes += stats["bytes"]
+            self.ms += stats["quantize_ms"] + stats["encode_ms"]
+            if self.largest is None or stats["bytes"] > self.largest["bytes"]:
+                self.largest = stats
+
+    def summary(self):
+        if not self.count:
+            return ""
+        return (f"Zapsáno {self.count} obrázků, {self.bytes / 1024 / 1024:.1f} MB "
+                f"(průměr {self.bytes / 1024 / self.count:.1f} kB, {self.ms / self.count:.0f} ms); "
+                f"největší {describe(self.largest)}")
+
+
+class Encoder:
+    """Pool vláken pro kódování, aby render (nebo GUI) na zápis nečekal."""
+
+    def __init__(self, fmt=None, preset=None, quality=None, workers=None):
+        self.fmt = fmt or config.OUTPUT_FORMAT
+        self.preset = preset or config.OUTPUT_PRESET
+        self.quality = quality
+        save_options(self.fmt, self.preset, quality)  # neplatná kombinace -> chyba hned
+        check_support(self.fmt)
+        self._pool = ThreadPoolExecutor(workers or config.ENCODE_WORKERS, thread_name_prefix="encode")
+
+    @property
+    def extension(self):
+        return extension(self.fmt)
+
+    def output_key(self):
+        return output_key(self.fmt, self.preset, self.quality)
+
+    def save(self, img, path):
+        """Synchronní zápis se stejnými parametry (pro vlákna, která už jsou mimo GUI)."""
+        return save_with_stats(img, path, self.fmt, self.preset, self.quality)
+
+    def submit(self, img, path):
+        """Future se statistikou zápisu (viz save_with_stats)."""
+        return self._pool.submit(self.save, img, path)
+
+    def close(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,213 @@
+# extractor.py
+"""Extrakce parametrů pásku z textu produktové stránky (bez prohlížeče).
+
+Všechny regexy jsou předkompilované a stránka se prochází jednou pro každou
+skupinu polí místo jednoho re.search na pole:
+    - barva: jeden průchod kombinovaným vzorem, vyhrává pravidlo s nejvyšší prioritou
+    - tabulka parametrů: každý popisek ("Šířka [mm]" ...) má vlastní vzor; jeho
+      doslovný začátek se hledá str.find a vzor se zkouší jen tam, a hodnota se čte
+      jen ze zbytku řádku s popiskem a z následujícího neprázdného řádku - oddělovač
+      ":", mezera, tabulátor i hodnota na dalším řádku fungují jako dřív, ale .*?
+      s DOTALL už nemůže přeskočit přes celou stránku
+    - volný text (čip, W/m, lm/m, V, IP, model): samostatné vzory přes celou stránku
+
+Vzory jsou s re.IGNORECASE a hledá se v source.lower(), aby str.find
+doslovných začátků sedělo. Zachycené hodnoty jsou čísla nebo se převádí na
+velká písmena, jen model se čte z původního textu.
+"""
+import re
+
+import config
+
+
+def _compile(pattern, flags=0):
+    return re.compile(pattern, re.IGNORECASE | flags)
+
+
+def _literal_prefix(pattern):
+    """Doslovný začátek vzoru malými písmeny (hledá se str.find v source.lower())."""
+    head = re.match(r'[^\\.^$*+?{}\[\]|()]*', pattern).group()
+    if len(head) < len(pattern) and pattern[len(head)] in "*?{":
+        head = head[:-1]  # znak před kvantifikátorem není povinný
+    return head.lower()
+
+
+def _candidates(regex, prefix, text):
+    """Shody regex začínající na výskytech prefix (bez prefixu finditer)."""
+    if not prefix:
+        yield from regex.finditer(text)
+        return
+    pos = text.find(prefix)
+    while pos != -1:
+        m = regex.match(text, pos)
+        if m:
+            yield m
+        pos = text.find(prefix, pos + 1)
+
+
+# --- BARVA ---
+# Pořadí = priorita (jako původní if/elif kaskáda). Hodnota je výsledek, nebo
+# funkce, která ho vytvoří z match objektu pravidla.
+_COLOR_RULES = [
+    (r'Barva světla[:\s]+Digital SPI', "DIGITAL SPI"),
+    (r'Barva světla[:\s]+barevný RGB\+CCT', "RGB+CCT"),
+    (r'Barva světla[:\s]+barevný RGB\+(NW|CW|WW)', lambda m: f"RGB+{m.group(1).upper()}"),
+    (r'Barva světla[:\s]+barevný - RGB\b', "RGB"),
+    (r'Barva světla[:\s]+duální bílá\s+([A-Z]+-[A-Z]+)', lambda m: m.group(1).upper().replace("-", "+")),
+    # Speciální produktové barvy
+    (r'Barva světla[:\s]+Produktové Ovoce O', "Ovoce O"),
+    (r'Barva světla[:\s]+Produktové Sýry S', "Sýry S"),
+    (r'Barva světla[:\s]+Produktový Pečivo P', "Pečivo P"),
+    (r'Barva světla[:\s]+Produktové Uzeniny U', "Uzeniny U"),
+    (r'Barva světla[:\s]+Produktové Maso M', "Maso M"),
+    (r'Barva světla[:\s]+Produktový Mražené MR', "Mražené MR"),
+    # Jednobarevné
+    (r'Barva světla[:\s]+denní bílý DW', "DW"),
+    (r'Barva světla[:\s]+studeně bílý CW', "CW"),
+    (r'Barva světla[:\s]+neutrálně bílý NW', "NW"),
+    (r'Barva světla[:\s]+teple bílý WW', "WW"),
+    (r'Barva světla[:\s]+UVA', "UVA"),
+    (r'Modrá|modrý B', "B"),
+    (r'Červená|červený R', "R"),
+    (r'Zelená|zelený G', "G"),
+    (r'Žlutá|žlutý Y', "Y"),
+]
+_COLOR_PREFIX = r'Barva světla[:\s]+'
+# Pravidla "Barva světla: ..." se hodnotí jen za nalezeným prefixem (jeden vzor
+# pro všechny hodnoty), ostatní jedním vzorem přes celý text
+_COLOR_PARTS = [p[len(_COLOR_PREFIX):] if p.startswith(_COLOR_PREFIX) else p for p, _ in _COLOR_RULES]
+_COLOR_PART_RES = [_compile(p) for p in _COLOR_PARTS]
+_COLOR_PREFIX_RE = _compile(_COLOR_PREFIX)
+_COLOR_PREFIX_LITERAL = _literal_prefix(_COLOR_PREFIX)
+_COLOR_VALUE = _compile("|".join(f"(?P<c{i}>{part})" for i, ((p, _), part) in
+                                 enumerate(zip(_COLOR_RULES, _COLOR_PARTS)) if p.startswith(_COLOR_PREFIX)))
+_COLOR_WORDS = _compile("|".join(f"(?P<c{i}>{part})" for i, ((p, _), part) in
+                                 enumerate(zip(_COLOR_RULES, _COLOR_PARTS)) if not p.startswith(_COLOR_PREFIX)))
+
+# Záložní varianta: první klíč COLOR_MAP_LIGHT (v pořadí slovníku), který je v textu jako slovo
+_COLOR_KEYS = list(config.COLOR_MAP_LIGHT)
+_COLOR_KEY_ANY = re.compile("\\b(?:" + "|".join(_COLOR_KEYS) + ")\\b")
+
+# --- TABULKA PARAMETRŮ ---
+# (pole, popisek, hodnota za popiskem - na stejném nebo následujícím neprázdném řádku)
+_LABEL_FIELDS = [
+    ("max_single", r'Max\. délka pásku při jednostranném napájení', r'.*?(\d+)'),
+    ("max_double", r'Max\. délka pásku při oboustranném napájení', r'.*?(\d+)'),
+    ("led_segment", r'Počet LED na segment', r'[:\s]+(\d+)'),
+    ("cut", r'Dělitelnost pásku po\s?\[mm\]', r'[:\s]+(\d+[.,]\d+|\d+)'),
+    ("kelvin", r'Barevná teplota', r'.*?(\d+\s?-\s?\d+)'),
+    ("leds", r'Počet LED na metr\s?\[-\]', r'[:\s]+(\d+)'),
+    ("width", r'Šířka\s?\[mm\]', r'[:\s]+(\d+)'),
+    ("height", r'Výška / hloubka\s?\[mm\]', r'[:\s]+(\d+)'),
+    ("life_full", r'L(?P<life_l>\d+)/B(?P<life_b>\d+).*?\[h\]', r':\s*(\d+[\s.]\d+|\d+)'),
+    ("cri", r'Index podání barev CRI', r'[:\s]+(90-100|90)'),
+    ("angle", r'Úhel vyzařování\s?\[°\]', r'[:\s]+(\d+)'),
+]
+_LABEL_RES = {k: (_compile(p), _literal_prefix(p)) for k, p, _ in _LABEL_FIELDS}
+_LABEL_VALUE = {k: _compile(v, re.DOTALL) for k, _, v in _LABEL_FIELDS}
+
+# --- VOLNÝ TEXT ---
+_TEXT_FIELDS = {
+    "chip": _compile(r'(SMD\s?\d+|COB)'),
+    "power": _compile(r'(\d+[.,]\d+|\d+)\s?W/m'),
+    "lumen": _compile(r'(\d+)\s?lm/m'),
+    "voltage": _compile(r'(\d+)\s?V\b'),
+    "ip": _compile(r'IP(\d+)'),
+}
+# Hodnota modelu ("74A") je citlivá na velikost písmen, hledá se v původním textu
+_MODEL = re.compile(r'Model\s*(\d{2,3}[A-Z])', re.IGNORECASE)
+
+# Pořadí klíčů ve výsledku (stejné jako dřív)
+FIELD_ORDER = ["max_single", "max_double", "led_segment", "cut", "kelvin", "chip", "leds",
+               "power", "lumen", "voltage", "ip", "width", "height", "model", "life_full",
+               "cri", "angle"]
+
+
+def _best_rule(matches):
+    """(index pravidla, match) s nejvyšší prioritou; matches jsou shody se skupinami c<index>."""
+    best = None
+    for m in matches:
+        i = int(m.lastgroup[1:])
+        if best is None or i < best[0]:
+            best = (i, m)
+    return best
+
+
+def extract_color(source, text=None):
+    """Barva světla podle priority pravidel, jinak první klíč z COLOR_MAP_LIGHT v textu."""
+    text = source.lower() if text is None else text
+    best = _best_rule(filter(None, (_COLOR_VALUE.match(text, m.end())
+                                    for m in _candidates(_COLOR_PREFIX_RE, _COLOR_PREFIX_LITERAL, text))))
+    if best is None:
+        best = _best_rule(_COLOR_WORDS.finditer(text))
+    if best is not None:
+        i, m = best
+        result = _COLOR_RULES[i][1]
+        if callable(result):
+            return result(_COLOR_PART_RES[i].match(text, m.start()))
+        return result
+
+    found = {_COLOR_KEYS.index(m.group()) for m in _COLOR_KEY_ANY.finditer(source.upper())}
+    return _COLOR_KEYS[min(found)] if found else None
+
+
+def _value_end(text, pos):
+    """Konec oblasti pro hodnotu popisku: zbytek řádku a následující neprázdný řádek."""
+    end = text.find("\n", pos)
+    if end == -1:
+        return len(text)
+    while end + 1 < len(text) and text[end + 1] in "\n\r\t ":
+        end += 1
+    end = text.find("\n", end + 1)
+    return len(text) if end == -1 else end
+
+
+def extract_labels(text):
+    """{pole: (match popisku, match hodnoty)} pro první výskyt popisku s platnou hodnotou."""
+    found = {}
+    for key, (label, prefix) in _LABEL_RES.items():
+        for m in _candidates(label, prefix, text):
+            value = _LABEL_VALUE[key].match(text, m.end(), _value_end(text, m.end()))
+            if value:
+                found[key] = (m, value)
+                break
+    return found
+
+
+def parse_page(source):
+    """Vytáhne parametry pásku z textu stránky."""
+    if not source:
+        return {}
+
+    res = {}
+    text = source.lower()
+    color = extract_color(source, text)
+    if color:
+        res["color"] = color
+
+    labels = extract_labels(text)
+    for key in FIELD_ORDER:
+        if key in labels:
+            label, value = labels[key]
+            val = value.group(1)
+        else:
+            if key == "model":
+                match = _MODEL.search(source)
+            else:
+                match = _TEXT_FIELDS[key].search(text) if key in _TEXT_FIELDS else None
+            if not match:
+                continue
+            val = match.group(1)
+
+        if key == "chip": val = val.upper()
+        if key == "cut": val = val.replace('.', ',')
+        if key == "height": val = val.replace(',', '.')
+        if key == "cri" and "90" in val: val = "90"
+        if key == "life_full":
+            res[key] = label.group("life_l")
+            res["life_l"] = label.group("life_l")
+            res["life_b"] = label.group("life_b")
+            res["life"] = val.replace(" ", "").replace(".", "")
+            continue
+        res[key] = val
+    return res
@@ -0,0 +1,104 @@
+# fonts.py
+import math
+import threading
+
+import PIL
+from PIL import Image, ImageDraw, ImageFont
+
+import config
+
+_FONTS = {}
+_FAILED = {}
+_lock = threading.Lock()
+
+
+def get_font(path, size):
+    """Řez (path, size) sdílený celým procesem; nenačtený -> výchozí font PIL (viz failures())."""
+    key = (path, size)
+    font = _FONTS.get(key)
+    if font is not None:
+        return font
+
+    with _lock:
+        font = _FONTS.get(key)
+        if font is None:
+            try:
+                font = ImageFont.truetype(path, size)
+            except OSError as e:
+                _FAILED[key] = str(e)
+                print(f"WARNING: Font '{path}' ({size}px) nelze načíst: {e}")
+                font = ImageFont.load_default()
+            _FONTS[key] = font
+    return font
+
+
+def prewarm(faces=None):
+    """Načte všechny řezy drawer (config.FONT_FACES) před prvním renderem."""
+    for path, size in faces or config.FONT_FACES:
+        get_font(path, size)
+
+
+def failures():
+    return dict(_FAILED)
+
+
+# --- Metriky textu a předrasterizované popisky ---
+# Klíčem je samotný objekt fontu: řezy jsou z registru, takže jsou pro (path, size) stejné.
+_MEASURE = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+_BBOXES = {}
+_LABELS = {}
+TEXT_CACHE_MAX = 4096
+# draw_label kreslí přes neveřejné API Pillow (ImageDraw._getink, core draw_bitmap);
+# když ho nová verze Pillow nemá nebo změní, přejde se natrvalo na draw.text
+_fast_labels = True
+
+
+def text_bbox(text, font):
+    """draw.textbbox((0, 0), text, font=font) z cache."""
+    key = (text, font)
+    bbox = _BBOXES.get(key)
+    if bbox is None:
+        if len(_BBOXES) >= TEXT_CACHE_MAX:
+            _BBOXES.clear()
+        bbox = _BBOXES[key] = _MEASURE.textbbox((0, 0), text, font=font)
+    return bbox
+
+
+def draw_label(draw, xy, text, fill, font):
+    """Jako draw.text(xy, text, fill=fill, font=font), ale maska glyfů se rasterizuje jen jednou.
+
+    Maska je stejná, jakou by vyrobil ImageDraw.text (včetně posunu o zlomek
+    pixelu), a kreslí se stejným draw_bitmap.
+    """
+    global _fast_labels
+    if not _fast_labels or not isinstance(font, ImageFont.FreeTypeFont) or "\n" in text:
+        draw.text(xy, text, fill=fill, font=font)
+        return
+
+    x, y = xy
+    start = (math.modf(x)[0], math.modf(y)[0])
+    key = (text, font, draw.fontmode, start)
+    label = _LABELS.get(key)
+    if label is None:
+        if len(_LABELS) >= TEXT_CACHE_MAX:
+            _LABELS.clear()
+        label = _LABELS[key] = font.getmask2(text, draw.fontmode, start=start)
+
+    mask, offset = label
+    try:
+        ink = draw._getink(fill)[0]
+        draw.draw.draw_bitmap((int(x) + offset[0], int(y) + offset[1]), mask, ink)
+    except (AttributeError, TypeError, ValueError) as e:
+        _fast_labels = False
+        print(f"WARNING: Rychlé kreslení popisků nejde s Pillow {PIL.__version__} ({e}), kreslí se draw.text")
+        draw.text(xy, text, fill=fill, font=font)
+
+
+def prerender_labels(pairs):
+    """Změří a rasterizuje stálé popisky (font, text) před prvním renderem."""
+    for font, text in pairs:
+        text_bbox(text, font)
+        if isinstance(font, ImageFont.FreeTypeFont):
+            key = (text, font, "L", (0.0, 0.0))
+            if key not in _LABELS:
+                _LABELS[key] = font.getmask2(text, "L", start=(0.0, 0.0))
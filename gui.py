@@ -5,12 +5,15 @@ from tkinter import messagebox, filedialog
 import threading
 import os
 import csv
-import time
-import random
 
+import batch
+import browser_pool
 import config
-from scraper import fetch_data, get_driver
+import encoder
+from scraper import fetch_data, code_to_url
 from drawer import LedImageGenerator
+from pipeline import run_scrape_batch
+from page_cache import PageCache
 from pathlib import Path
 
 class LedApp(ctk.CTk):
@@ -28,8 +31,24 @@ class LedApp(ctk.CTk):
 
         self._setup_ui()
         self.generator = LedImageGenerator()
+        self.encoder = encoder.Encoder()
         self._anim_active = False
 
+        # Teplý prohlížeč pro SKENOVAT - start Chrome trvá sekundy, ať se čeká jen jednou
+        threading.Thread(target=self._prewarm_browser, daemon=True).start()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _prewarm_browser(self):
+        try:
+            browser_pool.interactive().prewarm()
+        except Exception as e:
+            print(f"Prohlížeč se nepodařilo předem spustit: {e}")
+
+    def _on_close(self):
+        browser_pool.interactive().close()
+        self.encoder.close()
+        self.destroy()
+
     def _setup_ui(self):
         # --- Horní blok (URL a tlačítka) ---
         self.frame_top = ctk.CTkFrame(self, corner_radius=10)
@@ -151,7 +170,8 @@ class LedApp(ctk.CTk):
 
     def _fetch_thread(self, url):
         try:
-            data = fetch_data(url)
+            # Jednotlivý sken stahuje vždy znovu, ale uloží výsledek pro dávky
+            data = fetch_data(url, cache=PageCache(mode="refresh"), pool=browser_pool.interactive())
             self.after(0, lambda: self._update_fields(data))
         except Exception as e:
             self.after(0, lambda: self.show_status(f"Chyba: {str(e)}", mode="error"))
@@ -178,32 +198,36 @@ class LedApp(ctk.CTk):
             sku = self.url_input.get().split('/')[-1].upper().replace('-', '.')
             data["ml_code"] = sku 
             
-            img = self.generator.generate(data)
+            images = self.generator.generate_sizes(data, config.OUTPUT_SIZES)
             
-            filename = f"{sku}_30.webp"
-            full_path = target_dir / filename
-            
-            img.save(str(full_path), "JPEG", quality=95)
-            
-            if os.name == 'nt':
-                os.startfile(str(full_path))
-            else:
-                img.show()
-            self.show_status(f"Hotovo! Uloženo v McLED_LED-pasky", mode="success")
+            # Kódování (WebP) běží ve vlákně encoderu, okno mezitím nezamrzne;
+            # otevře se jen první velikost, ostatní se jen uloží
+            for n, (size, img) in enumerate(images.items()):
+                filename = batch.output_filename(sku, self.encoder.extension, size)
+                future = self.encoder.submit(img, str(target_dir / filename))
+                if n == 0:
+                    future.add_done_callback(lambda f, img=img: self.after(0, self._on_saved, f, img))
         except Exception as e:
             self.show_status(f"Chyba při generování: {e}", mode="error")
 
+    def _on_saved(self, future, img):
+        try:
+            stats = future.result()
+        except Exception as e:
+            self.show_status(f"Chyba při ukládání: {e}", mode="error")
+            return
+        full_path = stats["path"]
+        print(f"Uloženo {encoder.describe(stats)}")
+        if os.name == 'nt':
+            os.startfile(full_path)
+        else:
+            img.show()
+        self.show_status(f"Hotovo! Uloženo v McLED_LED-pasky ({stats['bytes'] / 1024:.0f} kB)", mode="success")
+
     # --- HROMADNÉ ZPRACOVÁNÍ (ROBUST BATCH) ---
 
     def transform_code_to_url(self, code):
-        clean_code = code.strip().lower().replace('.', '-')
-        parts = clean_code.split('-')
-        
-        if len(parts) >= 4:
-            base = "-".join(parts[:-1])
-            return f"https://www.mcled.cz/{base}-x"
-        
-        return f"https://www.mcled.cz/{clean_code}"
+        return code_to_url(code)
 
     def load_batch_file(self):
         file_path = filedialog.askopenfilename(
@@ -215,20 +239,7 @@ class LedApp(ctk.CTk):
             return
             
         try:
-            codes = []
-            with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line: continue
-                    
-                    val = line
-                    if ';' in line: val = line.split(';')[0].strip()
-                    elif ',' in line: val = line.split(',')[0].strip()
-                    
-                    val = val.replace('"', '').replace("'", "")
-                    
-                    if val.upper().startswith("ML"):
-                        codes.append(val)
+            codes = batch.read_codes(file_path)
             
             if not codes:
                 self.show_status("Nebyly nalezeny žádné platné ML kódy.", mode="error")
@@ -244,77 +255,25 @@ class LedApp(ctk.CTk):
 
     def _process_batch_thread(self, codes):
         total = len(codes)
-        success_count = 0
-        errors = []
-        driver = None
+        report = None
+
+        def on_progress(done, total, job):
+            self.after(0, lambda: self.show_status(f"Zpracováno {done}/{total}: {job.code}",
+                                                   mode="loading", progress=done / total))
 
         try:
-            # 1. Start prohlížeče
-            driver = get_driver()
-            
-            for i, code in enumerate(codes):
-                try:
-                    progress = i / total
-                    remaining = total - i
-                    
-                    self.after(0, lambda i=i, remaining=remaining, progress=progress, code=code: 
-                               self.show_status(f"Zpracovávám {i+1}/{total}: {code}", mode="loading", progress=progress))
-                    
-                    url = self.transform_code_to_url(code)
-                    print(f"Batch ({i+1}/{total}): {code} -> {url}")
-                    
-                    if i > 0:
-                        delay = random.uniform(1.5, 3.5)
-                        time.sleep(delay)
-                    
-                    data = fetch_data(url, driver=driver)
-                    
-                    downloads_path = Path.home() / "Downloads"
-                    target_dir = downloads_path / "McLED_LED-pasky"
-                    target_dir.mkdir(parents=True, exist_ok=True)
-
-                    if not data:
-                        # try once more
-                        time.sleep(4)
-                        data = fetch_data(url, driver=driver)
-                        if not data:
-                            errors.append(code)
-                            continue
-
-                    # 4. Generovat a uložit
-                    try:
-                        # FIX: Set ml_code BEFORE generate
-                        data["ml_code"] = code 
-                        img = self.generator.generate(data)
-                        
-                        clean_name = code.strip().replace('/', '-').replace('\\', '-')
-                        filename = f"{clean_name}_30.webp"
-                        full_path = target_dir / filename
-
-                        img.save(str(full_path), "JPEG", quality=95)
-                        success_count += 1
-                    except Exception as gen_err:
-                        print(f"Chyba při kreslení {code}: {gen_err}")
-                        errors.append(code)
-                    
-                except Exception as e:
-                    print(f"Error processing {code}: {e}")
-                    errors.append(code)
+            # Stahování, kreslení a ukládání běží souběžně (viz pipeline.py)
+            target_dir = Path.home() / "Downloads" / "McLED_LED-pasky"
+            report = run_scrape_batch(codes, self.generator, str(target_dir),
+                                      cache=PageCache(), on_progress=on_progress)
 
         except Exception as global_e:
             print(f"Critical Batch Error: {global_e}")
             self.after(0, lambda: self.show_status(f"Kritická chyba: {global_e}", mode="error"))
             
         finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
-            
-            final_msg = f"HOTOVO! Vygenerováno {success_count} z {total}."
-            if errors:
-                final_msg += f" (Chyby: {len(errors)})"
+            success_count = report.success if report else 0
+            final_msg = report.summary() if report else f"HOTOVO! Vygenerováno 0 z {total}."
                 
             self.after(0, lambda: self.btn_batch.configure(state="normal"))
             self.after(0, lambda: self.show_status(final_msg, mode="success" if success_count > 0 else "error"))
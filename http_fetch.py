@@ -0,0 +1,297 @@
+# http_fetch.py
+"""Stahování produktových stránek přes HTTP bez prohlížeče (asyncio).
+
+Tabulka parametrů je na mcled.cz v HTML ze serveru, takže pro většinu stránek
+stačí GET + převod HTML na text ve stejném tvaru jako body.text ze Selenia
+(řádky "Popisek: hodnota"). Výstup jde do stejného extractor.parse_page.
+Stránky, kde po parsování chybí config.HTTP_REQUIRED_FIELDS, volající stáhne
+prohlížečem (viz fetch_texts / scraper.fetch_data).
+
+PageFetcher stahuje po jedné stránce z vláken (fáze "http" v pipeline - tempo
+řídí pacing.HostLimiter, počet vláken omezuje souběh; fetch_text pro jednotlivé
+skeny drží jeden sdílený); AsyncFetcher stáhne najednou celý seznam adres.
+
+Backend: aiohttp (pokud je nainstalované), jinak http.client s keep-alive
+spojeními ve vláknech. Souběh je omezený na host (HTTP_PER_HOST) i celkem
+(HTTP_MAX_CONNECTIONS).
+"""
+import asyncio
+import gzip
+import html
+import http.client
+import re
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+import config
+import extractor
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+# --- HTML -> text ---
+
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "caption", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tbody",
+    "thead", "tfoot", "tr", "ul",
+}
+_CELL_TAGS = {"td", "th"}
+_SKIP = re.compile(r'<!--.*?-->|<(head|script|style|noscript|template|svg|iframe)\b.*?</\1\s*>',
+                   re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r'<(/?)([a-zA-Z][\w:-]*)[^>]*>')
+
+
+def _tag_break(m):
+    tag = m.group(2).lower()
+    if tag in _BLOCK_TAGS:
+        return "\n"
+    if tag in _CELL_TAGS:
+        return " "
+    return ""
+
+
+def html_to_text(html_source):
+    """Viditelný text stránky po řádcích, mezery sloučené (jako WebElement.text pro body).
+
+    Regexy místo html.parser: na stránce se stovkami tagů je to řádově rychlejší
+    a strom nepotřebujeme, jen hranice bloků a buněk.
+    """
+    text = _TAG.sub(_tag_break, _SKIP.sub("", html_source))
+    lines = (" ".join(line.split()) for line in html.unescape(text).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def default_headers():
+    return {
+        "User-Agent": config.USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Encoding": "gzip, deflate",
+        "Accept-Language": "cs,en;q=0.8",
+    }
+
+
+def is_complete(text, required=None):
+    """True, když parse_page(text) obsahuje všechna povinná pole."""
+    required = config.HTTP_REQUIRED_FIELDS if required is None else required
+    data = extractor.parse_page(text)
+    return bool(data) and all(key in data for key in required)
+
+
+# --- stdlib backend: keep-alive spojení na host ---
+
+class HTTPStatusError(http.client.HTTPException):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+def host_failure(error):
+    """True pro chyby, které znamenají přetížený nebo nedostupný web (pro pacing.HostLimiter).
+
+    Spojení, timeout, 429 a 5xx ano; 404, špatná adresa apod. ne.
+    """
+    if isinstance(error, HTTPStatusError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (OSError, http.client.RemoteDisconnected))
+
+
+_CHARSET = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+class _ConnectionPool:
+    """Blokující GET s opakovaným použitím spojení (jedno spojení = jeden požadavek naráz)."""
+
+    def __init__(self, timeout, headers):
+        self.timeout = timeout
+        self.headers = headers
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def _request(self, key, path):
+        """(response, body); spojení z poolu, které server mezitím zavřel, se jednou zopakuje."""
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request("GET", path, headers=self.headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return resp, body
+
+    def get(self, url, redirects=5):
+        for _ in range(redirects + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            resp, body = self._request((parts.scheme, parts.hostname, parts.port), path)
+
+            if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+                url = urljoin(url, resp.getheader("Location"))
+                continue
+            if resp.status != 200:
+                raise HTTPStatusError(resp.status)
+
+            encoding = (resp.getheader("Content-Encoding") or "").lower()
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            elif encoding == "deflate":
+                body = zlib.decompress(body)
+            charset = _CHARSET.search(resp.getheader("Content-Type") or "")
+            return body.decode(charset.group(1) if charset else "utf-8", errors="replace")
+        raise http.client.HTTPException(f"Příliš mnoho přesměrování: {url}")
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+class PageFetcher:
+    """Blokující stažení jedné stránky s keep-alive spojeními (bezpečné z více vláken).
+
+    fetch(url) vrací text, nebo "" když stránce chybí povinná pole (pak je
+    potřeba prohlížeč); síťová a HTTP chyba projde výjimkou.
+    """
+
+    def __init__(self, timeout=None, required=None):
+        self.required = required
+        self._pool = _ConnectionPool(timeout or config.HTTP_TIMEOUT, default_headers())
+
+    def fetch(self, url, required=None):
+        text = html_to_text(self._pool.get(url))
+        return text if is_complete(text, self.required if required is None else required) else ""
+
+    def close(self):
+        self._pool.close()
+
+
+class AsyncFetcher:
+    """async with AsyncFetcher() as f: texts = await f.fetch_many(urls)"""
+
+    def __init__(self, per_host=None, max_connections=None, timeout=None):
+        self.per_host = per_host or config.HTTP_PER_HOST
+        self.max_connections = max_connections or config.HTTP_MAX_CONNECTIONS
+        self.timeout = timeout or config.HTTP_TIMEOUT
+        self.headers = default_headers()
+        self._hosts = {}
+        self._session = None
+        self._pool = None
+        self._executor = None
+
+    async def __aenter__(self):
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host)
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        else:
+            self._pool = _ConnectionPool(self.timeout, self.headers)
+            self._executor = ThreadPoolExecutor(self.max_connections, thread_name_prefix="http")
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._session is not None:
+            await self._session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._pool.close()
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        sem = self._hosts.get(host)
+        if sem is None:
+            sem = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def fetch_html(self, url):
+        async with self._host_limit(url):
+            if self._session is not None:
+                async with self._session.get(url) as resp:
+                    resp.raise_for_status()
+                    return await resp.text(errors="replace")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._pool.get, url)
+
+    async def fetch_text(self, url):
+        """Text stránky ("" při chybě, stejně jako scraper.fetch_page)."""
+        try:
+            source = await self.fetch_html(url)
+        except Exception as e:
+            print(f"Chyba při stahování {url} (HTTP): {e}")
+            return ""
+        # Převod je CPU práce - mimo event loop, ať neblokuje další požadavky
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, html_to_text, source)
+
+    async def fetch_many(self, urls):
+        urls = list(dict.fromkeys(urls))
+        texts = await asyncio.gather(*(self.fetch_text(url) for url in urls))
+        return dict(zip(urls, texts))
+
+
+async def _fetch_all(urls, **kwargs):
+    async with AsyncFetcher(**kwargs) as fetcher:
+        return await fetcher.fetch_many(urls)
+
+
+def fetch_texts(urls, required=None, **kwargs):
+    """{url: text} pro stránky, které se přes HTTP stáhly úplné (ostatní chybí -> prohlížeč).
+
+    Volá se z obyčejného vlákna (ne z běžící event loop).
+    """
+    texts = asyncio.run(_fetch_all(urls, **kwargs))
+    return {url: text for url, text in texts.items() if text and is_complete(text, required)}
+
+
+_page_fetcher = None
+_page_fetcher_lock = threading.Lock()
+
+
+def fetch_text(url, required=None):
+    """Úplný text jedné stránky přes HTTP, nebo "" (pak je potřeba prohlížeč).
+
+    Spojení zůstávají otevřená ve sdíleném PageFetcher pro další skeny.
+    """
+    global _page_fetcher
+    with _page_fetcher_lock:
+        if _page_fetcher is None:
+            _page_fetcher = PageFetcher()
+    try:
+        return _page_fetcher.fetch(url, required)
+    except Exception as e:
+        print(f"Chyba při stahování {url} (HTTP): {e}")
+        return ""
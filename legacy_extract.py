@@ -0,0 +1,119 @@
+# legacy_extract.py
+"""Původní parse_page (kaskáda re.search s IGNORECASE | DOTALL), jak byla ve
+scraper.py před extractor.py.
+
+Zmrazená reference: z ní bench_extract --update generuje očekávané výstupy
+korpusu a její PATTERNS se měří v kontrole regexů vedle vzorů extraktoru.
+Neupravovat - rozdíl mezi ní a extraktorem je přesně to, co má benchmark najít.
+"""
+import re
+
+import config
+
+# --- PARAMETRY ---
+PATTERNS = {
+    "max_single": r'Max\. délka pásku při jednostranném napájení.*?(\d+)',
+    "max_double": r'Max\. délka pásku při oboustranném napájení.*?(\d+)',
+    "led_segment": r'Počet LED na segment[:\s]+(\d+)',
+    "cut": r'Dělitelnost pásku po\s?\[mm\][:\s]+(\d+[.,]\d+|\d+)',
+    "kelvin": r'Barevná teplota.*?(\d+\s?-\s?\d+)',
+    "chip": r'(SMD\s?\d+|COB)',
+    "leds": r'Počet LED na metr\s?\[-\][:\s]+(\d+)',
+    "power": r'(\d+[.,]\d+|\d+)\s?W/m',
+    "lumen": r'(\d+)\s?lm/m',
+    "voltage": r'(\d+)\s?V\b',
+    "ip": r'IP(\d+)',
+    "width": r'Šířka\s?\[mm\][:\s]+(\d+)',
+    "height": r'Výška / hloubka\s?\[mm\][:\s]+(\d+)',
+    "model": r'Model\s*(\d{2,3}[A-Z])',
+    "life_full": r'L(\d+)/B(\d+).*?\[h\]:\s*(\d+[\s.]\d+|\d+)',
+    "cri": r'Index podání barev CRI[:\s]+(90-100|90)',
+    "angle": r'Úhel vyzařování\s?\[°\][:\s]+(\d+)'
+}
+
+
+def parse_page(source):
+    """Vytáhne parametry pásku z textu stránky."""
+    if not source:
+        return {}
+
+    res = {}
+
+    # --- LOGIKA BAREV ---
+    src_upper = source.upper()
+    
+    # 1. Digital SPI
+    if re.search(r'Barva světla[:\s]+Digital SPI', source, re.IGNORECASE):
+        res["color"] = "DIGITAL SPI"
+    # 2. RGB+CCT
+    elif re.search(r'Barva světla[:\s]+barevný RGB\+CCT', source, re.IGNORECASE):
+        res["color"] = "RGB+CCT"
+    # 3. RGBW
+    elif re.search(r'Barva světla[:\s]+barevný RGB\+(NW|CW|WW)', source, re.IGNORECASE):
+        match = re.search(r'Barva světla[:\s]+barevný RGB\+(NW|CW|WW)', source, re.IGNORECASE)
+        res["color"] = f"RGB+{match.group(1).upper()}"
+    # 4. RGB
+    elif re.search(r'Barva světla[:\s]+barevný - RGB\b', source, re.IGNORECASE):
+        res["color"] = "RGB"
+    # 5. Dual White
+    elif re.search(r'Barva světla[:\s]+duální bílá\s+([A-Z]+-[A-Z]+)', source, re.IGNORECASE):
+        match = re.search(r'Barva světla[:\s]+duální bílá\s+([A-Z]+-[A-Z]+)', source, re.IGNORECASE)
+        res["color"] = match.group(1).upper().replace("-", "+")
+    
+    # --- SPECIÁLNÍ PRODUKTOVÉ BARVY ---
+    elif re.search(r'Barva světla[:\s]+Produktové Ovoce O', source, re.IGNORECASE):
+        res["color"] = "Ovoce O"
+    elif re.search(r'Barva světla[:\s]+Produktové Sýry S', source, re.IGNORECASE):
+        res["color"] = "Sýry S"
+    elif re.search(r'Barva světla[:\s]+Produktový Pečivo P', source, re.IGNORECASE):
+        res["color"] = "Pečivo P"
+    elif re.search(r'Barva světla[:\s]+Produktové Uzeniny U', source, re.IGNORECASE):
+        res["color"] = "Uzeniny U"
+    elif re.search(r'Barva světla[:\s]+Produktové Maso M', source, re.IGNORECASE):
+        res["color"] = "Maso M"
+    elif re.search(r'Barva světla[:\s]+Produktový Mražené MR', source, re.IGNORECASE):
+        res["color"] = "Mražené MR"
+    # ----------------------------------
+
+    # 6. Jednobarevné spec.
+    elif re.search(r'Barva světla[:\s]+denní bílý DW', source, re.IGNORECASE):
+        res["color"] = "DW"
+    elif re.search(r'Barva světla[:\s]+studeně bílý CW', source, re.IGNORECASE):
+        res["color"] = "CW"
+    elif re.search(r'Barva světla[:\s]+neutrálně bílý NW', source, re.IGNORECASE):
+        res["color"] = "NW"
+    elif re.search(r'Barva světla[:\s]+teple bílý WW', source, re.IGNORECASE):
+        res["color"] = "WW"
+    elif re.search(r'Barva světla[:\s]+UVA', source, re.IGNORECASE):
+        res["color"] = "UVA"
+    elif re.search(r'Modrá|modrý B', source, re.IGNORECASE):
+        res["color"] = "B"
+    elif re.search(r'Červená|červený R', source, re.IGNORECASE):
+        res["color"] = "R"
+    elif re.search(r'Zelená|zelený G', source, re.IGNORECASE):
+        res["color"] = "G"
+    elif re.search(r'Žlutá|žlutý Y', source, re.IGNORECASE):
+        res["color"] = "Y"
+    else:
+        for c in config.COLOR_MAP_LIGHT.keys():
+            if re.search(r'\b' + c + r'\b', src_upper):
+                res["color"] = c
+                break
+
+    # --- PARAMETRY ---
+    for key, pattern in PATTERNS.items():
+        match = re.search(pattern, source, re.IGNORECASE | re.DOTALL)
+        if match:
+            val = match.group(1)
+            if key == "chip": val = val.upper()
+            if key == "cut": val = val.replace('.', ',')
+            if key == "height": val = val.replace(',', '.')
+            if key == "cri" and "90" in val: val = "90"
+            
+            res[key] = val
+            
+            if key == "life_full":
+                res["life_l"] = match.group(1)
+                res["life_b"] = match.group(2)
+                res["life"] = match.group(3).replace(" ", "").replace(".", "")
+    return res
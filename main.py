@@ -1,6 +1,8 @@
 # main.py
+import fonts
 from gui import LedApp
 
 if __name__ == "__main__":
+    fonts.prewarm()
     app = LedApp()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
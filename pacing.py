@@ -0,0 +1,136 @@
+# pacing.py
+"""Rozestupy mezi požadavky na web."""
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import config
+
+
+class Pacer:
+    """Minimální rozestup mezi začátky požadavků (sdílený mezi vlákny).
+
+    Rozestup se měří od začátku předchozího požadavku: pokud stažení a čekání
+    na stránku trvalo déle než interval, další požadavek jde hned.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = config.POLITENESS_DELAY if interval is None else interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Počká na svůj termín a zarezervuje ho (volat těsně před požadavkem)."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class AdaptivePacer(Pacer):
+    """Pacer jednoho hostu, který se přizpůsobuje odpovědím (record po každém požadavku).
+
+    - zdravá odpověď: interval * RATE_SPEEDUP (až na RATE_MIN_INTERVAL)
+    - chyba nebo odpověď pomalejší než RATE_SLOW_FACTOR * průměr: interval * RATE_BACKOFF
+    - RATE_BREAKER_FAILURES chyb po sobě: jistič - žádné požadavky po dobu cooldownu,
+      pak projde jeden zkušební; když selže, cooldown se zdvojnásobí
+
+    Po každém wait() musí přijít record() - i když požadavek skončil výjimkou
+    (viz pipeline.fetch_stages). Zkušební požadavek, který se do
+    RATE_BREAKER_COOLDOWN neozve, se považuje za ztracený a pustí se další.
+    """
+
+    def __init__(self, name="", interval=None):
+        super().__init__(interval)
+        self.name = name
+        self.latency = None      # klouzavý průměr úspěšných odpovědí (s)
+        self.failures = 0        # chyb po sobě
+        self.trips = 0           # kolikrát vypnul jistič (celkem)
+        self._level = 0          # vypnutí po sobě bez úspěchu -> délka cooldownu
+        self.open_until = 0.0    # jistič: do kdy se nestahuje (0 = zavřený)
+        self._probe = 0.0        # kdy začal běžící zkušební požadavek po cooldownu (0 = žádný)
+
+    def wait(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if not self.open_until:
+                    jitter = random.uniform(-config.RATE_JITTER, config.RATE_JITTER)
+                    start = max(now, self._next)
+                    self._next = start + self.interval * (1 + jitter)
+                    break
+                probe_lost = self._probe and now - self._probe > config.RATE_BREAKER_COOLDOWN
+                if now >= self.open_until and (not self._probe or probe_lost):
+                    self._probe = now
+                    start = now
+                    self._next = now + self.interval
+                    break
+                pause = max(self.open_until - now, 0.2)
+            time.sleep(pause)
+        if start > now:
+            time.sleep(start - now)
+
+    def record(self, ok, latency):
+        """Výsledek požadavku: ok = stránka má data, latency = doba stažení v s."""
+        with self._lock:
+            now = time.monotonic()
+            if ok:
+                slow = self.latency is not None and latency > self.latency * config.RATE_SLOW_FACTOR
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                self.failures = 0
+                self.open_until = 0.0
+                self._probe = 0.0
+                self._level = 0
+                factor = config.RATE_BACKOFF if slow else config.RATE_SPEEDUP
+            else:
+                self.failures += 1
+                factor = config.RATE_BACKOFF
+            self.interval = min(max(self.interval * factor, config.RATE_MIN_INTERVAL),
+                                config.RATE_MAX_INTERVAL)
+            if ok:
+                return
+
+            # Exponenciální backoff s jitterem: další požadavek nejdřív za interval * (0.5..1.5)
+            self._next = max(self._next, now + self.interval * random.uniform(0.5, 1.5))
+            if self._probe or self.failures >= config.RATE_BREAKER_FAILURES:
+                self.trips += 1
+                cooldown = config.RATE_BREAKER_COOLDOWN * 2 ** min(self._level, 4)
+                self._level += 1
+                self.open_until = now + cooldown
+                self._probe = 0.0
+                self.failures = 0
+                print(f"Jistič {self.name}: příliš mnoho chyb, pauza {cooldown:.0f} s")
+
+    def stats(self):
+        return {"interval": round(self.interval, 2), "latency": self.latency,
+                "trips": self.trips, "open": bool(self.open_until)}
+
+
+class HostLimiter:
+    """AdaptivePacer pro každý host: wait(url) před požadavkem, record(url, ...) po něm."""
+
+    def __init__(self, interval=None):
+        self.interval = interval
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def pacer(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            pacer = self._hosts.get(host)
+            if pacer is None:
+                pacer = self._hosts[host] = AdaptivePacer(host, self.interval)
+        return pacer
+
+    def wait(self, url):
+        self.pacer(url).wait()
+
+    def record(self, url, ok, latency):
+        self.pacer(url).record(ok, latency)
+
+    def stats(self):
+        with self._lock:
+            return {host: pacer.stats() for host, pacer in self._hosts.items()}
@@ -0,0 +1,98 @@
+# page_cache.py
+"""Diskový cache textu produktových stránek (gzip, klíč = URL).
+
+Režimy:
+    "normal"  - čerstvý záznam (mladší než TTL) se použije, jinak se stránka stáhne;
+                když stažení selže, použije se i prošlý záznam (stale-if-error)
+    "offline" - jen z cache, prohlížeč se nikdy nespustí
+    "refresh" - vždy stáhnout znovu a cache přepsat
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+import config
+
+MODES = ("normal", "offline", "refresh")
+
+
+class PageCache:
+    def __init__(self, cache_dir=None, ttl=None, mode="normal"):
+        if mode not in MODES:
+            raise ValueError(f"Neznámý režim cache: {mode}")
+        self.cache_dir = cache_dir or config.PAGE_CACHE_DIR
+        self.ttl = config.PAGE_CACHE_TTL if ttl is None else ttl
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.strip().encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + ".json.gz")
+
+    def load(self, url):
+        """Vrátí (text, stáří v sekundách) nebo (None, None)."""
+        try:
+            with gzip.open(self._path(url), "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        return entry.get("text"), time.time() - entry.get("fetched_at", 0)
+
+    def store(self, url, text):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump({"url": url, "fetched_at": time.time(), "text": text}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def is_fresh(self, url):
+        """True, když get(url) nebude stahovat (statistiky se nepočítají)."""
+        if self.mode == "refresh":
+            return False
+        text, age = self.load(url)
+        return bool(text) and (self.mode == "offline" or age <= self.ttl)
+
+    def lookup(self, url):
+        """Fresh cached text for url (any age in offline mode), or None when a fetch is needed."""
+        if self.mode == "refresh":
+            return None
+        text, age = self.load(url)
+        if text and (self.mode == "offline" or age <= self.ttl):
+            self._count("hits")
+            return text
+        return None
+
+    def get(self, url, fetch):
+        """Text stránky z cache, nebo fetch(url) podle režimu (a uložení výsledku)."""
+        text = self.lookup(url)
+        if text is not None:
+            return text
+        if self.mode == "offline":
+            self._count("misses")
+            return ""
+
+        self._count("misses")
+        text = fetch(url)
+        if text:
+            self.store(url, text)
+            return text
+
+        stale_text, _ = self.load(url)
+        if stale_text:
+            self._count("stale")
+            return stale_text
+        return ""
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
@@ -0,0 +1,452 @@
+# pipeline.py
+"""Hromadné zpracování jako linka fetch -> parse -> render -> encode.
+
+Mezi fázemi jsou omezené fronty (backpressure): když render nestíhá, fetch se
+zastaví na put() a nenačítá stránky do paměti donekonečna. Každá fáze má
+vlastní počet vláken, takže prohlížeč stahuje další stránku, zatímco se
+předchozí položky kreslí a ukládají.
+"""
+import os
+import queue
+import threading
+import time
+
+import batch
+
+_DONE = object()
+_FED = object()
+
+
+class Job:
+    """Jedna položka dávky putující linkou.
+
+    Jedna stránka (url) může patřit více ML kódům (délkové varianty) - stáhne
+    se a naparsuje jednou a vykreslí se pro každý kód zvlášť.
+    """
+
+    def __init__(self, index, codes, url=None):
+        self.index = index
+        self.codes = list(codes)
+        self.url = url
+        self.source = ""
+        self.data = None
+        self.images = []
+        self.paths = []
+        self.links = []
+        self.error = None
+        self.retry = False
+        self.attempts = 0
+        self.unchanged = 0
+
+    @property
+    def code(self):
+        return self.codes[0]
+
+
+class BatchReport:
+    def __init__(self, total):
+        self.total = total
+        self.success = 0
+        self.errors = []
+        self.fetches = 0
+        self.fetches_saved = 0
+        self.fetches_http = 0
+        self.retries = 0
+        self.unchanged = 0
+        self.deduped = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def summary(self):
+        msg = f"HOTOVO! Vygenerováno {self.success} z {self.total}."
+        if self.errors:
+            msg += f" (Chyby: {len(self.errors)})"
+        if self.fetches_saved:
+            msg += f" Ušetřeno stažení: {self.fetches_saved}."
+        if self.retries:
+            msg += f" Opakovaných stažení: {self.retries}."
+        if self.fetches_http:
+            msg += f" Bez prohlížeče: {self.fetches_http}."
+        if self.unchanged:
+            msg += f" Beze změny (nepřepsáno): {self.unchanged}."
+        if self.deduped:
+            msg += f" Stejných obrázků (odkaz místo renderu): {self.deduped}."
+        return msg
+
+
+class Pipeline:
+    """Generic staged pipeline: stages is a list of (name, func, workers).
+
+    func(job) mutates the job; an exception or job.error set by the stage
+    moves the job straight to the results, skipping the remaining stages.
+    A stage can set job.retry instead - the job then goes back to the end of
+    the input, behind all jobs not yet started.
+    """
+
+    def __init__(self, stages, queue_size=8, on_result=None):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_result = on_result
+
+    def run(self, jobs):
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = queue.Queue()
+        threads = []
+
+        for n, (name, func, workers) in enumerate(self.stages):
+            in_q = queues[n]
+            out_q = queues[n + 1] if n + 1 < len(queues) else results
+            next_workers = self.stages[n + 1][2] if n + 1 < len(self.stages) else 1
+            state = {"alive": workers, "lock": threading.Lock()}
+            for w in range(workers):
+                t = threading.Thread(target=self._worker, name=f"{name}-{w}", daemon=True,
+                                     args=(func, in_q, out_q, results, state, next_workers))
+                t.start()
+                threads.append(t)
+
+        retries = queue.Queue()
+
+        def feed():
+            count = 0
+            for job in jobs:
+                queues[0].put(job)
+                count += 1
+            results.put((_FED, count))
+            # Opakované položky až za všemi původními, dokud linka nedoběhne
+            while True:
+                job = retries.get()
+                if job is _DONE:
+                    break
+                queues[0].put(job)
+            for _ in range(self.stages[0][2]):
+                queues[0].put(_DONE)
+
+        feeder = threading.Thread(target=feed, name="feed", daemon=True)
+        feeder.start()
+
+        # Výsledky (úspěšné i chybné) se sbírají v pořadí dokončení
+        finished = []
+        total = None
+        pending_done = 1
+        while pending_done:
+            job = results.get()
+            if job is _DONE:
+                pending_done -= 1
+                continue
+            if isinstance(job, tuple):
+                total = job[1]
+            elif job.retry:
+                job.retry = False
+                retries.put(job)
+                continue
+            else:
+                finished.append(job)
+                if self.on_result:
+                    self.on_result(job)
+            if total is not None and len(finished) == total:
+                retries.put(_DONE)
+                total = None
+
+        for t in threads:
+            t.join()
+        return finished
+
+    @staticmethod
+    def _worker(func, in_q, out_q, results, state, next_workers):
+        while True:
+            job = in_q.get()
+            if job is _DONE:
+                break
+            try:
+                func(job)
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+            if job.error or job.retry:
+                results.put(job)
+            else:
+                out_q.put(job)
+
+        # Poslední vlákno fáze pošle ukončení všem vláknům další fáze
+        with state["lock"]:
+            state["alive"] -= 1
+            last = state["alive"] == 0
+        if last:
+            for _ in range(next_workers):
+                out_q.put(_DONE)
+
+
+def group_by_url(codes, code_to_url):
+    """{url: [kódy]} v pořadí prvního výskytu - délkové varianty sdílí jednu stránku."""
+    groups = {}
+    for code in codes:
+        groups.setdefault(code_to_url(code), []).append(code)
+    return groups
+
+
+def fetch_stages(report, pool, limiter, cache=None, http=None, fetch_workers=None):
+    """Fáze http -> fetch -> parse pro Pipeline; vrací (stages, close).
+
+    "http" (config.HTTP_PER_HOST vláken) zkusí stránku bez prohlížeče
+    (http_fetch.PageFetcher) v tempu vlastního HostLimiter se stejným intervalem
+    jako limiter prohlížečů - odezvy HTTP a prohlížeče se liší o řád, ve společném
+    průměru by každá stránka z prohlížeče vypadala jako zpomalení webu. Co
+    nepřijde úplné, stáhne "fetch" prohlížečem z pool. Stránky tak tečou do
+    renderu průběžně a v paměti je jich najednou jen tolik, kolik se vejde do
+    front linky. Stránka, která nepřišla, jde na konec fronty (max
+    config.FETCH_ATTEMPTS pokusů, opakuje se už jen prohlížečem).
+    close() zavře HTTP spojení.
+    """
+    import config
+    import extractor
+    import http_fetch
+
+    fetch_workers = fetch_workers or config.BROWSER_POOL_SIZE
+    http = config.HTTP_FETCH if http is None else http
+    fetcher = None
+    if http and not (cache is not None and cache.mode == "offline"):
+        from pacing import HostLimiter
+
+        fetcher = http_fetch.PageFetcher()
+        http_limiter = HostLimiter(limiter.interval)
+
+    def paced(limiter, url, fetch, ok=bool, failed=lambda error: True):
+        """fetch(url) v tempu limiteru; výjimka projde dál (failed(e) = počítá se jako chyba hostu)."""
+        limiter.wait(url)
+        started = time.monotonic()
+        success = False
+        try:
+            source = fetch(url)
+            success = ok(source)
+            return source
+        except Exception as e:
+            success = not failed(e)
+            raise
+        finally:
+            # Vždy, i po KeyboardInterrupt - zkušební požadavek jističe by jinak zůstal "běžet"
+            limiter.record(url, success, time.monotonic() - started)
+
+    def browser_fetch(url):
+        import scraper  # selenium až pro první stránku z prohlížeče
+
+        with pool.borrow() as driver:
+            return paced(limiter, url, lambda u: scraper.fetch_page(u, driver=driver))
+
+    def http_get(job):
+        if job.attempts or (cache is not None and cache.is_fresh(job.url)):
+            return
+        try:
+            # Stránka bez povinných polí ("") ani 404 nejsou chyba hostu, jen jdou na prohlížeč
+            source = paced(http_limiter, job.url, fetcher.fetch, ok=lambda source: True,
+                           failed=http_fetch.host_failure)
+        except Exception as e:
+            print(f"HTTP {job.url}: {e} - stáhne se prohlížečem")
+            return
+        if source:
+            report.fetches_http += 1
+            if cache is not None:
+                cache.store(job.url, source)
+            job.source = source
+
+    def fetch(job):
+        if job.source:
+            return
+        print(f"Batch ({job.index + 1}/{report.fetches}): {', '.join(job.codes)} -> {job.url}")
+        job.attempts += 1
+        if cache is not None:
+            job.source = cache.get(job.url, browser_fetch)
+        else:
+            job.source = browser_fetch(job.url)
+        if job.source or (cache is not None and cache.mode == "offline"):
+            return
+        if job.attempts < config.FETCH_ATTEMPTS:
+            print(f"Nepovedlo se stáhnout {job.url}, zkusí se znovu na konci dávky")
+            report.retries += 1
+            job.retry = True
+        else:
+            job.error = f"stránka nepřišla ani na {job.attempts}. pokus"
+
+    def parse(job):
+        job.data = extractor.parse_page(job.source)
+        job.source = ""
+        if not job.data:
+            job.error = "no data"
+
+    stages = [("fetch", fetch, fetch_workers), ("parse", parse, 1)]
+    if fetcher is not None:
+        stages.insert(0, ("http", http_get, config.HTTP_PER_HOST))
+    return stages, (fetcher.close if fetcher is not None else lambda: None)
+
+
+def fetch_specs(codes, cache=None, http=None, pool=None, limiter=None, fetch_workers=1, queue_size=8):
+    """[(kód, data)] pro ML kódy přes fáze fetch_stages (bez renderu); data {} = chyba.
+
+    Stejná cesta jako run_scrape_batch: HTTP, pak prohlížeč v tempu limiteru
+    (pacing.HostLimiter) a opakování stránek, které nepřišly.
+    """
+    import scraper
+    from browser_pool import DriverPool
+    from pacing import HostLimiter
+
+    codes = list(dict.fromkeys(codes))
+    report = BatchReport(len(codes))
+    groups = group_by_url(codes, scraper.code_to_url)
+    report.fetches = len(groups)
+    own_pool = pool is None
+    pool = pool or DriverPool(fetch_workers)
+    stages, close = fetch_stages(report, pool, limiter or HostLimiter(), cache, http, fetch_workers)
+    results = {}
+
+    def on_result(job):
+        if job.error:
+            print(f"Error processing {', '.join(job.codes)}: {job.error}")
+        for code in job.codes:
+            results[code] = {} if job.error else dict(job.data, ml_code=code)
+
+    try:
+        Pipeline(stages, queue_size=queue_size, on_result=on_result).run(
+            Job(i, group, url) for i, (url, group) in enumerate(groups.items()))
+    finally:
+        close()
+        if own_pool:
+            pool.close()
+    if report.fetches_http:
+        print(f"HTTP: {report.fetches_http} z {report.fetches} stránek bez prohlížeče")
+    return [(code, results.get(code, {})) for code in codes]
+
+
+def run_scrape_batch(codes, generator, target_dir, fetch_workers=None, render_workers=2,
+                     encode_workers=None, queue_size=8, limiter=None, cache=None, http=None,
+                     pool=None, skip_unchanged=True, fmt=None, preset=None, sizes=None,
+                     on_progress=None):
+    """Stáhne, naparsuje, vykreslí a uloží dávku ML kódů; vrací BatchReport.
+
+    Fetch vlákna (výchozí config.BROWSER_POOL_SIZE) si půjčují prohlížeče z pool
+    (browser_pool.DriverPool); startují se až při prvním cache miss
+    (s cache=page_cache.PageCache).  S http (výchozí config.HTTP_FETCH) jde
+    stránka nejdřív přes HTTP (fáze "http", viz fetch_stages) a prohlížeč dostane
+    jen ty, kde chybí povinná pole.  Tempo HTTP i prohlížečů řídí limiter
+    (pacing.HostLimiter: zrychluje, dokud web odpovídá, při chybách zpomaluje a
+    vypíná se jističem). Stránka, která nepřišla, jde na konec fronty (max
+    config.FETCH_ATTEMPTS pokusů).
+    Se skip_unchanged se nevykreslí ani nezapíše obrázek, jehož hash (render_cache)
+    sedí s manifestem ve výstupní složce a soubor tam pořád je. Kódy se stejným
+    hashem (délkové varianty) se vykreslí jednou, ostatní soubory jsou hard linky.
+    Obrázky se ukládají ve formátu fmt s předvolbou preset (encoder, výchozí
+    config.OUTPUT_FORMAT / OUTPUT_PRESET) v encode_workers vláknech; velikost a čas
+    zápisu každého obrázku se vypisují. Každý kód se vykreslí nativně ve všech
+    velikostech sizes (strany v px, výchozí config.OUTPUT_SIZES).
+    on_progress(done, total, job) se volá z vlákna linky po dokončení každé položky.
+    """
+    import config
+    import encoder
+    import render_cache
+    import scraper
+    from browser_pool import DriverPool
+    from pacing import HostLimiter
+
+    codes = list(dict.fromkeys(codes))  # stejný kód dvakrát = jeden výstupní soubor
+    report = BatchReport(len(codes))
+    groups = group_by_url(codes, scraper.code_to_url)
+    report.fetches = len(groups)
+    report.fetches_saved = len(codes) - len(groups)
+    os.makedirs(target_dir, exist_ok=True)
+    fetch_workers = fetch_workers or config.BROWSER_POOL_SIZE
+    own_pool = pool is None
+    pool = pool or DriverPool(fetch_workers)
+    limiter = limiter or HostLimiter()
+    manifest = render_cache.RenderManifest(target_dir)
+    env = render_cache.environment_fingerprint()
+    fmt = fmt or config.OUTPUT_FORMAT
+    preset = preset or config.OUTPUT_PRESET
+    encoder.check_support(fmt)
+    output = encoder.output_key(fmt, preset)  # formát a kvalita jsou součástí hashe
+    ext = encoder.extension(fmt)
+    sizes = tuple(sizes or config.OUTPUT_SIZES)
+    encode_workers = encode_workers or config.ENCODE_WORKERS
+    encoded = encoder.EncodeReport()
+    dedupe = render_cache.Deduper()
+    pending_links = []  # (kód, soubor, hash) - vlastník z jiné položky ještě nebyl zapsaný
+
+    stages, close_fetch = fetch_stages(report, pool, limiter, cache, http, fetch_workers)
+
+    def render(job):
+        for code in job.codes:
+            data = dict(job.data, ml_code=code)
+            todo = {}  # velikost -> (soubor, hash), které je potřeba vykreslit
+            unchanged = 0
+            for size in sizes:
+                filename = batch.output_filename(code, ext, size)
+                digest = render_cache.render_hash(data, env, output, size)
+                path = os.path.join(target_dir, filename)
+                if skip_unchanged and manifest.is_current(filename, digest):
+                    unchanged += 1
+                    job.paths.append(path)
+                    dedupe.existing(digest, path)
+                elif dedupe.claim(digest, path) is None:
+                    todo[size] = (filename, digest)
+                else:
+                    job.links.append((code, filename, digest))
+            if unchanged == len(sizes):
+                job.unchanged += 1  # počítá se po kódech, ne po velikostech
+            for size, image in generator.generate_sizes(data, todo).items():
+                job.images.append(todo[size] + (image,))
+
+    def encode(job):
+        for filename, digest, image in job.images:
+            path = os.path.join(target_dir, filename)
+            stats = encoder.save_with_stats(image, path, fmt, preset)
+            encoded.add(stats)
+            print(f"Uloženo {encoder.describe(stats)}")
+            manifest.record(filename, digest)
+            dedupe.written(digest)
+            job.paths.append(path)
+        job.images = []
+        for code, filename, digest in job.links:
+            if dedupe.is_written(digest):
+                dedupe.materialize(digest, os.path.join(target_dir, filename))
+                manifest.record(filename, digest)
+                job.paths.append(os.path.join(target_dir, filename))
+            else:
+                pending_links.append((code, filename, digest))
+
+    def on_result(job):
+        if job.error:
+            print(f"Error processing {', '.join(job.codes)}: {job.error}")
+            report.errors.extend(job.codes)
+        else:
+            report.success += len(job.codes)
+            report.unchanged += job.unchanged
+            report.deduped += len({code for code, _, _ in job.links})
+        if on_progress:
+            on_progress(report.success + len(report.errors), report.total, job)
+
+    stages += [
+        ("render", render, render_workers),
+        ("encode", encode, encode_workers),
+    ]
+    try:
+        Pipeline(stages, queue_size=queue_size, on_result=on_result).run(
+            Job(i, group, url) for i, (url, group) in enumerate(groups.items()))
+        failed = {}  # kód -> None; jeden kód může chybět ve více velikostech
+        for code, filename, digest in pending_links:
+            if dedupe.is_written(digest):
+                dedupe.materialize(digest, os.path.join(target_dir, filename))
+                manifest.record(filename, digest)
+            else:
+                failed[code] = None
+        for code in failed:
+            print(f"Error processing {code}: stejný obrázek se nepodařilo vytvořit")
+            report.errors.append(code)
+            report.success -= 1
+            report.deduped -= 1
+        if dedupe.summary():
+            print(dedupe.summary())
+        if encoded.summary():
+            print(encoded.summary())
+    finally:
+        close_fetch()
+        if own_pool:
+            pool.close()
+        manifest.save()
+        report.elapsed = time.perf_counter() - report.started
+    return report
@@ -0,0 +1,194 @@
+# render_cache.py
+"""Obsahový hash výstupu a manifest vedle obrázků - přeskočení nezměněných produktů.
+
+Hash = normalizovaná specifikace + palety a texty z config + otisk složky
+images (názvy, velikosti, mtime) + drawer.RENDER_VERSION + parametry výstupu.
+Manifest (.render_manifest.json ve výstupní složce) drží {soubor: hash, velikost};
+když se hash i soubor shodují, render a zápis se přeskočí.
+
+ml_code do hashe nevstupuje přímo, jen to, co z něj drawer odvodí
+(drawer.code_inputs: patička 54D24R, model profilu, počet LED na segment), takže
+délkové varianty se stejnou specifikací mají stejný hash. Deduper v rámci jedné
+dávky zajistí, že se takový obrázek vykreslí a zapíše jednou a ostatní soubory
+jsou na něj hard linky (kde FS linky neumí, kopie).
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import assets
+import config
+import drawer
+
+MANIFEST_NAME = ".render_manifest.json"
+
+# Vše z config, co ovlivňuje vzhled obrázku
+CONFIG_KEYS = ["COLOR_MAP_LIGHT", "RAW_COLORS", "COLOR_MAP_CHIP", "COLOR_MAP_IP",
+               "COLOR_MAP_VOLTAGE", "RGB_COLORS", "SUB_TEXTS", "FONT_BOLD", "FONT_REGULAR"]
+
+
+def normalize_spec(spec):
+    """Hodnoty jako oříznuté řetězce, prázdné vynechané (drawer je bere jako chybějící)."""
+    norm = {}
+    for key, value in spec.items():
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value:
+            norm[str(key)] = value
+    return norm
+
+
+def environment_fingerprint():
+    """Otisk všeho kromě specifikace; stačí spočítat jednou na dávku."""
+    env = {
+        "render_version": drawer.RENDER_VERSION,
+        "config": {key: getattr(config, key, None) for key in CONFIG_KEYS},
+        "assets": assets.registry.fingerprint(),
+    }
+    return hashlib.sha256(json.dumps(env, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def render_hash(spec, env, output=(), size=None):
+    """Hash jednoho výstupního souboru; output = parametry kódování (formát, kvalita...).
+
+    size (strana v px) vstupuje jen mimo drawer.IMAGE_SIZE, takže manifesty
+    z doby před více velikostmi zůstávají platné.
+    """
+    code = drawer.code_inputs(spec)
+    spec = normalize_spec(spec)
+    spec.pop("ml_code", None)
+    payload = {"spec": spec, "code": code, "env": env, "output": list(output)}
+    if size and size != drawer.IMAGE_SIZE:
+        payload["size"] = size
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+class RenderManifest:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_current(self, filename, digest):
+        """True, když soubor existuje a vznikl ze stejného hashe (a nikdo ho nepřepsal)."""
+        entry = self.entries.get(filename)
+        if not entry or entry.get("hash") != digest:
+            return False
+        try:
+            return os.path.getsize(os.path.join(self.output_dir, filename)) == entry.get("size")
+        except OSError:
+            return False
+
+    def record(self, filename, digest):
+        size = os.path.getsize(os.path.join(self.output_dir, filename))
+        with self._lock:
+            self.entries[filename] = {"hash": digest, "size": size}
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._lock:
+            data = json.dumps(self.entries, indent=1, sort_keys=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+
+def _same_file(src, dst):
+    if os.path.abspath(src) == os.path.abspath(dst):
+        return True
+    try:
+        return os.path.samefile(src, dst)
+    except OSError:
+        return False
+
+
+def link_or_copy(src, dst):
+    """Vytvoří dst se stejným obsahem jako src; vrací "link", "copy" nebo "same".
+
+    Existující dst se nahradí přes dočasný soubor a os.replace, ne přepíše na
+    místě (mohou na něj vést další linky). Když dst už je src, nic se nedělá.
+    """
+    if _same_file(src, dst):
+        return "same"
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        try:
+            os.link(src, tmp)
+            how = "link"
+        except OSError:
+            # FS bez hard linků (FAT, některé síťové disky) nebo jiný svazek
+            shutil.copyfile(src, tmp)
+            how = "copy"
+        os.replace(tmp, dst)
+    finally:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+    return how
+
+
+class Deduper:
+    """Obrázky se stejným hashem v jedné dávce: první se vykreslí, ostatní se nalinkují.
+
+        owner = dedupe.claim(digest, path)   # None = vykreslit a pak dedupe.written(digest)
+        if owner is not None and dedupe.is_written(digest): link_or_copy(owner, path)
+    """
+
+    def __init__(self):
+        self._owners = {}
+        self._written = set()
+        self._lock = threading.Lock()
+        self.outputs = 0
+        self.rendered = 0
+        self.links = 0
+        self.copies = 0
+
+    def claim(self, digest, path):
+        """None, když path obrázek vykreslí sám; jinak cesta souboru, na který se nalinkuje."""
+        with self._lock:
+            self.outputs += 1
+            owner = self._owners.get(digest)
+            if owner is None:
+                self._owners[digest] = path
+                self.rendered += 1
+            return owner
+
+    def existing(self, digest, path):
+        """Nezměněný soubor z minula (manifest) - může posloužit jako zdroj linků."""
+        with self._lock:
+            self._owners.setdefault(digest, path)
+            if self._owners[digest] == path:
+                self._written.add(digest)
+
+    def written(self, digest):
+        with self._lock:
+            self._written.add(digest)
+
+    def is_written(self, digest):
+        with self._lock:
+            return digest in self._written
+
+    def materialize(self, digest, path):
+        """Nalinkuje path na vlastníka hashe (musí být zapsaný)."""
+        with self._lock:
+            owner = self._owners[digest]
+        how = link_or_copy(owner, path)
+        if how == "link":
+            self.links += 1
+        elif how == "copy":
+            self.copies += 1
+
+    def summary(self):
+        if not self.outputs or self.rendered == self.outputs:
+            return ""
+        saved = self.outputs - self.rendered
+        return (f"Stejné obrázky: {self.rendered} vykresleno pro {self.outputs} souborů "
+                f"(ušetřeno {saved}, {saved / self.outputs:.0%}; linky {self.links}, kopie {self.copies})")
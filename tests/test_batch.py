@@ -0,0 +1,32 @@
+# tests/test_batch.py
+import batch
+
+
+def test_csv_with_header_yields_only_data_rows(tmp_path):
+    path = tmp_path / "davka.csv"
+    path.write_text(
+        "ml_code;Color;kelvin\n"
+        "ML-126.580.60.0;Teplá bílá;3000\n"
+        "ML-126.581.60.0;Neutrální bílá;4000\n",
+        encoding="utf-8")
+
+    items = batch.read_batch_file(str(path))
+
+    assert items == [
+        {"ml_code": "ML-126.580.60.0", "color": "Teplá bílá", "kelvin": "3000"},
+        {"ml_code": "ML-126.581.60.0", "color": "Neutrální bílá", "kelvin": "4000"},
+    ]
+
+
+def test_csv_with_quoted_header_and_bom(tmp_path):
+    path = tmp_path / "davka.csv"
+    path.write_bytes('﻿"ml_code","ip"\r\n"ML-126.580.60.0","IP20"\r\n'.encode("utf-8"))
+
+    assert batch.read_batch_file(str(path)) == [{"ml_code": "ML-126.580.60.0", "ip": "IP20"}]
+
+
+def test_csv_without_spec_header_is_a_code_list(tmp_path):
+    path = tmp_path / "kody.csv"
+    path.write_text("ML-126.580.60.0;x\nneco\nML-126.581.60.0\n", encoding="utf-8")
+
+    assert batch.read_batch_file(str(path)) == ["ML-126.580.60.0", "ML-126.581.60.0"]
@@ -0,0 +1,122 @@
+# tests/test_browser_pool.py
+import threading
+
+import pytest
+
+import browser_pool
+from browser_pool import DriverPool, FakeDriver
+
+
+def make_pool(size=1, **kwargs):
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver({"u": "Barva světla: teplá"}))
+        return drivers[-1]
+
+    kwargs.setdefault("max_pages", 0)
+    kwargs.setdefault("max_memory_mb", 0)
+    return DriverPool(size, factory=factory, **kwargs), drivers
+
+
+def test_fake_driver_interface():
+    driver = FakeDriver({"u": "Barva světla: teplá"})
+    driver.get("u")
+    assert driver.find_element("tag name", "body").text == "Barva světla: teplá"
+    assert driver.find_element("xpath", "//body//*[contains(text(), 'Barva')]")
+    with pytest.raises(Exception):
+        driver.find_element("xpath", "//body//*[contains(text(), 'Výkon')]")
+    assert driver.execute_script("return 1") == 1
+    driver.crash()
+    with pytest.raises(ConnectionError):
+        driver.get("u")
+    assert not DriverPool.healthy(driver)
+
+
+def test_session_is_reused():
+    pool, drivers = make_pool()
+    for _ in range(3):
+        with pool.borrow() as driver:
+            driver.get("u")
+    assert len(drivers) == 1
+    assert drivers[0].visited == ["u", "u", "u"]
+
+
+def test_crashed_idle_driver_is_replaced_on_acquire():
+    pool, drivers = make_pool()
+    with pool.borrow() as driver:
+        driver.get("u")
+    drivers[0].crash()
+
+    with pool.borrow() as driver:
+        assert driver is drivers[1]
+    assert drivers[0].quit_called
+    assert pool.stats()["open"] == 1
+
+
+def test_driver_crashing_during_loan_is_not_returned():
+    pool, drivers = make_pool()
+    with pytest.raises(ConnectionError):
+        with pool.borrow() as driver:
+            driver.crash()
+            driver.get("u")
+
+    assert drivers[0].quit_called
+    assert pool.stats()["open"] == 0
+    with pool.borrow() as driver:
+        assert driver is drivers[1]
+
+
+def test_error_with_healthy_driver_keeps_session():
+    pool, drivers = make_pool()
+    with pytest.raises(ValueError):
+        with pool.borrow():
+            raise ValueError("chyba parsování")
+    with pool.borrow() as driver:
+        assert driver is drivers[0]
+
+
+def test_recycle_after_max_pages():
+    pool, drivers = make_pool(max_pages=2)
+    for _ in range(5):
+        with pool.borrow() as driver:
+            driver.get("u")
+    assert len(drivers) == 3
+    assert [d.quit_called for d in drivers] == [True, True, False]
+    assert pool.stats()["recycled"] == 2
+
+
+def test_recycle_over_memory_limit(monkeypatch):
+    pool, drivers = make_pool(max_memory_mb=500)
+    monkeypatch.setattr(browser_pool, "memory_mb", lambda driver: 900)
+    with pool.borrow():
+        pass
+    assert drivers[0].quit_called
+    assert pool.stats()["recycled"] == 1
+
+
+def test_acquire_blocks_until_release():
+    pool, drivers = make_pool(size=1)
+    session = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    waiter.join(0.1)
+    assert not got
+
+    pool.release(session)
+    waiter.join(2)
+    assert got and got[0] is session
+    assert len(drivers) == 1
+
+
+def test_prewarm_and_close():
+    pool, drivers = make_pool(size=2, max_pages=1)
+    pool.prewarm()
+    assert len(drivers) == 2
+    assert pool.stats()["idle"] == 2  # zahřátí se nepočítá do max_pages
+
+    pool.close()
+    assert all(d.quit_called for d in drivers)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
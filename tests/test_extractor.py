@@ -0,0 +1,24 @@
+# tests/test_extractor.py
+import pytest
+
+import extractor
+from bench_extract import load_corpus
+
+
+@pytest.mark.parametrize("text, expected", [
+    pytest.param(text, expected, id=name) for name, text, expected in load_corpus() if expected is not None])
+def test_corpus_page(text, expected):
+    assert extractor.parse_page(text) == expected
+
+
+def test_uppercase_escapes_keep_their_meaning():
+    assert extractor._compile(r'Šířka\S+').match("šířka[mm]")
+    assert not extractor._compile(r'Šířka\S+').match("šířka [mm]")
+    assert extractor._compile(r'(\D+)\d').match("ip67").group(1) == "ip"
+
+
+def test_literal_prefix():
+    assert extractor._literal_prefix(r'Šířka\s?\[mm\]') == "šířka"
+    assert extractor._literal_prefix(r'Dělitelnost pásku po\s?\[mm\]') == "dělitelnost pásku po"
+    assert extractor._literal_prefix(r'Lumens?') == "lumen"
+    assert extractor._literal_prefix(r'(SMD\s?\d+|COB)') == ""
@@ -0,0 +1,44 @@
+# tests/test_fonts.py
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+import fonts
+
+FONT = ImageFont.load_default(size=24)
+
+
+def render(draw_func, xy=(10.5, 7)):
+    img = Image.new("RGB", (200, 60), "white")
+    draw_func(ImageDraw.Draw(img), xy)
+    return img
+
+
+def same(a, b):
+    return ImageChops.difference(a, b).getbbox() is None
+
+
+def test_draw_label_matches_draw_text(monkeypatch):
+    monkeypatch.setattr(fonts, "_fast_labels", True)
+    expected = render(lambda d, xy: d.text(xy, "5000 K", fill="#1F3A93", font=FONT))
+    for _ in range(2):  # podruhé z cache
+        assert same(render(lambda d, xy: fonts.draw_label(d, xy, "5000 K", "#1F3A93", FONT)), expected)
+
+
+def test_draw_label_falls_back_without_private_api(monkeypatch):
+    monkeypatch.setattr(fonts, "_fast_labels", True)
+
+    class NewPillowDraw:
+        """ImageDraw bez _getink / draw_bitmap (jiná verze Pillow)."""
+        fontmode = "L"
+
+        def __init__(self):
+            self.calls = []
+
+        def text(self, xy, text, fill=None, font=None):
+            self.calls.append((xy, text, fill, font))
+
+    draw = NewPillowDraw()
+    fonts.draw_label(draw, (10.5, 7), "IP67", "black", FONT)
+    fonts.draw_label(draw, (10, 7), "IP20", "black", FONT)
+
+    assert draw.calls == [((10.5, 7), "IP67", "black", FONT), ((10, 7), "IP20", "black", FONT)]
+    assert fonts._fast_labels is False
@@ -0,0 +1,37 @@
+# tests/test_render_cache.py
+import drawer
+import render_cache
+
+SPEC = {"color": "Teplá bílá", "kelvin": "3000", "ip": "54", "voltage": "24", "width": "10",
+        "led_segment": "6"}
+
+
+def spec(ml_code, **extra):
+    return dict(SPEC, ml_code=ml_code, **extra)
+
+
+def test_length_variants_share_hash():
+    assert render_cache.render_hash(spec("ML.126.580.60.0"), "env") == \
+        render_cache.render_hash(spec("ML.126.580.60.1"), "env")
+
+
+def test_model_taken_from_code_changes_hash():
+    vlhke, plain = spec("ML-126-80B-54-5"), spec("ML-126-10A-54-5")
+    assert drawer.profile_model(vlhke) == "80B"
+    assert render_cache.render_hash(vlhke, "env") != render_cache.render_hash(plain, "env")
+
+
+def test_explicit_model_wins_over_code():
+    assert render_cache.render_hash(spec("ML-126-80B-54-5", model="12A"), "env") == \
+        render_cache.render_hash(spec("ML-126-10A-54-5", model="12A"), "env")
+
+
+def test_segment_leds_from_code_changes_hash():
+    a, b = spec("ML 3 LED", led_segment=""), spec("ML 6 LED", led_segment="")
+    assert drawer.segment_leds(a) == "3"
+    assert render_cache.render_hash(a, "env") != render_cache.render_hash(b, "env")
+
+
+def test_special_footer_changes_hash():
+    assert render_cache.render_hash(spec("ML.126.050.90.0"), "env") != \
+        render_cache.render_hash(spec("ML.126.051.90.0"), "env")